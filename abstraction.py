@@ -0,0 +1,364 @@
+"""Precomputed hand-strength, hand-potential and board-texture tables.
+
+Boards are reduced to suit isomorphism classes: every board maps to a
+canonical key made of its four per-suit rank masks, sorted. There are
+1755 flop, 16432 turn and 134459 river classes. For every class the
+tables hold:
+
+- the board texture, a byte of TEXTURE_* flags;
+- for each of the 1326 two-card combos (as in ranges.COMBOS), its
+  strength: the share of live combos it beats on that board, ties
+  counting half. This is a 0-1 percentile, out of 255;
+- its potential: the mean strength it has after the next card, before
+  the river.
+
+Strength and potential rows are built for the flop and turn by default.
+River rows take 178 MB, and one evaluation answers the river anyway.
+The file is built offline:
+
+    python abstraction.py --workers 8
+
+It loads memory-mapped. Lookups map a hand's suits the same way as the
+board's and index the rows, without evaluating anything:
+
+    tables = AbstractionTables.load()
+    tables.lookup(hole_cards, board)  # Situation(strength, potential, texture)
+    strategy = HeuristicStrategy(abstraction=tables)
+    simulate(10000, seed=1, abstraction=tables)
+
+The AI only plays on the tables where it is handed them: a build that is
+present on one machine and not another never changes how a game plays.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import argparse
+import mmap
+import os
+import random
+import struct
+import numpy as np
+from batch_evaluator import evaluate_batch
+from card import Card
+from ranges import COMBO_INDEX, COMBO_MASKS, COMBOS, NUM_COMBOS, card_mask
+from rng import derive_seed
+from strategy import scale_equity
+
+# File layout: header, then per street a street header, the sorted class keys (int64),
+# one texture byte per class and, when built, the strength and potential rows (uint8)
+MAGIC = b'ABST'
+HEADER = struct.Struct('<4sHH')  # magic, version, number of streets
+STREET_HEADER = struct.Struct('<BBxxI')  # board cards, STRENGTH | POTENTIAL, number of classes
+VERSION = 1
+STRENGTH, POTENTIAL = 1, 2
+SCALE = 255
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'abstraction.bin')
+
+# Board texture flags
+TEXTURE_PAIRED = 1  # Some rank twice or more
+TEXTURE_TRIPS = 2  # Some rank three times or more
+TEXTURE_FLUSH = 4  # Three or more cards of a suit: a flush is possible
+TEXTURE_FLUSH_DRAW = 8  # Two of a suit with cards to come
+TEXTURE_STRAIGHT = 16  # Three ranks within five: a straight is possible
+TEXTURE_STRAIGHT_DRAW = 32  # Two ranks within five with cards to come
+TEXTURE_HIGH = 64  # Two or more cards ten or higher
+
+STREETS = (3, 4, 5)
+ROW_STREETS = (3, 4)
+MAX_CACHED_BOARDS = 100_000
+_COMBO_INDEX = COMBO_INDEX.tolist()  # Nested lists index faster than numpy for one combo
+
+class Situation(NamedTuple):
+    strength: Optional[float]  # None where the street has no rows
+    potential: Optional[float]  # Mean strength after the next card; None on the river or without rows
+    texture: int
+
+class StreetTable(NamedTuple):
+    keys: np.ndarray  # Sorted canonical board keys
+    textures: np.ndarray
+    strength: Optional[np.ndarray]  # (classes, 1326)
+    potential: Optional[np.ndarray]
+
+def board_key(board: Sequence[Card]) -> Tuple[int, List[int]]:
+    """Canonical key of the board's isomorphism class, and the suit relabeling that maps the board onto it."""
+    masks = [0, 0, 0, 0]
+    for card in board:
+        masks[card & 3] |= 1 << (card >> 2)
+    order = sorted(range(4), key=masks.__getitem__, reverse=True)
+    suit_map = [0, 0, 0, 0]
+    key = 0
+    for new_suit, suit in enumerate(order):
+        suit_map[suit] = new_suit
+        key = key << 13 | masks[suit]
+    return key, suit_map
+
+def key_board(key: int) -> List[int]:
+    """The canonical board of a class, as card ints."""
+    return [rank * 4 + suit for suit in range(4) for rank in range(13)
+            if key >> 13 * (3 - suit) & 1 << rank]
+
+def board_texture(board: Sequence[Card]) -> int:
+    counts = [0] * 13
+    suits = [0, 0, 0, 0]
+    for card in board:
+        counts[card >> 2] += 1
+        suits[card & 3] += 1
+    ranks = sum(1 << rank for rank in range(13) if counts[rank])
+    ranks = ranks << 1 | ranks >> 12  # Ace also plays low, below the deuce
+    in_window = max(bin(ranks >> low & 0b11111).count('1') for low in range(10))
+    to_come = len(board) < 5
+    texture = 0
+    if max(counts) >= 2:
+        texture |= TEXTURE_PAIRED
+    if max(counts) >= 3:
+        texture |= TEXTURE_TRIPS
+    if max(suits) >= 3:
+        texture |= TEXTURE_FLUSH
+    elif max(suits) == 2 and to_come:
+        texture |= TEXTURE_FLUSH_DRAW
+    if in_window >= 3:
+        texture |= TEXTURE_STRAIGHT
+    elif in_window == 2 and to_come:
+        texture |= TEXTURE_STRAIGHT_DRAW
+    if sum(counts[8:]) >= 2:
+        texture |= TEXTURE_HIGH
+    return texture
+
+def _board_keys(boards: np.ndarray) -> np.ndarray:
+    # Canonical keys of many boards (rows of card ints) at once
+    masks = np.zeros((len(boards), 4), dtype=np.int64)
+    rows = np.arange(len(boards))
+    for column in boards.T:
+        masks[rows, column & 3] |= np.int64(1) << (column >> 2)
+    masks = -np.sort(-masks, axis=1)
+    return masks[:, 0] << 39 | masks[:, 1] << 26 | masks[:, 2] << 13 | masks[:, 3]
+
+def board_classes(num_cards: int) -> np.ndarray:
+    """Sorted keys of every board class with that many cards."""
+    keys = np.unique(_board_keys(np.array(list(combinations(range(52), 3)), dtype=np.int64)))
+    for _ in range(num_cards - 3):
+        # Every class of one more card is some class of this street plus a card
+        boards = np.array([key_board(key) for key in keys.tolist()], dtype=np.int64)
+        extended = np.repeat(boards, 52, axis=0)
+        cards = np.tile(np.arange(52, dtype=np.int64), len(boards))
+        fresh = (extended != cards[:, None]).all(axis=1)
+        keys = np.unique(_board_keys(np.hstack([extended, cards[:, None]])[fresh]))
+    return keys
+
+def _percentiles(board: Sequence[int]) -> np.ndarray:
+    # Share of live combos each combo beats on the board, ties counting half; 0 for blocked combos
+    live = np.flatnonzero((COMBO_MASKS & card_mask(board)) == 0)
+    hands = np.hstack([COMBOS[live], np.broadcast_to(np.array(board, dtype=np.intp), (len(live), len(board)))])
+    ranks = evaluate_batch(hands)  # Lower is better
+    ordered = np.sort(ranks)
+    below = np.searchsorted(ordered, ranks, 'left')
+    above = np.searchsorted(ordered, ranks, 'right')
+    percentiles = np.zeros(NUM_COMBOS)
+    percentiles[live] = (len(live) - above + 0.5 * (above - below)) / len(live)
+    return percentiles
+
+def street_rows(board: Sequence[int], next_cards: Optional[int] = None,
+                rng: Optional[random.Random] = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Strength and potential of every combo on a board.
+
+    The potential averages over every possible next card, or over
+    next_cards of them drawn with rng; it is None on the river.
+    """
+    strength = _percentiles(board)
+    if len(board) >= 5:
+        return strength, None
+    dead = card_mask(board)
+    cards = [card for card in range(52) if not dead >> card & 1]
+    if next_cards is not None:
+        cards = (rng or random).sample(cards, min(next_cards, len(cards)))
+    totals = np.zeros(NUM_COMBOS)
+    counts = np.zeros(NUM_COMBOS)
+    for card in cards:
+        totals += _percentiles([*board, card])
+        counts += (COMBO_MASKS & (dead | 1 << card)) == 0
+    return strength, totals / np.maximum(counts, 1)
+
+def _build_rows(keys: List[int], next_cards: Optional[int], seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Quantized rows of a run of classes; seeded per class so the chunking does not matter
+    strength = np.zeros((len(keys), NUM_COMBOS), dtype=np.uint8)
+    potential = np.zeros((len(keys), NUM_COMBOS), dtype=np.uint8)
+    for i, key in enumerate(keys):
+        board = key_board(key)
+        row, next_row = street_rows(board, next_cards, random.Random(derive_seed(seed, len(board), key)))
+        strength[i] = np.round(row * SCALE)
+        if next_row is not None:
+            potential[i] = np.round(next_row * SCALE)
+    return strength, potential
+
+class AbstractionTables:
+    def __init__(self, streets: Dict[int, StreetTable]):
+        self.streets = streets  # Board cards -> table
+        # Flat byte views of the rows, read without going through numpy scalars
+        self._rows = {num_cards: tuple(None if rows is None else memoryview(np.ascontiguousarray(rows).reshape(-1))
+                                       for rows in (table.strength, table.potential))
+                      for num_cards, table in streets.items()}
+        self._boards: Dict[int, Optional[Tuple[int, List[int]]]] = {}  # Board card mask -> class index, suit map
+
+    def _board(self, board: Sequence[Card]) -> Optional[Tuple[int, List[int]]]:
+        # Class index and suit relabeling of a board, memoized since every decision of a street asks again
+        mask = 0
+        for card in board:
+            mask |= 1 << card
+        found = self._boards.get(mask, False)
+        if found is False:
+            table = self.streets.get(len(board))
+            found = None
+            if table is not None:
+                key, suit_map = board_key(board)
+                index = int(np.searchsorted(table.keys, key))
+                if index < len(table.keys) and table.keys[index] == key:
+                    found = index, suit_map
+            if len(self._boards) >= MAX_CACHED_BOARDS:
+                self._boards.clear()
+            self._boards[mask] = found
+        return found
+
+    @staticmethod
+    def _combo(hole_cards: Sequence[Card], suit_map: List[int]) -> int:
+        # Combo index of the hand with its suits relabeled like the board's
+        first, second = hole_cards
+        return _COMBO_INDEX[(first >> 2) * 4 + suit_map[first & 3]][(second >> 2) * 4 + suit_map[second & 3]]
+
+    def lookup(self, hole_cards: Sequence[Card], board: Sequence[Card]) -> Optional[Situation]:
+        """Strength, potential and board texture of a hand; None for boards the tables do not cover."""
+        found = self._board(board)
+        if found is None or len(hole_cards) != 2:
+            return None
+        index, suit_map = found
+        texture = int(self.streets[len(board)].textures[index])
+        strengths, potentials = self._rows[len(board)]
+        if strengths is None:
+            return Situation(None, None, texture)
+        offset = index * NUM_COMBOS + self._combo(hole_cards, suit_map)
+        return Situation(strengths[offset] / SCALE, None if potentials is None else potentials[offset] / SCALE,
+                         texture)
+
+    def texture(self, board: Sequence[Card]) -> Optional[int]:
+        found = self._board(board)
+        return None if found is None else int(self.streets[len(board)].textures[found[0]])
+
+    def strength(self, hole_cards: Sequence[Card], board: Sequence[Card], num_opponents: int = 1) -> Optional[float]:
+        """0-1 strength on the heuristic AI's scale, or None without rows for the street.
+
+        Current strength and potential are averaged so draws count for
+        something, then treated like equity against num_opponents.
+        """
+        # The AI asks on every post-flop decision, so this skips building a Situation
+        found = self._board(board)
+        if found is None or len(hole_cards) != 2:
+            return None
+        strengths, potentials = self._rows[len(board)]
+        if strengths is None:
+            return None
+        index, suit_map = found
+        offset = index * NUM_COMBOS + self._combo(hole_cards, suit_map)
+        strength = strengths[offset] / SCALE
+        if potentials is not None:
+            strength = (strength + potentials[offset] / SCALE) / 2
+        num_opponents = max(num_opponents, 1)
+        return scale_equity(strength ** num_opponents, num_opponents)
+
+    def save(self, path: str = DEFAULT_PATH):
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(self.streets)))
+            for num_cards, table in sorted(self.streets.items()):
+                flags = (STRENGTH if table.strength is not None else 0) | \
+                        (POTENTIAL if table.potential is not None else 0)
+                f.write(STREET_HEADER.pack(num_cards, flags, len(table.keys)))
+                f.write(np.ascontiguousarray(table.keys, dtype=np.int64).tobytes())
+                f.write(np.ascontiguousarray(table.textures, dtype=np.uint8).tobytes())
+                f.write(bytes(-len(table.keys) % 8))  # Keeps the next street's keys aligned
+                for rows in (table.strength, table.potential):
+                    if rows is not None:
+                        f.write(np.ascontiguousarray(rows, dtype=np.uint8).tobytes())
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> 'AbstractionTables':
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, num_streets = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an abstraction table!")
+        offset = HEADER.size
+        streets = {}
+        for _ in range(num_streets):
+            num_cards, flags, num_classes = STREET_HEADER.unpack_from(data, offset)
+            offset += STREET_HEADER.size
+            keys = np.frombuffer(data, dtype=np.int64, count=num_classes, offset=offset)
+            offset += 8 * num_classes
+            textures = np.frombuffer(data, dtype=np.uint8, count=num_classes, offset=offset)
+            offset += num_classes + -num_classes % 8
+            rows = []
+            for flag in (STRENGTH, POTENTIAL):
+                if flags & flag:
+                    rows.append(np.frombuffer(data, dtype=np.uint8, count=num_classes * NUM_COMBOS,
+                                              offset=offset).reshape(num_classes, NUM_COMBOS))
+                    offset += num_classes * NUM_COMBOS
+                else:
+                    rows.append(None)
+            streets[num_cards] = StreetTable(keys, textures, *rows)
+        return cls(streets)
+
+def _rows(keys: np.ndarray, next_cards: Optional[int], workers: int, seed: int,
+          chunk_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    chunks = [keys[start:start + chunk_size].tolist() for start in range(0, len(keys), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        return _build_rows(keys.tolist(), next_cards, seed)
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        results = list(pool.map(_build_rows, chunks, [next_cards] * len(chunks), [seed] * len(chunks)))
+    return np.vstack([rows for rows, _ in results]), np.vstack([rows for _, rows in results])
+
+def generate_tables(streets: Sequence[int] = STREETS, row_streets: Sequence[int] = ROW_STREETS,
+                    next_cards: Optional[int] = None, workers: Optional[int] = None, seed: int = 0,
+                    chunk_size: int = 256, boards: Optional[Sequence[Sequence[Card]]] = None) -> AbstractionTables:
+    """Build the tables: textures for every street, strength and potential rows for row_streets.
+
+    With boards, only their classes are built, which is enough for tests and benchmarks.
+    """
+    workers = workers or os.cpu_count() or 1
+    tables = {}
+    for num_cards in streets:
+        if boards is None:
+            keys = board_classes(num_cards)
+        else:
+            keys = np.unique(np.array([board_key(board)[0] for board in boards if len(board) == num_cards],
+                                      dtype=np.int64))
+        textures = np.array([board_texture(key_board(key)) for key in keys.tolist()], dtype=np.uint8)
+        strength = potential = None
+        if num_cards in row_streets:
+            strength, potential = _rows(keys, next_cards, workers, seed, chunk_size)
+            if num_cards == 5:
+                potential = None  # No cards to come
+        tables[num_cards] = StreetTable(keys, textures, strength, potential)
+    return AbstractionTables(tables)
+
+def _load_default() -> Optional[AbstractionTables]:
+    if not os.path.exists(DEFAULT_PATH):
+        return None
+    return AbstractionTables.load(DEFAULT_PATH)
+
+# Mapped once at startup; None until the tables have been generated
+TABLES = _load_default()
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the hand abstraction tables")
+    parser.add_argument('--workers', type=int, default=None, help="build processes (default: all cores)")
+    parser.add_argument('--next-cards', type=int, default=None,
+                        help="next cards sampled per board for the potential (default: all of them)")
+    parser.add_argument('--river-rows', action='store_true', help="also build river strength rows (178 MB)")
+    parser.add_argument('--output', default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    row_streets = STREETS if args.river_rows else ROW_STREETS
+    tables = generate_tables(row_streets=row_streets, next_cards=args.next_cards, workers=args.workers)
+    tables.save(args.output)
+    classes = ', '.join(f"{len(table.keys)} {num_cards}-card" for num_cards, table in sorted(tables.streets.items()))
+    print(f"Wrote {classes} board classes to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Per-player statistics streamed from hand records.
+
+Records are consumed one at a time and folded into small per-player
+counters, so memory stays constant however many hands go through. The
+counters of separate runs merge by addition, which is what the parallel
+mode relies on: each worker aggregates its own slice of a history file
+and the slices are merged at the end.
+
+VPIP and PFR are shares of hands dealt in which the player voluntarily
+put chips in (or raised) before the flop. The aggression factor is
+raises over calls. The showdown win rate is the share of showdowns the
+player won chips in, and bb/100 is the mean result per hand in big
+blinds times 100, with a normal-approximation confidence interval.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+import argparse
+import math
+import os
+from hand_history import HandHistoryReader, HandRecord
+
+@dataclass
+class PlayerStats:
+    hands: int = 0
+    vpip: int = 0  # Hands with a voluntary pre-flop call or raise
+    pfr: int = 0  # Hands with a pre-flop raise
+    raises: int = 0
+    calls: int = 0
+    showdowns: int = 0
+    showdowns_won: int = 0
+    big_blinds: float = 0.0  # Sum of results in big blinds
+    big_blinds_squared: float = 0.0
+
+    def merge(self, other: 'PlayerStats'):
+        self.hands += other.hands
+        self.vpip += other.vpip
+        self.pfr += other.pfr
+        self.raises += other.raises
+        self.calls += other.calls
+        self.showdowns += other.showdowns
+        self.showdowns_won += other.showdowns_won
+        self.big_blinds += other.big_blinds
+        self.big_blinds_squared += other.big_blinds_squared
+
+@dataclass
+class PlayerReport:
+    player_id: int
+    hands: int
+    vpip: float
+    pfr: float
+    aggression: float  # Raises per call (inf when the player raised but never called, 0 when they did neither)
+    showdown_win_rate: float
+    bb_per_100: float
+    bb_per_100_error: float  # Half-width of the confidence interval
+
+    @property
+    def bb_per_100_interval(self):
+        return self.bb_per_100 - self.bb_per_100_error, self.bb_per_100 + self.bb_per_100_error
+
+class HandAnalytics:
+    """Running per-player statistics; feed it records with add() or consume()."""
+    def __init__(self):
+        self.players: Dict[int, PlayerStats] = {}
+        self.hands = 0
+
+    def add(self, record: HandRecord):
+        self.hands += 1
+        voluntary = set()
+        raised = set()
+        folded = set()
+        stats = [self._stats(player_id) for player_id in record.player_ids]
+        for action in record.actions:
+            if action.action == 'raise':
+                stats[action.seat].raises += 1
+            elif action.action == 'call':
+                stats[action.seat].calls += 1
+            elif action.action == 'fold':
+                folded.add(action.seat)
+            if action.street == 'pre-flop' and action.action in ('call', 'raise'):
+                voluntary.add(action.seat)
+                if action.action == 'raise':
+                    raised.add(action.seat)
+
+        big_blind = record.big_blind or 1
+        winners = set(record.winners)
+        for seat, (player, start, end) in enumerate(zip(stats, record.start_stacks, record.end_stacks)):
+            if start <= 0:
+                continue  # Sat out with no chips
+            player.hands += 1
+            player.vpip += seat in voluntary
+            player.pfr += seat in raised
+            if record.showdown and seat not in folded:
+                player.showdowns += 1
+                player.showdowns_won += seat in winners
+            result = (end - start) / big_blind
+            player.big_blinds += result
+            player.big_blinds_squared += result * result
+
+    def consume(self, records: Iterable[HandRecord]) -> 'HandAnalytics':
+        for record in records:
+            self.add(record)
+        return self
+
+    def merge(self, other: 'HandAnalytics') -> 'HandAnalytics':
+        self.hands += other.hands
+        for player_id, stats in other.players.items():
+            self._stats(player_id).merge(stats)
+        return self
+
+    def report(self, z: float = 1.96) -> Dict[int, PlayerReport]:
+        """Statistics per player id; z sets the confidence level of bb/100 (1.96 for 95%)."""
+        reports = {}
+        for player_id, stats in sorted(self.players.items()):
+            n = stats.hands
+            if not n:
+                continue
+            mean = stats.big_blinds / n
+            variance = max(0.0, stats.big_blinds_squared / n - mean * mean) * n / (n - 1) if n > 1 else 0.0
+            reports[player_id] = PlayerReport(
+                player_id=player_id,
+                hands=n,
+                vpip=stats.vpip / n,
+                pfr=stats.pfr / n,
+                aggression=stats.raises / stats.calls if stats.calls else math.inf if stats.raises else 0.0,
+                showdown_win_rate=stats.showdowns_won / stats.showdowns if stats.showdowns else 0.0,
+                bb_per_100=100 * mean,
+                bb_per_100_error=100 * z * math.sqrt(variance / n),
+            )
+        return reports
+
+    def _stats(self, player_id: int) -> PlayerStats:
+        stats = self.players.get(player_id)
+        if stats is None:
+            stats = self.players[player_id] = PlayerStats()
+        return stats
+
+def _analyze_range(path: str, start: int, stop: int) -> HandAnalytics:
+    with HandHistoryReader(path) as reader:
+        return HandAnalytics().consume(reader.iter_range(start, stop))
+
+def analyze_file(path: str, workers: Optional[int] = None, chunk_hands: int = 50000) -> HandAnalytics:
+    """Map-reduce a hand history file: chunks are aggregated in worker processes, then merged."""
+    with HandHistoryReader(path) as reader:
+        total = len(reader)
+    chunks = [(start, min(start + chunk_hands, total)) for start in range(0, total, chunk_hands)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) <= 1:
+        return _analyze_range(path, 0, total)
+
+    result = HandAnalytics()
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        futures = [pool.submit(_analyze_range, path, start, stop) for start, stop in chunks]
+        for future in futures:
+            result.merge(future.result())
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-player statistics from a hand history file")
+    parser.add_argument('path')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    analytics = analyze_file(args.path, workers=args.workers)
+    print(f"{analytics.hands} hands")
+    print(f"{'player':>6} {'hands':>8} {'VPIP':>6} {'PFR':>6} {'AF':>5} {'SD won':>7} {'bb/100':>16}")
+    for report in analytics.report().values():
+        print(f"{report.player_id:>6} {report.hands:>8} {report.vpip:>6.1%} {report.pfr:>6.1%} "
+              f"{report.aggression:>5.2f} {report.showdown_win_rate:>7.1%} "
+              f"{report.bb_per_100:>8.1f} ± {report.bb_per_100_error:<6.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+from typing import Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import sys
+import time
+from card import Card
+from game import TexasHoldem
+from player import Player
+
+class Seat:
+    """Where a player's decisions come from at an AsyncTable."""
+    async def decide(self, player: Player, to_call: int, pot: int, community_cards: List[Card]) -> Tuple[str, int]:
+        raise NotImplementedError
+
+    async def notify(self, message: str):
+        # Seats that have someone watching get told what happens at the table
+        pass
+
+class AISeat(Seat):
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay  # Pacing per decision; awaited, so other tables keep running
+
+    async def decide(self, player: Player, to_call: int, pot: int, community_cards: List[Card]) -> Tuple[str, int]:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        decide = getattr(player, 'make_decision', player.ai_make_decision)
+        return decide(to_call, pot, community_cards)
+
+class StreamSeat(Seat):
+    """A remote or local human speaking a line protocol.
+
+    The seat is sent the situation and answers with one line: "fold",
+    "check", "call", or "raise <total bet>".
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: Optional[asyncio.StreamWriter] = None):
+        self.reader = reader
+        self.writer = writer
+
+    async def notify(self, message: str):
+        if self.writer is None:
+            print(message)
+            return
+        self.writer.write(f"{message}\n".encode())
+        await self.writer.drain()
+
+    async def decide(self, player: Player, to_call: int, pot: int, community_cards: List[Card]) -> Tuple[str, int]:
+        board = ' '.join(str(card) for card in community_cards) or '-'
+        hand = ' '.join(str(card) for card in player.hand)
+        await self.notify(f"TURN hand={hand} board={board} pot={pot} to_call={to_call} chips={player.chips}")
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                return 'fold', 0  # Disconnected
+            words = line.decode().split()
+            if not words:
+                continue
+            action = words[0].lower()
+            if action == 'fold':
+                return 'fold', 0
+            if action in ['call', 'check']:
+                return 'call', to_call
+            if action in ['raise', 'bet'] and len(words) == 2 and words[1].isdigit():
+                return 'raise', int(words[1])
+            await self.notify("ERROR expected: fold | check | call | raise <amount>")
+
+async def stdin_seat() -> StreamSeat:
+    # A StreamSeat reading answers from this process's standard input
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    return StreamSeat(reader)
+
+class AsyncTable:
+    """Runs hands of a headless TexasHoldem table with every decision awaited.
+
+    Each turn waits at most decision_timeout seconds for the seat's answer;
+    a seat that runs out of time checks when it can and folds otherwise.
+    Many tables can share one event loop since nothing here blocks.
+    """
+    def __init__(self, game: TexasHoldem, seats: Optional[Dict[Player, Seat]] = None,
+                 decision_timeout: float = 30.0):
+        self.game = game
+        self.seats = seats or {}
+        self.default_seat = AISeat()
+        self.decision_timeout = decision_timeout
+
+    async def play_hand(self) -> List[Player]:
+        game = self.game
+        betting = game.betting_round
+        steps = game.hand_steps()
+        decision, winners = None, None
+        while winners is None:
+            try:
+                player = steps.send(decision)
+            except StopIteration as done:
+                winners = done.value
+            if decision is not None:
+                street, actor, action, amount = betting.actions[-1]
+                await self._broadcast(f"ACTION {actor.name} {action} {amount}")
+            if winners is None:
+                decision = await self._ask(player)
+
+        await self._broadcast(f"RESULT board={' '.join(str(card) for card in game.game_state.community_cards)} "
+                              f"winners={','.join(winner.name for winner in winners)}")
+        game.dealer_pos = (game.dealer_pos + 1) % len(game.players)
+        return winners
+
+    async def play(self, num_hands: int) -> int:
+        # Plays until num_hands are done or only one player has chips; returns hands played
+        for hand in range(num_hands):
+            if sum(1 for player in self.game.players if player.chips > 0) < 2:
+                return hand
+            await self.play_hand()
+        return num_hands
+
+    async def _ask(self, player: Player) -> Tuple[str, int]:
+        betting = self.game.betting_round
+        to_call = betting.current_bet - player.current_bet
+        seat = self.seats.get(player, self.default_seat)
+        try:
+            return await asyncio.wait_for(
+                seat.decide(player, to_call, betting.pot, list(self.game.game_state.community_cards)),
+                self.decision_timeout)
+        except asyncio.TimeoutError:
+            await seat.notify("TIMEOUT")
+            return ('call', 0) if to_call == 0 else ('fold', 0)
+
+    async def _broadcast(self, message: str):
+        for seat in self.seats.values():
+            await seat.notify(message)
+
+async def run_ai_tables(num_tables: int, hands_per_table: int, players_per_table: int = 6,
+                        ai_delay: float = 0.0, seed: Optional[int] = None) -> int:
+    """Play many all-AI tables concurrently on the running event loop; returns total hands.
+
+    With a seed, table i deals and decides from the (seed, i) stream, so
+    the result does not depend on how the loop interleaves the tables.
+    """
+    tables = []
+    for table_id in range(num_tables):
+        game = TexasHoldem(num_ai_players=players_per_table, headless=True, seed=seed, table_id=table_id)
+        table = AsyncTable(game, {player: AISeat(ai_delay) for player in game.players})
+        tables.append(table)
+    played = await asyncio.gather(*(table.play(hands_per_table) for table in tables))
+    return sum(played)
+
+async def serve_table(host: str = '127.0.0.1', port: int = 8765, num_ai_players: int = 3,
+                      hands: int = 100, decision_timeout: float = 60.0):
+    """Host one table; the first connection takes the human seat and the rest are AI."""
+    seated = asyncio.get_running_loop().create_future()
+
+    async def on_connect(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if seated.done():
+            writer.write(b"ERROR table is full\n")
+            await writer.drain()
+            writer.close()
+            return
+        seated.set_result(StreamSeat(reader, writer))
+
+    server = await asyncio.start_server(on_connect, host, port)
+    async with server:
+        seat = await seated
+        game = TexasHoldem(num_ai_players=num_ai_players, headless=True)
+        human = Player("You")
+        game.players = [human] + game.players
+        table = AsyncTable(game, {human: seat, **{p: AISeat(0.5) for p in game.players[1:]}},
+                           decision_timeout=decision_timeout)
+        await table.play(hands)
+        await seat.notify("BYE")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run asyncio poker tables")
+    parser.add_argument('--tables', type=int, default=200, help="AI tables to run on one event loop")
+    parser.add_argument('--hands', type=int, default=50, help="hands per table")
+    parser.add_argument('--serve', type=int, metavar='PORT', help="host a table for one remote human instead")
+    args = parser.parse_args()
+
+    if args.serve:
+        asyncio.run(serve_table(port=args.serve, hands=args.hands))
+        return
+    start = time.perf_counter()
+    hands = asyncio.run(run_ai_tables(args.tables, args.hands))
+    elapsed = time.perf_counter() - start
+    print(f"{hands} hands on {args.tables} tables in {elapsed:.1f}s ({hands / elapsed:.0f} hands/s)")
+
+if __name__ == "__main__":
+    main()
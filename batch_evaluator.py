@@ -0,0 +1,98 @@
+"""Vectorized hand evaluation for many hands at once.
+
+A hand's best rank only depends on two things: its multiset of card ranks
+(when it holds no flush) and the ranks in its flush suit (when it does).
+Both are precomputed from the treys lookup tables at import:
+
+* every multiset of 5, 6 or 7 ranks is keyed by the product of one prime
+  per rank and mapped to its best non-flush rank (the best of the
+  multisets one rank smaller), and
+* every 13-bit mask of flush ranks is mapped to its best flush or
+  straight flush rank.
+
+A batch is then scored with a handful of array operations and a single
+np.searchsorted per hand instead of 21 dict lookups, and the resulting
+ranks are identical to Evaluator.evaluate.
+"""
+from itertools import combinations, combinations_with_replacement
+from typing import List
+import numpy as np
+from card import Card
+from evaluator import EVALUATOR
+
+PRIMES = np.array([2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41], dtype=np.int64)
+CARD_PRIMES = np.repeat(PRIMES, 4)  # Card ints are rank index * 4 + suit index
+CARD_RANK_BITS = np.repeat(1 << np.arange(13, dtype=np.int64), 4)
+CARD_SUITS = np.tile(np.arange(4, dtype=np.int64), 13)
+WORST_RANK = 7462
+
+def _multiset_table(size: int, smaller=None):
+    # Best non-flush rank of every multiset of `size` ranks, keyed by prime product
+    multisets = np.array(list(combinations_with_replacement(range(13), size)), dtype=np.intp)
+    if size > 4:
+        # Sorted ranks hold five of a kind when a rank equals the one four places on
+        multisets = multisets[~(multisets[:, 4:] == multisets[:, :-4]).any(axis=1)]
+    keys = PRIMES[multisets].prod(axis=1)
+
+    if smaller is None:
+        lookup = EVALUATOR.table.unsuited_lookup
+        best = np.array([lookup[key] for key in keys.tolist()], dtype=np.int32)
+    else:
+        # The best hand drops one card, so take the best multiset one rank smaller
+        smaller_keys, smaller_values = smaller
+        without_one = keys[:, None] // PRIMES[multisets]
+        best = smaller_values[np.searchsorted(smaller_keys, without_one)].min(axis=1)
+
+    order = np.argsort(keys)
+    return keys[order], best[order]
+
+def _flush_table() -> np.ndarray:
+    # Best flush rank for every 13-bit mask of ranks in one suit (WORST_RANK + 1 when under five)
+    table = np.full(1 << 13, WORST_RANK + 1, dtype=np.int32)
+    flush_lookup = EVALUATOR.table.flush_lookup
+    primes = PRIMES.tolist()
+    for ranks in combinations(range(13), 5):
+        table[sum(1 << rank for rank in ranks)] = flush_lookup[
+            primes[ranks[0]] * primes[ranks[1]] * primes[ranks[2]] * primes[ranks[3]] * primes[ranks[4]]]
+    # Larger masks take the best of the masks with one rank removed
+    for size in (6, 7):
+        for ranks in combinations(range(13), size):
+            mask = sum(1 << rank for rank in ranks)
+            table[mask] = min(table[mask & ~(1 << rank)] for rank in ranks)
+    return table
+
+MULTISET_TABLES = {5: _multiset_table(5)}
+MULTISET_TABLES[6] = _multiset_table(6, MULTISET_TABLES[5])
+MULTISET_TABLES[7] = _multiset_table(7, MULTISET_TABLES[6])
+FLUSH_TABLE = _flush_table()
+
+# Hands per chunk, which keeps the intermediate arrays to a few MB
+CHUNK_SIZE = 65536
+
+def evaluate_batch(cards: np.ndarray) -> np.ndarray:
+    """Rank N hands of 5 to 7 card ints given as an (N, k) array; returns N treys ranks."""
+    cards = np.asarray(cards, dtype=np.intp)
+    if cards.ndim != 2 or cards.shape[1] not in MULTISET_TABLES:
+        raise ValueError("Hands must be an (N, 5), (N, 6) or (N, 7) array of card ints!")
+    if len(cards) > CHUNK_SIZE:
+        return np.concatenate([evaluate_batch(cards[start:start + CHUNK_SIZE])
+                               for start in range(0, len(cards), CHUNK_SIZE)])
+
+    keys, values = MULTISET_TABLES[cards.shape[1]]
+    ranks = values[np.searchsorted(keys, CARD_PRIMES[cards].prod(axis=1))]
+
+    # At most one suit can hold five cards out of seven
+    suits = CARD_SUITS[cards]
+    suit_counts = np.stack([(suits == suit).sum(axis=1) for suit in range(4)], axis=1)
+    flush_rows = np.flatnonzero(suit_counts.max(axis=1) >= 5)
+    if len(flush_rows):
+        flush_suits = suit_counts[flush_rows].argmax(axis=1)
+        in_suit = suits[flush_rows] == flush_suits[:, None]
+        masks = (CARD_RANK_BITS[cards[flush_rows]] * in_suit).sum(axis=1)
+        ranks[flush_rows] = np.minimum(ranks[flush_rows], FLUSH_TABLE[masks])
+    return ranks
+
+def rank_hands(holes: List[List[Card]], board: List[Card]) -> List[int]:
+    # Ranks of several hole card pairs on one shared board in a single call
+    cards = np.array([list(hole) + list(board) for hole in holes], dtype=np.intp)
+    return evaluate_batch(cards).tolist()
@@ -0,0 +1,67 @@
+from typing import List, Optional
+import time
+from game import TexasHoldem
+from strategy import HeuristicStrategy, Strategy, seat_snapshot
+
+class BatchTables:
+    """Plays many headless tables in lockstep with one strategy deciding for every seat.
+
+    Each step gathers the pending decision of every table that is waiting
+    on one and hands them all to strategy.decide_batch together, so a
+    strategy that vectorizes pays its per-call cost once per step rather
+    than once per table.
+    """
+    def __init__(self, games: List[TexasHoldem], strategy: Optional[Strategy] = None):
+        self.games = games
+        self.strategy = strategy or HeuristicStrategy()
+        self.batches = 0  # decide_batch calls made
+        self.decisions = 0
+
+    def play(self, num_hands: int) -> int:
+        """Play num_hands at every table (fewer where one player wins all the chips); returns total hands."""
+        hands = [0] * len(self.games)
+        steps = [None] * len(self.games)
+        pending = {}  # Table index -> player waiting to act
+
+        def advance(table: int, decision=None):
+            # Run a table up to its next decision, starting new hands as old ones finish
+            while True:
+                game = self.games[table]
+                if steps[table] is None:
+                    if hands[table] >= num_hands or sum(1 for p in game.players if p.chips > 0) < 2:
+                        return
+                    steps[table] = game.hand_steps()
+                try:
+                    pending[table] = steps[table].send(decision)
+                    return
+                except StopIteration:
+                    steps[table] = None
+                    decision = None
+                    hands[table] += 1
+                    game.dealer_pos = (game.dealer_pos + 1) % len(game.players)
+
+        for table in range(len(self.games)):
+            advance(table)
+        while pending:
+            tables = list(pending)
+            snapshots = []
+            for table in tables:
+                player, betting = pending.pop(table), self.games[table].betting_round
+                seat = player.seat
+                snapshots.append(seat_snapshot(betting.seats, seat, betting.current_bet - betting.seats.bets[seat],
+                                               betting.pot, self.games[table].game_state.community_cards,
+                                               player.num_opponents))
+            decisions = self.strategy.decide_batch(snapshots, [self.games[table].rng for table in tables])
+            self.batches += 1
+            self.decisions += len(decisions)
+            for table, decision in zip(tables, decisions):
+                advance(table, decision)
+        return sum(hands)
+
+def run_batch_tables(num_tables: int, hands_per_table: int, players_per_table: int = 6,
+                     strategy: Optional[Strategy] = None) -> float:
+    """Play hands_per_table hands on num_tables batched tables; returns hands per second."""
+    games = [TexasHoldem(num_ai_players=players_per_table, headless=True) for _ in range(num_tables)]
+    start = time.perf_counter()
+    hands = BatchTables(games, strategy).play(hands_per_table)
+    return hands / (time.perf_counter() - start)
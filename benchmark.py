@@ -0,0 +1,221 @@
+"""Benchmarks for the engine's hot paths and for whole hands.
+
+Each benchmark runs its operation in a loop a few times over and keeps the
+fastest round, reported as seconds per operation. Results can be written
+as JSON and compared with a stored baseline run, flagging every benchmark
+that got slower by more than the threshold:
+
+    python benchmark.py --output baseline.json
+    python benchmark.py --baseline baseline.json --threshold 0.1
+"""
+from itertools import cycle
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import numpy as np
+import equity
+from abstraction import generate_tables
+from betting import BettingRound
+from card import Card, Deck
+from game import TexasHoldem
+from game_state import GameState
+from player import Player
+from ranges import ACTION_LIKELIHOODS, STRENGTH_BUCKETS, Range, combo_strengths, hand_vs_range, range_vs_range
+from strategy import GameSnapshot, HeuristicStrategy
+
+def measure(operation: Callable[[], object], number: int, repeat: int = 5) -> float:
+    """Fastest of repeat rounds of number calls, in seconds per call."""
+    number = max(1, number)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+def _ai_players(count: int) -> List[Player]:
+    players = [Player(f"AI Player {i + 1}", is_ai=True) for i in range(count)]
+    for player in players:
+        player.rng = random.Random(0)
+    return players
+
+def _deal(players: List[Player], deck: Deck, board_cards: int = 0) -> List[Card]:
+    deck.reset()
+    deck.shuffle()
+    for player in players:
+        player.clear_hand()
+        player.hand = [deck.draw(), deck.draw()]
+    return [deck.draw() for _ in range(board_cards)]
+
+def bench_deck(scale: float) -> Dict[str, float]:
+    deck = Deck(random.Random(0))
+    lazy = Deck(random.Random(0), lazy=True)
+
+    def deal(deck):
+        deck.reset()
+        deck.shuffle()
+        for _ in range(17):  # Six seats and a full board
+            deck.draw()
+
+    return {
+        'deck.reset': measure(deck.reset, int(100000 * scale)),
+        'deck.shuffle': measure(deck.shuffle, int(20000 * scale)),
+        'deck.draw': measure(lambda: (deck.draw(), deck.reset()), int(100000 * scale)),
+        'deck.deal_6_seats': measure(lambda: deal(deck), int(10000 * scale)),
+        'deck.deal_6_seats_lazy': measure(lambda: deal(lazy), int(10000 * scale)),
+    }
+
+def bench_hand_strength(scale: float) -> Dict[str, float]:
+    player = _ai_players(1)[0]
+    deck = Deck(random.Random(1))
+    river = _deal([player], deck, 5)
+    hands = []
+    for _ in range(1000):
+        board = _deal([player], deck, 5)
+        hands.append((tuple(player.hand), board))
+    hands = cycle(hands)
+
+    def fresh_river():
+        player.hand, board = next(hands)
+        player._evaluate_hand_strength(board)
+
+    return {
+        'player.hand_strength_preflop': measure(lambda: player._evaluate_hand_strength([]), int(50000 * scale)),
+        'player.hand_strength_river_cached': measure(lambda: player._evaluate_hand_strength(river), int(50000 * scale)),
+        'player.hand_strength_river': measure(fresh_river, int(20000 * scale)),
+    }
+
+def bench_betting(scale: float) -> Dict[str, float]:
+    players = _ai_players(6)
+    betting = BettingRound(players, verbose=False)
+    deck = Deck(random.Random(2))
+
+    def preflop():
+        _deal(players, deck)
+        for player in players:
+            player.chips = 1000
+        betting.post_blinds(0)
+        betting.handle_betting_round('pre-flop', 3)
+
+    return {'betting.preflop_6_seats': measure(preflop, int(5000 * scale))}
+
+def bench_showdown(scale: float) -> Dict[str, float]:
+    results = {}
+    for seats in [2, 6, 10]:
+        players = _ai_players(seats)
+        state = GameState(players, verbose=False)
+        state.community_cards = _deal(players, Deck(random.Random(3)), 5)
+        contributions = {player: 100 * (i + 1) for i, player in enumerate(players)}  # Side pots for everyone
+        pot = sum(contributions.values())
+        results[f'showdown.{seats}_seats'] = measure(lambda: state.handle_showdown(pot, contributions),
+                                                     int(5000 * scale))
+    return results
+
+def bench_full_hands(scale: float) -> Dict[str, float]:
+    results = {}
+    for seats in [2, 6, 10]:
+        game = TexasHoldem(num_ai_players=seats, headless=True, seed=seats)
+
+        def hand():
+            for player in game.players:
+                player.chips = 1000
+            game._play_round()
+            game.dealer_pos = (game.dealer_pos + 1) % seats
+
+        results[f'hand.{seats}_seats'] = measure(hand, int(1000 * scale))
+    return results
+
+def bench_ranges(scale: float) -> Dict[str, float]:
+    deck = Deck(random.Random(4))
+    deck.shuffle()
+    hole = [deck.draw(), deck.draw()]
+    board = [deck.draw() for _ in range(5)]
+    tracked = Range()
+    tracked.narrow(ACTION_LIKELIHOODS['raise'][np.searchsorted(STRENGTH_BUCKETS, combo_strengths(board[:3]))])
+    return {
+        'ranges.combo_strengths_flop': measure(lambda: combo_strengths(board[:3]), int(1000 * scale)),
+        'ranges.hand_vs_range_flop': measure(lambda: hand_vs_range(hole, board[:3], tracked, seed=0),
+                                             int(300 * scale)),
+        'ranges.hand_vs_5_ranges_flop': measure(lambda: hand_vs_range(hole, board[:3], [tracked] * 5, seed=0),
+                                                int(100 * scale)),
+        'ranges.range_vs_range_river': measure(lambda: range_vs_range(tracked, Range(), board), int(300 * scale)),
+    }
+
+def bench_abstraction(scale: float) -> Dict[str, float]:
+    # Turn strength of five hands on each of 100 boards, every hand and board new to the caches,
+    # from a live six-card evaluation and from the abstraction tables (built for just these boards)
+    deck = Deck(random.Random(5))
+    snapshots = []
+    for _ in range(100):
+        board = _deal([], deck, 4)
+        for _ in range(5):
+            snapshots.append(GameSnapshot((deck.draw(), deck.draw()), tuple(board), 20, 100, 1000, 0, 2))
+    tables = generate_tables(streets=(4,), row_streets=(4,), next_cards=1, workers=1,
+                             boards=[snapshot.board for snapshot in snapshots])
+    live, tabled = HeuristicStrategy(), HeuristicStrategy(abstraction=tables)
+
+    def strengths(strategy):
+        equity._rank_cache.clear()
+        tables._boards.clear()
+        for snapshot in snapshots:
+            strategy._strength(snapshot)
+
+    number = max(1, int(20 * scale))
+    return {
+        'strategy.strength_turn_live': measure(lambda: strengths(live), number) / len(snapshots),
+        'strategy.strength_turn_tabled': measure(lambda: strengths(tabled), number) / len(snapshots),
+    }
+
+BENCHMARKS = [bench_deck, bench_hand_strength, bench_betting, bench_showdown, bench_full_hands, bench_ranges,
+              bench_abstraction]
+
+def run(scale: float = 1.0) -> Dict[str, float]:
+    results = {}
+    for benchmark in BENCHMARKS:
+        results.update(benchmark(scale))
+    return results
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """Names of benchmarks more than threshold (a fraction) slower than the baseline."""
+    return [name for name, seconds in results.items()
+            if name in baseline and seconds > baseline[name] * (1 + threshold)]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the poker engine")
+    parser.add_argument('--scale', type=float, default=1.0, help="multiplies the iterations of every benchmark")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1, help="slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.scale)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    for name, seconds in results.items():
+        line = f"{name:<36} {seconds * 1e6:>10.2f} us"
+        if baseline and name in baseline:
+            line += f"  ({seconds / baseline[name] - 1:+.0%} vs baseline)"
+        print(line)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'results': results}, f, indent=2)
+
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+        for name in regressions:
+            print(f"REGRESSION {name}: {results[name] / baseline[name] - 1:+.0%}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
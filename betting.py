@@ -1,20 +1,145 @@
-from typing import List
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 from colorama import Fore, Style
 import time
 from player import Player
+from seats import ALL_IN, FOLDED, SeatArrays
+from events import (BlindPosted, ConsoleRenderer, DecisionRequested, EventBus, InputRejected, PlayerActed,
+                    StreetStarted, TurnStarted)
+
+STREET_NAMES = ['pre-flop', 'flop', 'turn', 'river']
+ACTION_NAMES = ['small_blind', 'big_blind', 'fold', 'check', 'call', 'raise']
+STREET_CODES = {name: code for code, name in enumerate(STREET_NAMES)}
+ACTION_CODES = {name: code for code, name in enumerate(ACTION_NAMES)}
+# Action bits of a packed ActionLog word, for the betting round's hot path
+FOLD, CHECK, CALL, RAISE = (ACTION_CODES[name] << 4 for name in ('fold', 'check', 'call', 'raise'))
+
+class ActionLog:
+    """The actions of one hand, packed into one int each.
+
+    Entries read back as (street, player, action, chips put in) tuples, the
+    players being looked up by seat in the betting round, so the log is
+    only meaningful while the hand's seating is unchanged.
+    """
+    __slots__ = ('_round', '_words')
+
+    def __init__(self, betting_round: 'BettingRound'):
+        self._round = betting_round
+        self._words = array('q')  # chips << 16 | seat << 8 | action << 4 | street
+
+    def record(self, street: str, seat: int, action: str, amount: int):
+        self._words.append(amount << 16 | seat << 8 | ACTION_CODES[action] << 4 | STREET_CODES[street])
+
+    def append(self, entry: Tuple[str, Player, str, int]):
+        street, player, action, amount = entry
+        self.record(street, player.seat, action, amount)
+
+    def clear(self):
+        del self._words[:]
+
+    def _unpack(self, word: int) -> Tuple[str, Player, str, int]:
+        return (STREET_NAMES[word & 0xF], self._round.players[word >> 8 & 0xFF],
+                ACTION_NAMES[word >> 4 & 0xF], word >> 16)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __iter__(self) -> Iterator[Tuple[str, Player, str, int]]:
+        return map(self._unpack, self._words)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._unpack(word) for word in self._words[index]]
+        return self._unpack(self._words[index])
+
+    def __delitem__(self, index):
+        del self._words[index]
+
+class StreetState(NamedTuple):
+    """The incremental state of the street being played, as saved and restored by table_state."""
+    pending: int  # Players in the ring who still owe an action
+    live: int  # Players who have not folded
+    ring_size: int
+    cursor: int  # Seat whose turn it is
+    next: List[int]  # Next seat in the ring of seats that can still act
+    prev: List[int]
+    in_ring: List[bool]
 
 class BettingRound:
-    def __init__(self, players: List[Player], small_blind: int = 10, big_blind: int = 20):
+    """Runs the betting of one hand, one street at a time.
+
+    Within a street every action costs O(1): the seats that can still act
+    (not folded, not all-in) form a ring linked through _next/_prev, and the
+    round keeps running counts of live players, players still owing an
+    action and the pot, instead of rescanning the table after each action.
+    Per-seat bets and contributions live in the table's SeatArrays.
+    """
+    def __init__(self, players: List[Player], small_blind: int = 10, big_blind: int = 20, verbose: bool = True,
+                 events: Optional[EventBus] = None):
         self.players = players
         self.small_blind = small_blind
         self.big_blind = big_blind
+        self.verbose = verbose  # Headless runs skip AI pacing
+        # Where progress is reported; by default the console when verbose and nowhere otherwise
+        self.events = events if events is not None else EventBus([ConsoleRenderer()] if verbose else [])
         self.pot = 0
-        self.current_bet = 0
-        self.round_bets = {}  # Track bets for each player in the current round
+        self.current_bet = 0  # Amount every player has to match this street
+        self.street = "pre-flop"
+        self.actions = ActionLog(self)  # (street, player, action, chips put in) for every action this hand
+        
+        # Incremental state of the street being played
+        self._next = []  # Next seat in the ring of seats that can still act
+        self._prev = []
+        self._in_ring = []
+        self._ring_size = 0
+        self._live = 0  # Players who have not folded
+        self._pending = 0  # Players in the ring who still owe an action
+        self._cursor = 0  # Seat whose turn it is
+        
+    @property
+    def players(self) -> List[Player]:
+        return self._players
+        
+    @players.setter
+    def players(self, players: List[Player]):
+        # Seat the players in fresh arrays; each Player reads and writes its own slot
+        self._players = players
+        self.seats = SeatArrays(len(players))
+        for seat, player in enumerate(players):
+            player.bind(self.seats, seat)
+            
+    @property
+    def players_left(self) -> int:
+        """Players still in the hand, i.e. who have not folded."""
+        return self._live
+        
+    @property
+    def street_state(self) -> StreetState:
+        return StreetState(self._pending, self._live, self._ring_size, self._cursor,
+                           list(self._next), list(self._prev), list(self._in_ring))
+        
+    @street_state.setter
+    def street_state(self, state: StreetState):
+        self._pending, self._live, self._ring_size, self._cursor = state.pending, state.live, state.ring_size, state.cursor
+        self._next, self._prev, self._in_ring = list(state.next), list(state.prev), list(state.in_ring)
+        
+    @property
+    def round_bets(self) -> Dict[Player, int]:
+        """Each player's bet this street."""
+        return {player: self.seats.bets[seat] for seat, player in enumerate(self.players)}
+        
+    @property
+    def contributions(self) -> Dict[Player, int]:
+        """Chips each player has put in this hand, for building side pots."""
+        return {player: self.seats.contributions[seat] for seat, player in enumerate(self.players)}
         
     def post_blinds(self, dealer_pos: int) -> None:
-        # Reset round bets
-        self.round_bets = {player: 0 for player in self.players}
+        # Reset the contributions and the pot for the new hand
+        self.seats.clear_contributions()
+        self.pot = 0
+        self.current_bet = 0
+        self.street = "pre-flop"
+        self.actions.clear()
         
         # Small blind position
         sb_pos = (dealer_pos + 1) % len(self.players)
@@ -23,105 +148,139 @@ class BettingRound:
         # Post small blind
         sb_player = self.players[sb_pos]
         sb_amount = min(self.small_blind, sb_player.chips)
-        sb_player.make_bet(sb_amount)
-        self.round_bets[sb_player] = sb_amount
-        self.pot += sb_amount
-        print(f"\n{sb_player.name} posts small blind: {sb_amount}")
+        self._put_in(sb_player.seat, sb_amount)
+        self.actions.record(self.street, sb_player.seat, 'small_blind', sb_amount)
+        if self.events:
+            self.events.emit(BlindPosted(sb_player.name, 'small', sb_amount))
         
         # Post big blind
         bb_player = self.players[bb_pos]
         bb_amount = min(self.big_blind, bb_player.chips)
-        bb_player.make_bet(bb_amount)
-        self.round_bets[bb_player] = bb_amount
-        self.pot += bb_amount
+        self._put_in(bb_player.seat, bb_amount)
+        self.actions.record(self.street, bb_player.seat, 'big_blind', bb_amount)
         self.current_bet = bb_amount
-        print(f"{bb_player.name} posts big blind: {bb_amount}")
+        if self.events:
+            self.events.emit(BlindPosted(bb_player.name, 'big', bb_amount))
         
     def handle_betting_round(self, round_name: str, start_from: int, community_cards: List = None) -> bool:
-        print(f"\n{Fore.YELLOW}=== {round_name.upper()} Betting Round ==={Style.RESET_ALL}")
+        if not self.start_round(round_name, start_from):
+            return False
+            
+        player = self.next_to_act()
+        while player is not None:
+            action, amount = self.decide(player, community_cards)
+            self.apply_decision(player, action, amount)
+            player = self.next_to_act()
+        return True
+        
+    def decide(self, player: Player, community_cards: List = None) -> Tuple[str, int]:
+        """Ask the player to act: the human seat through its prompts, AI seats through their strategy."""
+        if player.is_ai:
+            return self._handle_ai_turn(player, community_cards)
+        return self._handle_player_turn(player, community_cards)
         
-        active_players = [p for p in self.players if not p.folded and p.chips > 0]
-        if len(active_players) <= 1:
+    def start_round(self, round_name: str, start_from: int) -> bool:
+        """Open a betting round; returns False when fewer than two players can still bet.
+
+        The round is then driven one action at a time: next_to_act() names the
+        player to decide and apply_decision() applies what they chose, until
+        next_to_act() returns None.
+        """
+        if self.events:
+            self.events.emit(StreetStarted(round_name))
+        self.street = round_name
+        
+        num_seats = len(self.players)
+        flags, chips = self.seats.flags, self.seats.chips
+        ring = [seat for seat in range(num_seats) if not flags[seat] & FOLDED and chips[seat] > 0]
+        if len(ring) <= 1:
             return False
             
         # Reset current bets for the new betting round (except pre-flop)
         if round_name != "pre-flop":
             self.current_bet = 0
-            self.pot = sum(self.round_bets.values())  # Add previous round bets to pot
-            for player in self.players:
-                player.current_bet = 0
-                self.round_bets[player] = 0
+            self.seats.bets[:] = array('q', bytes(8 * num_seats))
                 
-        # Keep track of betting
-        current_pos = start_from
-        last_action_pos = None  # Track position of last action
-        betting_started = False  # Track if any bets have been made
+        # Link the seats that can act into a ring; everyone in it owes an action
+        self._next = [0] * num_seats
+        self._prev = [0] * num_seats
+        self._in_ring = [False] * num_seats
+        for i, seat in enumerate(ring):
+            self._next[seat] = ring[(i + 1) % len(ring)]
+            self._prev[seat] = ring[i - 1]
+            self._in_ring[seat] = True
+        self._ring_size = len(ring)
+        self._pending = len(ring)
+        self._live = sum(1 for flag in flags if not flag & FOLDED)
         
-        while True:
-            player = self.players[current_pos]
-            
-            # Skip players who have folded or are all-in
-            if player.folded or player.chips <= 0:
-                current_pos = (current_pos + 1) % len(self.players)
-                continue
-                
-            # Store the current bet before the player acts
-            previous_bet = self.current_bet
-            previous_player_bet = self.round_bets.get(player, 0)
+        # Action starts with the first seat in the ring at or after start_from
+        self._cursor = start_from % num_seats
+        while not self._in_ring[self._cursor]:
+            self._cursor = (self._cursor + 1) % num_seats
+        return True
+        
+    def next_to_act(self) -> Optional[Player]:
+        # Done when everyone has acted, one player is left, or nobody can bet any more
+        if self._pending <= 0 or self._live <= 1 or self._ring_size == 0:
+            self._pending = 0
+            return None
             
-            # Handle player action
-            if player.is_ai:
-                self._handle_ai_turn(player, community_cards)
-            else:
-                self._handle_player_turn(player, community_cards)
-                
-            # Update round bets
-            current_player_bet = player.current_bet - previous_player_bet
-            if current_player_bet > 0:
-                self.round_bets[player] = player.current_bet
-                
-            # If this is a raise, mark this position
-            if player.current_bet > previous_bet:
-                last_action_pos = current_pos
-                betting_started = True
+        player = self._players[self._cursor]
+        
+        # Nothing left to decide when nobody else can put in more chips
+        if self._ring_size == 1 and self.seats.bets[self._cursor] >= self.current_bet:
+            self._pending = 0
+            return None
             
-            # Move to next position
-            current_pos = (current_pos + 1) % len(self.players)
+        player.num_opponents = max(1, self._live - 1)
+        return player
+        
+    def apply_decision(self, player: Player, action: str, amount: int):
+        seat = player.seat
+        next_seat = self._next[seat]
+        
+        # Store the current bet before the player acts
+        previous_bet = self.current_bet
+        self._apply_action(player, action, amount)
+        
+        folded = self.seats.flags[seat] & FOLDED
+        if folded:
+            self._live -= 1
+        if self._in_ring[seat] and (folded or self.seats.chips[seat] <= 0):
+            self._remove_from_ring(seat)
             
-            # Check if betting round should end
-            if betting_started:
-                # If we've gone around to the last action position
-                if last_action_pos is not None and current_pos == last_action_pos:
-                    # Check if all active players have matched the bet
-                    all_matched = True
-                    for p in active_players:
-                        if not p.folded and p.chips > 0 and p.current_bet < self.current_bet:
-                            all_matched = False
-                            break
-                    if all_matched:
-                        break
-            else:
-                # If no bets have been made and we've gone around the table
-                if current_pos == start_from:
-                    # Check if everyone has checked or folded
-                    all_checked = True
-                    for p in active_players:
-                        if not p.folded and p.current_bet > 0:
-                            all_checked = False
-                            break
-                    if all_checked:
-                        break
-                    
-        # Calculate final pot for this round
-        self.pot = sum(self.round_bets.values())
-        return True
+        # A raise means everyone else still able to act has to respond
+        if self.current_bet > previous_bet:
+            self._pending = self._ring_size - (1 if self._in_ring[seat] else 0)
+        else:
+            self._pending -= 1
+        self._cursor = next_seat
+        
+    def _put_in(self, seat: int, amount: int) -> int:
+        """Move up to amount from seat's stack into its bet and the pot; returns what went in."""
+        seats = self.seats
+        chips = seats.chips[seat]
+        if amount >= chips:
+            amount = chips
+            if amount:
+                seats.flags[seat] |= ALL_IN
+        seats.chips[seat] = chips - amount
+        seats.bets[seat] += amount
+        seats.contributions[seat] += amount
+        self.pot += amount
+        return amount
+        
+    def _remove_from_ring(self, seat: int):
+        self._next[self._prev[seat]] = self._next[seat]
+        self._prev[self._next[seat]] = self._prev[seat]
+        self._in_ring[seat] = False
+        self._ring_size -= 1
         
-    def _handle_player_turn(self, player: Player, community_cards: List = None):
-        print(f"\n{Fore.GREEN}Your turn! Your hand: {' '.join(str(card) for card in player.hand)}{Style.RESET_ALL}")
-        if community_cards:
-            print(f"Your hand rank: {player.get_hand_rank_name(community_cards)}")
-        print(f"Current bet: {self.current_bet}, Your current bet: {player.current_bet}")
-        print(f"To call: {max(0, self.current_bet - player.current_bet)}, Your chips: {player.chips}")
+    def _handle_player_turn(self, player: Player, community_cards: List = None) -> Tuple[str, int]:
+        if self.events:
+            hand_name = player.get_hand_rank_name(community_cards) if community_cards else None
+            self.events.emit(DecisionRequested(player.name, tuple(str(card) for card in player.hand), hand_name,
+                                               self.current_bet, player.current_bet, player.chips))
         
         # Get decision from player (either through input or mock)
         if hasattr(player, 'make_decision'):
@@ -138,68 +297,76 @@ class BettingRound:
                     action = input(f"{Fore.YELLOW}What would you like to do? (call/raise/fold): {Style.RESET_ALL}").lower()
                 
                 if action == 'fold':
-                    return 'fold', 0
+                    amount = 0
+                    break
                 elif action in ['call', 'check']:
-                    return 'call', self.current_bet - player.current_bet
+                    action, amount = 'call', self.current_bet - player.current_bet
+                    break
                 elif action in ['raise', 'bet']:
                     min_raise = self.current_bet + self.big_blind
                     try:
                         amount = int(input(f"{Fore.YELLOW}How much would you like to raise to? (minimum {min_raise}): {Style.RESET_ALL}"))
                         if amount < min_raise:
-                            print(f"Raise amount must be at least {min_raise}!")
+                            self._reject(f"Raise amount must be at least {min_raise}!")
                             continue
                         if amount <= self.current_bet:
-                            print("Raise amount must be greater than current bet!")
+                            self._reject("Raise amount must be greater than current bet!")
                             continue
-                        return 'raise', amount
+                        action = 'raise'
+                        break
                     except ValueError:
-                        print("Please enter a valid number!")
+                        self._reject("Please enter a valid number!")
                         continue
                         
-        # Handle the decision
-        if action == 'fold':
-            player.folded = True
-            print(f"{player.name} folds!")
-        elif action in ['call', 'check']:
-            call_amount = self.current_bet - player.current_bet
-            if call_amount > 0:
-                bet = player.make_bet(call_amount)
-                print(f"{player.name} calls {bet}!")
-            else:
-                print(f"{player.name} checks!")
-        else:  # raise
-            min_raise = self.current_bet + self.big_blind
-            if amount < min_raise:
-                amount = min_raise
-            bet = player.make_bet(amount - player.current_bet)
-            self.current_bet = amount
-            print(f"{player.name} raises to {amount}!")
+        return action, amount
+            
+    def _reject(self, message: str):
+        if self.events:
+            self.events.emit(InputRejected(message))
             
-    def _handle_ai_turn(self, player: Player, community_cards: List = None):
-        print(f"\n{Fore.BLUE}{player.name}'s turn...{Style.RESET_ALL}")
-        time.sleep(1)  # Add some delay to make it feel more natural
+    def _handle_ai_turn(self, player: Player, community_cards: List = None) -> Tuple[str, int]:
+        if self.events:
+            self.events.emit(TurnStarted(player.name))
+        if self.verbose:
+            time.sleep(1)  # Add some delay to make it feel more natural
         
-        action, amount = player.make_decision(
-            self.current_bet - player.current_bet,
+        # Test doubles provide make_decision; real AI players decide through ai_make_decision
+        decide = getattr(player, 'make_decision', player.ai_make_decision)
+        return decide(
+            self.current_bet - self.seats.bets[player.seat],
             self.pot,
             community_cards
         )
         
-        # Handle the decision
+    def _apply_action(self, player: Player, action: str, amount: int):
+        # Hot path: works on the seat arrays and the packed action log directly, not through the Player view
+        seat = player.seat
+        bets = self.seats.bets
+        log = self.actions._words.append
+        street = STREET_CODES[self.street]
         if action == 'fold':
-            player.folded = True
-            print(f"{player.name} folds!")
+            self.seats.flags[seat] |= FOLDED
+            log(seat << 8 | FOLD | street)
+            if self.events:
+                self.events.emit(PlayerActed(player.name, 'fold', 0, bets[seat]))
         elif action in ['call', 'check']:
-            call_amount = self.current_bet - player.current_bet
+            call_amount = self.current_bet - bets[seat]
             if call_amount > 0:
-                bet = player.make_bet(call_amount)
-                print(f"{player.name} calls {bet}!")
+                bet = self._put_in(seat, call_amount)
+                log(bet << 16 | seat << 8 | CALL | street)
+                if self.events:
+                    self.events.emit(PlayerActed(player.name, 'call', bet, bets[seat]))
             else:
-                print(f"{player.name} checks!")
+                log(seat << 8 | CHECK | street)
+                if self.events:
+                    self.events.emit(PlayerActed(player.name, 'check', 0, bets[seat]))
         else:  # raise
             min_raise = self.current_bet + self.big_blind
             if amount < min_raise:
                 amount = min_raise
-            bet = player.make_bet(amount - player.current_bet)
-            self.current_bet = amount
-            print(f"{player.name} raises to {amount}!") 
\ No newline at end of file
+            bet = self._put_in(seat, amount - bets[seat])
+            log(bet << 16 | seat << 8 | RAISE | street)
+            # A short all-in only raises the bet to what was actually put in
+            self.current_bet = max(self.current_bet, bets[seat])
+            if self.events:
+                self.events.emit(PlayerActed(player.name, 'raise', bet, bets[seat]))
@@ -1,47 +1,110 @@
-from typing import List
+from typing import List, Optional
+from array import array
 import random
 from treys import Card as TreysCard
-from treys import Deck as TreysDeck
 
-class Card:
+class Card(int):
+    """A card encoded as an int from 0 to 51 (rank index * 4 + suit index).
+
+    All 52 cards are created once at import time; Card(suit, rank) and
+    Deck.draw() hand out those shared instances, and everything else about
+    a card is read from the lookup tables below.
+    """
+    __slots__ = ()
+
     SUITS = ['♠', '♥', '♦', '♣']
     RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-    
+
     # Mapping for treys conversion
     SUIT_MAP = {'♠': 's', '♥': 'h', '♦': 'd', '♣': 'c'}
     RANK_MAP = {
         '2': '2', '3': '3', '4': '4', '5': '5', '6': '6', '7': '7', '8': '8', '9': '9', '10': 'T',
         'J': 'J', 'Q': 'Q', 'K': 'K', 'A': 'A'
     }
-    
-    def __init__(self, suit: str, rank: str):
-        self.suit = suit
-        self.rank = rank
-        # Create treys card representation
-        self.treys_card = TreysCard.new(f"{self.RANK_MAP[rank]}{self.SUIT_MAP[suit]}")
-        
+
+    def __new__(cls, suit: str, rank: str):
+        return CARDS[cls.RANKS.index(rank) * 4 + cls.SUITS.index(suit)]
+
+    @property
+    def suit(self) -> str:
+        return CARD_SUITS[self]
+
+    @property
+    def rank(self) -> str:
+        return CARD_RANKS[self]
+
+    @property
+    def treys_card(self) -> int:
+        return TREYS_CARDS[self]
+
     def __str__(self):
-        return f"{self.rank}{self.suit}"
-    
+        return CARD_STRINGS[self]
+
+    def __repr__(self):
+        return f"Card({CARD_STRINGS[self]})"
+
+    def __reduce__(self):
+        return card_from_index, (int(self),)
+
     def get_value(self) -> int:
-        if self.rank in ['J', 'Q', 'K']:
-            return 10
-        elif self.rank == 'A':
-            return 14
-        return int(self.rank)
+        return CARD_VALUES[self]
+
+def card_from_index(index: int) -> Card:
+    return CARDS[index]
+
+# Lookup tables indexed by card int
+CARD_RANKS = [rank for rank in Card.RANKS for _ in Card.SUITS]
+CARD_SUITS = [suit for _ in Card.RANKS for suit in Card.SUITS]
+CARD_STRINGS = [f"{rank}{suit}" for rank, suit in zip(CARD_RANKS, CARD_SUITS)]
+CARD_VALUES = array('B', [10 if rank in ['J', 'Q', 'K'] else 14 if rank == 'A' else int(rank) for rank in CARD_RANKS])
+TREYS_CARDS = array('l', [TreysCard.new(f"{Card.RANK_MAP[rank]}{Card.SUIT_MAP[suit]}")
+                          for rank, suit in zip(CARD_RANKS, CARD_SUITS)])
+CARDS = tuple(int.__new__(Card, index) for index in range(52))
+
+FULL_DECK = array('B', range(52))
 
 class Deck:
-    def __init__(self):
-        self.cards: List[Card] = []
-        self.reset()
-        
+    """The cards left to deal, drawn from the end of one persistent array.
+
+    A lazy deck never shuffles up front: each draw swaps a uniformly chosen
+    remaining card to the end and takes it (one step of Fisher-Yates), so a
+    hand only pays for the cards it actually uses. An eager deck shuffles
+    all 52 cards and deals them in order, which is what lets a stacked deck
+    set through cards deal exactly those cards.
+    """
+    def __init__(self, rng: Optional[random.Random] = None, lazy: bool = False):
+        # Card ints in dealing order; cards are drawn from the end
+        self._order = array('B', range(52))
+        self._remaining = 52
+        self.rng = rng or random.Random()  # The table's stream when seeded, else a private one
+        self.lazy = lazy
+
+    @property
+    def cards(self) -> List[Card]:
+        return [CARDS[index] for index in self._order[:self._remaining]]
+
+    @cards.setter
+    def cards(self, cards: List[Card]):
+        self._order = array('B', cards)
+        self._remaining = len(cards)
+
     def reset(self):
-        self.cards = [Card(suit, rank) for suit in Card.SUITS for rank in Card.RANKS]
-        
+        # Start from the same order every hand so a seeded shuffle deals the same cards
+        self._order[:] = FULL_DECK
+        self._remaining = 52
+
     def shuffle(self):
-        random.shuffle(self.cards)
-        
+        if not self.lazy:
+            self.rng.shuffle(self._order)
+
     def draw(self) -> Card:
-        if not self.cards:
+        remaining = self._remaining
+        if not remaining:
             raise ValueError("No cards left in deck!")
-        return self.cards.pop() 
\ No newline at end of file
+        remaining -= 1
+        self._remaining = remaining
+        order = self._order
+        if self.lazy:
+            pick = int(self.rng.random() * (remaining + 1))
+            order[pick], order[remaining] = order[remaining], order[pick]
+        return CARDS[order[remaining]]
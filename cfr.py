@@ -0,0 +1,471 @@
+"""Counterfactual regret minimization for abstracted heads-up hands.
+
+The abstract game bets by the rules of BettingRound for two seats:
+- the small blind (player 0) and big blind (player 1) post;
+- the small blind acts first on every street;
+- a raise goes to at least the current bet plus the big blind;
+- a street closes once everyone still able to bet has acted since the
+  last raise.
+
+Raises are limited to a few pot fractions plus all-in, and to max_raises
+per street. Cards are reduced to one of `buckets` strength buckets per
+street: the hand's percentile among all hands on the board, evaluated
+live or, on the game's tabled_streets, read from the abstraction tables.
+The bucketing is part of the game, so a strategy table records it and
+will not load where its abstraction tables are missing.
+
+CFRSolver runs external-sampling Monte Carlo CFR. Every iteration deals
+one hand, explores all actions of one player and samples the other's.
+Regrets and strategy sums live in flat array('d') tables indexed by
+(tree node, bucket, action). solve() spreads batches of iterations over
+worker processes. Each worker starts from the same tables, and the
+changes they make are summed.
+
+The average strategy exports to a StrategyTable of uint8 probabilities,
+which loads memory-mapped. SolvedStrategy follows a heads-up hand through
+the tree from the betting round's action log and picks its action with
+one table lookup:
+
+    table = solve(AbstractGame(), iterations=200000).export()
+    table.save('headsup.cfr')
+    player.strategy = SolvedStrategy(StrategyTable.load('headsup.cfr'), holdem)
+"""
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import os
+import random
+import struct
+import numpy as np
+import abstraction
+from abstraction import AbstractionTables
+from batch_evaluator import WORST_RANK
+from card import Card
+from equity import cached_rank
+from ranges import CLASS_STRENGTHS, COMBO_MASKS, card_mask, combo_strengths
+from preflop_table import hand_class
+from rng import derive_seed, stream
+from strategy import Action, GameSnapshot, HeuristicStrategy, Strategy
+
+# Node kinds
+DECISION, FOLDED, SHOWDOWN = range(3)
+
+# Action slots: fold, check/call, one per raise size, then all-in
+FOLD, CALL = 0, 1
+
+STREET_NAMES = ['pre-flop', 'flop', 'turn', 'river']
+STREET_CARDS = [0, 3, 4, 5]
+
+@dataclass(frozen=True)
+class AbstractGame:
+    stack: int = 1000  # Each player's chips at the start of the hand
+    small_blind: int = 10
+    big_blind: int = 20
+    raise_sizes: Tuple[float, ...] = (0.5, 1.0)  # Pot fractions raised by, on top of calling
+    max_raises: int = 2  # Per street
+    buckets: int = 8
+    first_street: int = 0  # 0 plays the whole hand; later streets solve a subgame from there
+    starting_pot: int = 0  # Chips already in, split evenly, when first_street > 0
+    tabled_streets: Tuple[int, ...] = ()  # Post-flop streets bucketed from the abstraction tables, not live
+
+    @property
+    def num_actions(self) -> int:
+        return len(self.raise_sizes) + 3
+
+class GameTree:
+    """Every betting sequence of an AbstractGame, flattened into arrays indexed by node."""
+    def __init__(self, game: AbstractGame):
+        self.game = game
+        self.kind: List[int] = []
+        self.player: List[int] = []  # Player to act, or the one who folded
+        self.street: List[int] = []
+        self.bets: List[Tuple[int, int]] = []  # Chips each player has put in this hand
+        self.street_bets: List[Tuple[int, int]] = []
+        self.children: List[List[int]] = []  # Child node per action slot, -1 when illegal
+        self.raise_to: List[List[int]] = []  # Street bet each raise slot raises to
+        self.legal: List[Tuple[int, ...]] = []
+
+        if game.first_street == 0:
+            self._street(0, (game.small_blind, game.big_blind), (game.small_blind, game.big_blind))
+        else:
+            half = game.starting_pot // 2
+            self._street(game.first_street, (half, half), (0, 0))
+        self.num_nodes = len(self.kind)
+
+    def _node(self, kind: int, player: int, street: int, bets, street_bets) -> int:
+        self.kind.append(kind)
+        self.player.append(player)
+        self.street.append(street)
+        self.bets.append(tuple(bets))
+        self.street_bets.append(tuple(street_bets))
+        self.children.append([-1] * self.game.num_actions)
+        self.raise_to.append([0] * self.game.num_actions)
+        self.legal.append(())
+        return len(self.kind) - 1
+
+    def _street(self, street: int, bets, street_bets) -> int:
+        # Opens a street the way start_round does: fewer than two players able to bet skips to the showdown
+        ring = tuple(p for p in (0, 1) if bets[p] < self.game.stack)
+        if len(ring) <= 1:
+            return self._node(SHOWDOWN, 0, street, bets, street_bets)
+        return self._decision(street, bets, street_bets, ring, 0, len(ring), 0)
+
+    def _decision(self, street: int, bets, street_bets, ring, actor: int, pending: int, raises: int) -> int:
+        game = self.game
+        node = self._node(DECISION, actor, street, bets, street_bets)
+        current_bet = max(street_bets)
+        to_call = current_bet - street_bets[actor]
+        behind = game.stack - bets[actor]
+        pot = bets[0] + bets[1]
+        next_actor = 1 - actor if 1 - actor in ring else actor
+
+        def after(slot: int, paid: int):
+            new_bets, new_street_bets = list(bets), list(street_bets)
+            new_bets[actor] += paid
+            new_street_bets[actor] += paid
+            new_ring = tuple(p for p in ring if not (p == actor and new_bets[p] >= game.stack))
+            if max(new_street_bets) > current_bet:  # A raise reopens the betting
+                new_pending = len(new_ring) - (1 if actor in new_ring else 0)
+            else:
+                new_pending = pending - 1
+            self.children[node][slot] = self._continue(street, new_bets, new_street_bets, new_ring, next_actor,
+                                                       new_pending, raises + (slot > CALL))
+
+        legal = []
+        if to_call > 0:
+            self.children[node][FOLD] = self._node(FOLDED, actor, street, bets, street_bets)
+            legal.append(FOLD)
+        after(CALL, min(to_call, behind))
+        legal.append(CALL)
+        if raises < game.max_raises and behind > to_call:
+            seen = set()
+            for slot, fraction in enumerate(game.raise_sizes, CALL + 1):
+                target = current_bet + max(game.big_blind, round(fraction * (pot + to_call)))
+                if target - street_bets[actor] >= behind or target in seen:
+                    continue  # All-in has its own slot
+                seen.add(target)
+                self.raise_to[node][slot] = target
+                after(slot, target - street_bets[actor])
+                legal.append(slot)
+            all_in = game.num_actions - 1
+            self.raise_to[node][all_in] = street_bets[actor] + behind
+            after(all_in, behind)
+            legal.append(all_in)
+        self.legal[node] = tuple(legal)
+        return node
+
+    def _continue(self, street: int, bets, street_bets, ring, cursor: int, pending: int, raises: int) -> int:
+        # Next decision of the street, or what follows its end (next_to_act's checks)
+        over = pending <= 0 or not ring or (len(ring) == 1 and street_bets[cursor] >= max(street_bets))
+        if not over:
+            return self._decision(street, bets, street_bets, ring, cursor, pending, raises)
+        if street == len(STREET_NAMES) - 1:
+            return self._node(SHOWDOWN, 0, street, bets, street_bets)
+        return self._street(street + 1, bets, (0, 0))
+
+_PREFLOP_PERCENTILES = None
+
+def hand_bucket(hole_cards: Sequence[Card], board: Sequence[Card], buckets: int,
+                strengths: Optional[np.ndarray] = None, tables: Optional[AbstractionTables] = None) -> int:
+    """Bucket of a hand's strength percentile among all hands on the board (pre-flop: among starting hands).
+
+    Post-flop the percentile is evaluated live, or read from tables when given.
+    """
+    global _PREFLOP_PERCENTILES
+    if not board:
+        if _PREFLOP_PERCENTILES is None:
+            _PREFLOP_PERCENTILES = _percentiles(combo_strengths([]))
+        percentile = _PREFLOP_PERCENTILES[hand_class(hole_cards)]
+    elif tables is not None:
+        percentile = tables.lookup(hole_cards, board).strength
+    else:
+        if strengths is None:
+            strengths = combo_strengths(board)
+        live = strengths[(COMBO_MASKS & card_mask(board)) == 0]
+        mine = (WORST_RANK - cached_rank((*hole_cards, *board))) / WORST_RANK
+        percentile = ((live < mine).sum() + 0.5 * (live == mine).sum()) / len(live)
+    return min(buckets - 1, int(percentile * buckets))
+
+def street_tables(game: AbstractGame) -> List[Optional[AbstractionTables]]:
+    """The abstraction tables each street is bucketed with, None where it is evaluated live.
+
+    Raises ValueError when the default tables lack rows for one of the game's tabled streets.
+    """
+    tables = abstraction.TABLES
+    missing = [STREET_NAMES[street] for street in game.tabled_streets
+               if street == 0 or tables is None or tables.streets.get(STREET_CARDS[street]) is None
+               or tables.streets[STREET_CARDS[street]].strength is None]
+    if missing:
+        raise ValueError(f"The game buckets the {', '.join(missing)} from abstraction tables that have no rows "
+                         f"for it; generate them with abstraction.py!")
+    return [tables if street in game.tabled_streets else None for street in range(len(STREET_NAMES))]
+
+def _percentiles(strengths: np.ndarray) -> List[float]:
+    # Pre-flop percentile of each starting hand class among all 1326 combos
+    return [((strengths < strength).sum() + 0.5 * (strengths == strength).sum()) / len(strengths)
+            for strength in CLASS_STRENGTHS.tolist()]
+
+class CFRSolver:
+    def __init__(self, game: AbstractGame):
+        self.game = game
+        self.tree = _tree(game)
+        self.tables = street_tables(game)
+        size = self.tree.num_nodes * game.buckets * game.num_actions
+        self.regrets = array('d', bytes(8 * size))
+        self.strategy_sum = array('d', bytes(8 * size))
+        self.iterations = 0
+
+    def run(self, iterations: int, seed: int = 0):
+        rng = random.Random(seed)
+        for _ in range(iterations):
+            buckets, showdown = self._deal(rng)
+            self._traverse(0, self.iterations % 2, buckets, showdown, rng)
+            self.iterations += 1
+
+    def _deal(self, rng: random.Random) -> Tuple[List[List[int]], int]:
+        # Buckets per (player, street) of one random deal, and the showdown result for player 0
+        cards = rng.sample(range(52), 9)
+        holes, board = (cards[0:2], cards[2:4]), cards[4:]
+        buckets = [[0] * len(STREET_NAMES), [0] * len(STREET_NAMES)]
+        for street in range(self.game.first_street, len(STREET_NAMES)):
+            shown, tables = board[:STREET_CARDS[street]], self.tables[street]
+            strengths = combo_strengths(shown) if shown and tables is None else None
+            for player in (0, 1):
+                buckets[player][street] = hand_bucket(holes[player], shown, self.game.buckets, strengths, tables)
+        ranks = [cached_rank((*hole, *board)) for hole in holes]
+        showdown = (ranks[1] > ranks[0]) - (ranks[0] > ranks[1])  # Lower ranks are better in treys
+        return buckets, showdown
+
+    def _traverse(self, node: int, traverser: int, buckets, showdown: int, rng: random.Random) -> float:
+        # Chips won by the traverser from here, for this deal
+        tree = self.tree
+        kind = tree.kind[node]
+        if kind != DECISION:
+            bets = tree.bets[node]
+            if kind == FOLDED:
+                winner = 1 - tree.player[node]
+            elif showdown:
+                winner = 0 if showdown > 0 else 1
+            else:
+                return 0.0
+            return bets[1 - traverser] if winner == traverser else -bets[traverser]
+
+        player = tree.player[node]
+        legal = tree.legal[node]
+        base = (node * self.game.buckets + buckets[player][tree.street[node]]) * self.game.num_actions
+        regrets = self.regrets
+        positive = [max(regrets[base + slot], 0.0) for slot in legal]
+        total = sum(positive)
+        strategy = [p / total for p in positive] if total > 0 else [1.0 / len(legal)] * len(legal)
+
+        children = tree.children[node]
+        if player == traverser:
+            values = [self._traverse(children[slot], traverser, buckets, showdown, rng) for slot in legal]
+            value = sum(p * v for p, v in zip(strategy, values))
+            for slot, slot_value in zip(legal, values):
+                regrets[base + slot] += slot_value - value
+            return value
+
+        # The opponent's current strategy goes into the average, and one of its actions is followed
+        strategy_sum = self.strategy_sum
+        for slot, p in zip(legal, strategy):
+            strategy_sum[base + slot] += p
+        choice = rng.random()
+        for slot, p in zip(legal, strategy):
+            choice -= p
+            if choice <= 0:
+                break
+        return self._traverse(children[slot], traverser, buckets, showdown, rng)
+
+    def average_strategy(self) -> np.ndarray:
+        """Probabilities per (node, bucket, action slot); uniform over legal slots where never reached."""
+        sums = np.frombuffer(self.strategy_sum, dtype=np.float64).reshape(
+            self.tree.num_nodes, self.game.buckets, self.game.num_actions).copy()
+        legal = np.zeros((self.tree.num_nodes, self.game.num_actions), dtype=bool)
+        for node, slots in enumerate(self.tree.legal):
+            legal[node, list(slots)] = True
+        totals = sums.sum(axis=2, keepdims=True)
+        uniform = legal[:, None, :] / np.maximum(legal.sum(axis=1), 1)[:, None, None]
+        return np.where(totals > 0, sums / np.where(totals > 0, totals, 1), uniform)
+
+    def export(self) -> 'StrategyTable':
+        probabilities = np.round(self.average_strategy() * 255).astype(np.uint8)
+        return StrategyTable(self.game, probabilities)
+
+_trees: Dict[AbstractGame, GameTree] = {}
+
+def _tree(game: AbstractGame) -> GameTree:
+    # Built once per process and game
+    tree = _trees.get(game)
+    if tree is None:
+        tree = _trees[game] = GameTree(game)
+    return tree
+
+def _run_batch(game: AbstractGame, regrets: bytes, strategy_sum: bytes, iterations: int, first: int,
+               seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Runs iterations from the given tables; returns how much they changed
+    solver = CFRSolver(game)
+    solver.regrets = array('d', regrets)
+    solver.strategy_sum = array('d', strategy_sum)
+    solver.iterations = first
+    solver.run(iterations, seed)
+    return (np.frombuffer(solver.regrets, dtype=np.float64) - np.frombuffer(regrets, dtype=np.float64),
+            np.frombuffer(solver.strategy_sum, dtype=np.float64) - np.frombuffer(strategy_sum, dtype=np.float64))
+
+def solve(game: AbstractGame = AbstractGame(), iterations: int = 10000, workers: Optional[int] = None,
+          batch: int = 1000, seed: int = 0) -> CFRSolver:
+    """Run iterations of CFR, in rounds of one batch per worker process."""
+    solver = CFRSolver(game)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        solver.run(iterations, derive_seed(seed, 0))
+        return solver
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        done = 0
+        while done < iterations:
+            sizes = [min(batch, iterations - done - batch * i) for i in range(workers)]
+            sizes = [size for size in sizes if size > 0]
+            regrets, strategy_sum = solver.regrets.tobytes(), solver.strategy_sum.tobytes()
+            futures = [pool.submit(_run_batch, game, regrets, strategy_sum, size, done + sum(sizes[:i]),
+                                   derive_seed(seed, done, i))
+                       for i, size in enumerate(sizes)]
+            regret_total = np.frombuffer(solver.regrets, dtype=np.float64).copy()
+            strategy_total = np.frombuffer(solver.strategy_sum, dtype=np.float64).copy()
+            for future in futures:
+                regret_delta, strategy_delta = future.result()
+                regret_total += regret_delta
+                strategy_total += strategy_delta
+            solver.regrets = array('d', regret_total.tobytes())
+            solver.strategy_sum = array('d', strategy_total.tobytes())
+            done += sum(sizes)
+            solver.iterations = done
+    return solver
+
+# File layout: header, the raise sizes as float32, then one uint8 per (node, bucket, action slot)
+MAGIC = b'CFRS'
+HEADER = struct.Struct('<4sHIIIHHHIHIH')  # magic, version, stack, blinds, max raises, buckets, first street,
+VERSION = 2                              # starting pot, raise sizes, nodes, tabled streets bitmask
+
+class StrategyTable:
+    """A solved average strategy: action probabilities (out of 255) per node, bucket and action slot."""
+    def __init__(self, game: AbstractGame, probabilities: np.ndarray):
+        self.game = game
+        self.tree = _tree(game)
+        self.tables = street_tables(game)
+        self.probabilities = probabilities
+
+    def save(self, path: str):
+        game = self.game
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, game.stack, game.small_blind, game.big_blind, game.max_raises,
+                                game.buckets, game.first_street, game.starting_pot, len(game.raise_sizes),
+                                self.tree.num_nodes, sum(1 << street for street in game.tabled_streets)))
+            f.write(np.array(game.raise_sizes, dtype=np.float32).tobytes())
+            f.write(np.ascontiguousarray(self.probabilities, dtype=np.uint8).tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'StrategyTable':
+        with open(path, 'rb') as f:
+            header = HEADER.unpack(f.read(HEADER.size))
+            magic, version, stack, small_blind, big_blind, max_raises, buckets, first_street, starting_pot, \
+                num_sizes, num_nodes, tabled = header
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a CFR strategy table!")
+            sizes = np.frombuffer(f.read(4 * num_sizes), dtype=np.float32)
+        game = AbstractGame(stack, small_blind, big_blind, tuple(round(float(size), 6) for size in sizes),
+                            max_raises, buckets, first_street, starting_pot,
+                            tuple(street for street in range(len(STREET_NAMES)) if tabled >> street & 1))
+        offset = HEADER.size + 4 * num_sizes
+        probabilities = np.memmap(path, dtype=np.uint8, mode='r', offset=offset,
+                                  shape=(num_nodes, buckets, game.num_actions))
+        try:
+            table = cls(game, probabilities)
+        except ValueError as error:
+            raise ValueError(f"{path} cannot be played here: {error}") from None
+        if table.tree.num_nodes != num_nodes:
+            raise ValueError(f"{path} was solved for a different game tree!")
+        return table
+
+class SolvedStrategy(HeuristicStrategy):
+    """Plays a StrategyTable at a heads-up table, and the heuristic AI anywhere the table does not apply.
+
+    The hand is followed through the abstract tree by mapping every action
+    in the betting round's log to its slot, raises to the slot with the
+    nearest raise size. A hand that leaves the tree (a third seat, or an
+    action the abstraction has no room for) is played by the heuristic.
+    """
+    def __init__(self, table: StrategyTable, game):
+        super().__init__()
+        self.table = table
+        self.game = game
+        self._hand_number = None
+        self._seen = 0
+        self._node: Optional[int] = 0
+        self._players: Dict[int, int] = {}  # Seat -> abstract player (0 small blind, 1 big blind)
+        # For decisions made without the table's stream, e.g. straight from a snapshot
+        self._rng = stream(game.seed if game.seed is not None else 0, game.table_id)
+
+    def _sync(self) -> Optional[int]:
+        # Current node of this hand, or None once it left the tree
+        game, tree = self.game, self.table.tree
+        actions = game.betting_round.actions
+        if self._hand_number != game.hand_number or self._seen > len(actions):
+            self._hand_number, self._seen, self._node, self._players = game.hand_number, 0, 0, {}
+            if len(game.players) != 2:
+                self._node = None
+
+        for street, player, action, amount in actions[self._seen:]:
+            self._seen += 1
+            if self._node is None:
+                break
+            if action in ('small_blind', 'big_blind'):
+                self._players[player.seat] = 0 if action == 'small_blind' else 1
+                continue
+            if STREET_NAMES.index(street) < self.table.game.first_street:
+                continue  # Before the solved subgame
+            node = self._node
+            if tree.kind[node] != DECISION or tree.player[node] != self._players.get(player.seat) \
+                    or STREET_NAMES[tree.street[node]] != street:
+                self._node = None
+                break
+            if action == 'fold':
+                slot = FOLD
+            elif action in ('call', 'check'):
+                slot = CALL
+            else:
+                raised_to = tree.street_bets[node][tree.player[node]] + amount
+                raises = [slot for slot in tree.legal[node] if slot > CALL]
+                slot = min(raises, key=lambda s: abs(tree.raise_to[node][s] - raised_to), default=None)
+            self._node = tree.children[node][slot] if slot is not None else -1
+            if self._node < 0:
+                self._node = None
+        self._seen = len(actions)
+        return self._node
+
+    decide_batch = Strategy.decide_batch  # Decides on this table's hand, one snapshot at a time
+
+    def decide(self, snapshot: GameSnapshot, rng: Optional[random.Random] = None) -> Action:
+        rng = rng or self._rng
+        node = self._sync()
+        tree = self.table.tree
+        if node is None or tree.kind[node] != DECISION or STREET_NAMES[tree.street[node]] != snapshot.street \
+                or tree.player[node] != self._players.get(snapshot.seat) or len(snapshot.hand) != 2:
+            return super().decide(snapshot, rng)  # Before the solved subgame, or off the tree
+        bucket = hand_bucket(snapshot.hand, snapshot.board, self.table.game.buckets,
+                             tables=self.table.tables[tree.street[node]])
+        row = self.table.probabilities[node, bucket]
+        total = int(row.sum())
+        if not total:
+            return super().decide(snapshot, rng)
+        choice = rng.random() * total
+        for slot, weight in enumerate(row.tolist()):
+            choice -= weight
+            if choice < 0:
+                break
+        if slot == FOLD:
+            return 'fold', 0
+        if slot == CALL:
+            return 'call', snapshot.to_call
+        return 'raise', tree.raise_to[node][slot]
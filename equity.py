@@ -0,0 +1,232 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+import math
+import random
+import time
+import numpy as np
+from batch_evaluator import evaluate_batch
+from card import Card, TREYS_CARDS
+from evaluator import EVALUATOR
+
+@dataclass
+class EquityResult:
+    win: float
+    tie: float
+    lose: float
+    samples: int
+
+    @property
+    def equity(self) -> float:
+        # Ties are counted as half a win
+        return self.win + self.tie / 2
+
+    @property
+    def std_error(self) -> float:
+        if not self.samples:
+            return 1.0
+        p = self.equity
+        return math.sqrt(max(p * (1 - p), 0.0) / self.samples)
+
+_pool = None
+_pool_workers = 0
+
+# Memoized 5-7 card ranks keyed by the bitmask of card ints
+_rank_cache: Dict[int, int] = {}
+MAX_CACHED_RANKS = 1_000_000
+
+# Ranks and cards of every possible hand on a complete board, keyed by the board bitmask
+_river_cache: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+MAX_CACHED_RIVERS = 10_000
+_HAND_PAIRS = np.array(list(combinations(range(52), 2)), dtype=np.intp)  # Every two-card hand
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    # Reuse one pool across queries so workers are only started once
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        shutdown_pool()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
+
+def shutdown_pool():
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+        _pool_workers = 0
+
+def _sample_runouts(hole_cards: Tuple[int, ...], board: Tuple[int, ...], num_opponents: int,
+                    samples: int, seed: Optional[int]) -> Tuple[int, int, int]:
+    """Deal random run-outs and opponent hands; returns (wins, ties, losses)."""
+    rng = np.random.default_rng(seed)
+    dead = set(hole_cards) | set(board)
+    remaining = np.array([card for card in range(52) if card not in dead], dtype=np.intp)
+    board_needed = 5 - len(board)
+    draw_count = board_needed + 2 * num_opponents
+
+    # The first draw_count positions of a random ordering of the remaining cards, per sample
+    drawn = remaining[rng.random((samples, len(remaining))).argpartition(draw_count, axis=1)[:, :draw_count]]
+    full_boards = np.hstack([np.broadcast_to(np.array(board, dtype=np.intp), (samples, len(board))),
+                             drawn[:, :board_needed]])
+
+    # Hero first, then each opponent, all ranked in one batch
+    holes = [np.broadcast_to(np.array(hole_cards, dtype=np.intp), (samples, 2))]
+    holes += [drawn[:, i:i + 2] for i in range(board_needed, draw_count, 2)]
+    hands = np.concatenate([np.hstack([hole, full_boards]) for hole in holes])
+    ranks = evaluate_batch(hands).reshape(num_opponents + 1, samples)
+
+    # Lower ranks are better in treys
+    hero_rank = ranks[0]
+    best_opponent = ranks[1:].min(axis=0)
+    wins = int((hero_rank < best_opponent).sum())
+    ties = int((hero_rank == best_opponent).sum())
+    return wins, ties, samples - wins - ties
+
+def estimate_equity(hole_cards: List[Card], board: List[Card], num_opponents: int = 1,
+                    samples: int = 10000, max_error: Optional[float] = None,
+                    time_budget: Optional[float] = None, workers: int = 1,
+                    batch_size: int = 1000, seed: Optional[int] = None) -> EquityResult:
+    """Monte Carlo estimate of win/tie/lose probabilities against random opponent hands.
+
+    Sampling runs in batches of batch_size and stops at the first of: samples
+    run-outs dealt, the standard error of the equity falling below max_error,
+    or time_budget seconds elapsed; the budget is checked before each batch
+    is dispatched. By default batches are sampled in this process; with
+    workers > 1 they are spread over a shared process pool.
+    """
+    if len(hole_cards) != 2:
+        raise ValueError("Equity needs exactly two hole cards!")
+    if len(board) > 5:
+        raise ValueError("A board has at most five cards!")
+    if not 1 <= num_opponents <= 9:
+        raise ValueError("Equity supports 1 to 9 opponents!")
+
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    rng = random.Random(seed)
+    hole = tuple(int(card) for card in hole_cards)
+    known = tuple(int(card) for card in board)
+    pool = _get_pool(workers) if workers > 1 else None
+
+    wins = ties = losses = done = 0
+    while done < samples:
+        if done and deadline is not None and time.perf_counter() >= deadline:
+            break
+            
+        # One batch per worker in flight at a time
+        batches = []
+        for _ in range(workers):
+            size = min(batch_size, samples - done - sum(batches))
+            if size <= 0:
+                break
+            batches.append(size)
+        seeds = [rng.getrandbits(64) for _ in batches]
+
+        if pool is None:
+            counts = [_sample_runouts(hole, known, num_opponents, size, batch_seed)
+                      for size, batch_seed in zip(batches, seeds)]
+        else:
+            futures = [pool.submit(_sample_runouts, hole, known, num_opponents, size, batch_seed)
+                       for size, batch_seed in zip(batches, seeds)]
+            counts = [future.result() for future in futures]
+
+        for batch_wins, batch_ties, batch_losses in counts:
+            wins += batch_wins
+            ties += batch_ties
+            losses += batch_losses
+        done += sum(batches)
+
+        if max_error is not None and EquityResult(wins / done, ties / done, losses / done, done).std_error <= max_error:
+            break
+
+    return EquityResult(wins / done, ties / done, losses / done, done)
+
+def cached_rank(cards: Tuple[int, ...]) -> int:
+    """treys rank of 5 to 7 card ints, memoized on the set of cards."""
+    mask = 0
+    for card in cards:
+        mask |= 1 << card
+    rank = _rank_cache.get(mask)
+    if rank is None:
+        if len(_rank_cache) >= MAX_CACHED_RANKS:
+            _rank_cache.clear()
+        treys_cards = [TREYS_CARDS[card] for card in cards]
+        rank = EVALUATOR.evaluate(treys_cards[:2], treys_cards[2:])
+        _rank_cache[mask] = rank
+    return rank
+
+def exact_equities(holes: List[List[Card]], board: List[Card]) -> List[EquityResult]:
+    """Exact equity of every hand in holes by enumerating all remaining run-outs.
+
+    Meant for boards with at most two cards to come (flop, turn or river),
+    where the enumeration is at most C(45, 2) = 990 run-outs, all ranked in
+    one batch.
+    """
+    if len(board) < 3:
+        raise ValueError("Exact equity needs at least the flop!")
+    hands = [tuple(int(card) for card in hole) for hole in holes]
+    known = tuple(int(card) for card in board)
+    dead = set(known)
+    for hand in hands:
+        dead.update(hand)
+    remaining = [card for card in range(52) if card not in dead]
+
+    runout_list = list(combinations(remaining, 5 - len(known)))
+    runouts = np.array(runout_list, dtype=np.intp).reshape(len(runout_list), 5 - len(known))
+    full_boards = np.hstack([np.broadcast_to(np.array(known, dtype=np.intp), (len(runouts), len(known))), runouts])
+    hands_by_runout = np.concatenate([
+        np.hstack([np.broadcast_to(np.array(hand, dtype=np.intp), (len(runouts), 2)), full_boards])
+        for hand in hands
+    ])
+    ranks = evaluate_batch(hands_by_runout).reshape(len(hands), len(runouts))
+
+    # Lower ranks are better in treys; a shared best rank is a tie
+    is_best = ranks == ranks.min(axis=0)
+    sole_winner = is_best.sum(axis=0) == 1
+    total = len(runouts)
+    results = []
+    for i in range(len(hands)):
+        wins = int((is_best[i] & sole_winner).sum())
+        ties = int((is_best[i] & ~sole_winner).sum())
+        results.append(EquityResult(wins / total, ties / total, (total - wins - ties) / total, total))
+    return results
+
+def _river_ranks(board: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Rank, first card and second card of every two-card hand on this board
+    mask = 0
+    for card in board:
+        mask |= 1 << card
+    ranks = _river_cache.get(mask)
+    if ranks is None:
+        if len(_river_cache) >= MAX_CACHED_RIVERS:
+            _river_cache.clear()
+        on_board = np.zeros(52, dtype=bool)
+        on_board[list(board)] = True
+        hands = _HAND_PAIRS[~(on_board[_HAND_PAIRS[:, 0]] | on_board[_HAND_PAIRS[:, 1]])]
+        full = np.hstack([hands, np.broadcast_to(np.array(board, dtype=np.intp), (len(hands), 5))])
+        ranks = (evaluate_batch(full), hands[:, 0], hands[:, 1])
+        _river_cache[mask] = ranks
+    return ranks
+
+def exact_river_equity(hole_cards: List[Card], board: List[Card]) -> EquityResult:
+    """Exact heads-up equity on a complete board against every possible opponent hand.
+
+    All hands on a board are ranked once and cached, so later queries on
+    the same board are a few vectorized comparisons.
+    """
+    if len(board) != 5:
+        raise ValueError("Exact river equity needs a complete board!")
+    known = tuple(int(card) for card in board)
+    first, second = (int(card) for card in hole_cards)
+    ranks, firsts, seconds = _river_ranks(known)
+    hero_rank = cached_rank((first, second) + known)
+
+    # Opponent hands that share a card with ours are impossible
+    live = (firsts != first) & (firsts != second) & (seconds != first) & (seconds != second)
+    live_ranks = ranks[live]
+    losses = int(np.count_nonzero(live_ranks < hero_rank))  # Lower ranks are better in treys
+    ties = int(np.count_nonzero(live_ranks == hero_rank))
+    wins = len(live_ranks) - losses - ties
+    total = wins + ties + losses
+    return EquityResult(wins / total, ties / total, losses / total, total)
@@ -0,0 +1,187 @@
+"""Equities of (hole cards, board) situations, cached up to suit isomorphism.
+
+Equity against random opponents does not change when the suits are
+relabeled, nor with the order of the hole cards or of the board cards,
+so every situation is reduced to a canonical key: one 26-bit signature
+per suit (the ranks held in that suit, then the ranks on the board in
+it), sorted, plus the number of opponents. A K♠Q♠ on J♠T♠2♥ and a
+K♦Q♦ on 2♣T♦J♦ share one key.
+
+Results sit in two tiers. The first is an LRU dict in this process. The
+second is an optional open-addressing hash table in a memory-mapped file,
+which every process that opens the same path shares through the page
+cache, and which outlives the run:
+
+    cache = EquityCache('equity.cache')
+    strategy = HeuristicStrategy(equity_time_budget=0.005, equity_cache=cache)
+
+Writers take an exclusive flock on the file where fcntl exists. Readers
+never lock: they read a slot's key before and after its payload, and use
+the payload only when both reads match the key they want.
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Optional, Sequence
+import mmap
+import os
+import struct
+from card import Card
+from equity import EquityResult
+from rng import MASK64, splitmix64
+
+try:
+    import fcntl
+except ImportError:  # No flock on Windows; writers there are not serialized
+    fcntl = None
+
+MAGIC = b'EQCH'
+HEADER = struct.Struct('<4sHxxQ')  # magic, version, number of slots
+VERSION = 1
+SLOT = struct.Struct('<QQHHI')  # key low bits, key high bits | OCCUPIED, win, tie, samples
+KEY_HALF = struct.Struct('<Q')
+OCCUPIED = 1 << 63
+SCALE = 65535
+MAX_PROBES = 8
+DEFAULT_SLOTS = 1 << 20  # 24 MB of slots
+
+def canonical_key(hole_cards: Sequence[Card], board: Sequence[Card], num_opponents: int = 1) -> int:
+    """Key shared by every situation equal to this one up to suit permutation and card order."""
+    hole_ranks = [0, 0, 0, 0]
+    board_ranks = [0, 0, 0, 0]
+    for card in hole_cards:
+        hole_ranks[card & 3] |= 1 << (card >> 2)
+    for card in board:
+        board_ranks[card & 3] |= 1 << (card >> 2)
+    key = 0
+    for signature in sorted((hole_ranks[suit] << 13 | board_ranks[suit] for suit in range(4)), reverse=True):
+        key = key << 26 | signature
+    return key << 4 | num_opponents  # 108 bits
+
+class DiskEquityStore:
+    """Fixed-size hash table of equities in a memory-mapped file.
+
+    Slots are probed linearly from the key's hash for MAX_PROBES slots; a
+    full neighborhood gives up its first slot, so the file never grows and
+    old entries are overwritten once it fills up.
+    """
+    def __init__(self, path: str, num_slots: int = DEFAULT_SLOTS):
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        with self._locked():  # The first process to open the file lays it out
+            if os.fstat(self._fd).st_size < HEADER.size:
+                os.ftruncate(self._fd, HEADER.size + num_slots * SLOT.size)
+                os.pwrite(self._fd, HEADER.pack(MAGIC, VERSION, num_slots), 0)
+            magic, version, num_slots = HEADER.unpack(os.pread(self._fd, HEADER.size, 0))
+        if magic != MAGIC or version != VERSION:
+            os.close(self._fd)
+            raise ValueError(f"{path} is not an equity cache!")
+        self.num_slots = num_slots
+        self._map = mmap.mmap(self._fd, HEADER.size + num_slots * SLOT.size)
+
+    @contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _offsets(self, low: int, high: int):
+        home = splitmix64(low ^ splitmix64(high)) % self.num_slots
+        for probe in range(MAX_PROBES):
+            yield HEADER.size + (home + probe) % self.num_slots * SLOT.size
+
+    def get(self, key: int) -> Optional[EquityResult]:
+        low, high = key & MASK64, key >> 64 | OCCUPIED
+        for offset in self._offsets(low, high):
+            slot_low, slot_high, win, tie, samples = SLOT.unpack_from(self._map, offset)
+            if not slot_high:
+                return None  # An empty slot ends the probe sequence
+            if slot_low == low and slot_high == high and KEY_HALF.unpack_from(self._map, offset)[0] == low:
+                win, tie = win / SCALE, tie / SCALE
+                return EquityResult(win, tie, max(0.0, 1.0 - win - tie), samples)
+        return None
+
+    def put(self, key: int, result: EquityResult):
+        low, high = key & MASK64, key >> 64 | OCCUPIED
+        with self._locked():
+            target = None
+            for offset in self._offsets(low, high):
+                slot_low, slot_high = struct.unpack_from('<QQ', self._map, offset)
+                if not slot_high or (slot_low == low and slot_high == high):
+                    target = offset
+                    break
+            if target is None:
+                target = next(self._offsets(low, high))
+            # Clear the key, write the payload, then the key, so readers never match a half-written slot
+            KEY_HALF.pack_into(self._map, target, 0)
+            SLOT.pack_into(self._map, target, 0, high, round(result.win * SCALE), round(result.tie * SCALE),
+                           min(result.samples, 0xFFFFFFFF))
+            KEY_HALF.pack_into(self._map, target, low)
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+class EquityCache:
+    """Equities against random opponents, looked up in memory, then on disk, then computed."""
+    def __init__(self, path: Optional[str] = None, max_entries: int = 100_000, num_slots: int = DEFAULT_SLOTS):
+        self.path = path
+        self.max_entries = max_entries
+        self.num_slots = num_slots
+        self.disk = DiskEquityStore(path, num_slots) if path else None
+        self._memory: 'OrderedDict[int, EquityResult]' = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, hole_cards: Sequence[Card], board: Sequence[Card], num_opponents: int = 1) -> Optional[EquityResult]:
+        key = canonical_key(hole_cards, board, num_opponents)
+        result = self._memory.get(key)
+        if result is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return result
+        if self.disk is not None:
+            result = self.disk.get(key)
+            if result is not None:
+                self.disk_hits += 1
+                self._remember(key, result)
+                return result
+        self.misses += 1
+        return None
+
+    def put(self, hole_cards: Sequence[Card], board: Sequence[Card], num_opponents: int, result: EquityResult):
+        key = canonical_key(hole_cards, board, num_opponents)
+        self._remember(key, result)
+        if self.disk is not None:
+            self.disk.put(key, result)
+
+    def equity(self, hole_cards: Sequence[Card], board: Sequence[Card], num_opponents: int,
+               compute: Callable[[], EquityResult]) -> EquityResult:
+        """The cached equity of the situation, or compute()'s, which is then cached."""
+        result = self.get(hole_cards, board, num_opponents)
+        if result is None:
+            result = compute()
+            self.put(hole_cards, board, num_opponents, result)
+        return result
+
+    def _remember(self, key: int, result: EquityResult):
+        self._memory[key] = result
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
+            self.disk = None
+
+    def __getstate__(self):
+        # Worker processes reopen the file and start with an empty memory tier
+        return self.path, self.max_entries, self.num_slots
+
+    def __setstate__(self, state):
+        self.__init__(*state)
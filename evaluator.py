@@ -0,0 +1,17 @@
+from typing import List
+from treys import Evaluator
+from card import Card, TREYS_CARDS
+
+# One evaluator per process, built at import. Players, game states and the
+# equity code all hold this same instance, and worker processes started with
+# fork inherit its lookup tables copy-on-write instead of rebuilding them.
+EVALUATOR = Evaluator()
+
+def evaluate(hole_cards: List[Card], board: List[Card]) -> int:
+    # Hand rank from 1 (royal flush) to 7462 (seven high); lower is better
+    return EVALUATOR.evaluate([TREYS_CARDS[card] for card in board],
+                              [TREYS_CARDS[card] for card in hole_cards])
+
+def rank_class_name(rank: int) -> str:
+    # Name of the hand class of an already evaluated rank, e.g. "Two Pair"
+    return EVALUATOR.class_to_string(EVALUATOR.get_rank_class(rank))
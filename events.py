@@ -0,0 +1,186 @@
+"""Structured events emitted by the engine, and the renderers that show them.
+
+The betting round, game state and table emit events into an EventBus
+instead of printing; only the human seat's input() prompts go to the
+console directly. The bus is false while nobody subscribes, and the
+engine checks it before building an event, so headless runs neither
+create events nor format any text. The console renderer gives the
+original colored view; BufferedEventWriter appends plain text to a file
+in batches.
+"""
+from typing import Callable, List, NamedTuple, Optional, TextIO, Tuple
+from colorama import Fore, Style
+
+class HandStarted(NamedTuple):
+    dealer: str
+
+class BlindPosted(NamedTuple):
+    player: str
+    blind: str  # 'small' or 'big'
+    amount: int
+
+class StreetStarted(NamedTuple):
+    street: str
+
+class TurnStarted(NamedTuple):
+    player: str
+
+class PlayerActed(NamedTuple):
+    player: str
+    action: str  # 'fold', 'check', 'call' or 'raise'
+    amount: int  # Chips put in by this action
+    total_bet: int  # Player's bet this street after acting
+
+class CardsDealt(NamedTuple):
+    board: Tuple[str, ...]  # Every community card so far
+
+class EquitiesShown(NamedTuple):
+    equities: Tuple[Tuple[str, float], ...]  # (player, equity) for everyone still in
+
+class ShowdownStarted(NamedTuple):
+    hands: Tuple[Tuple[str, Tuple[str, ...], str], ...]  # (player, hole cards, hand name)
+
+class PotAwarded(NamedTuple):
+    player: str
+    amount: int
+    hand_name: Optional[str]  # None when everyone else folded
+
+class SeatViewShown(NamedTuple):
+    # What a human seat sees at the start of a hand
+    pot: int
+    board: Tuple[str, ...]
+    hand: Tuple[str, ...]
+    hand_name: Optional[str]  # Once there is a board
+    preflop_equity: Optional[float]  # Before the flop
+    opponents: int
+    chips: int
+
+class DecisionRequested(NamedTuple):
+    # A human seat is about to be asked for its action
+    player: str
+    hand: Tuple[str, ...]
+    hand_name: Optional[str]
+    current_bet: int
+    player_bet: int
+    chips: int
+
+class InputRejected(NamedTuple):
+    message: str
+
+class ChipCounts(NamedTuple):
+    chips: Tuple[Tuple[str, int], ...]  # (player, chips) in seat order
+
+class EventBus:
+    def __init__(self, subscribers: Optional[List[Callable]] = None):
+        self.subscribers = list(subscribers or [])
+
+    def __bool__(self) -> bool:
+        return bool(self.subscribers)
+
+    def subscribe(self, subscriber: Callable):
+        self.subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: Callable):
+        self.subscribers.remove(subscriber)
+
+    def emit(self, event: NamedTuple):
+        for subscriber in self.subscribers:
+            subscriber(event)
+
+def render(event: NamedTuple, color: bool = True) -> str:
+    """The text the console has always shown for an event, optionally without colors."""
+    def paint(text: str, fore: str) -> str:
+        return f"{fore}{text}{Style.RESET_ALL}" if color else text
+
+    kind = type(event)
+    if kind is HandStarted:
+        return f"\n{paint('=== New Round Started ===', Fore.GREEN)}\n{paint(f'Dealer: {event.dealer}', Fore.CYAN)}"
+    if kind is BlindPosted:
+        text = f"{event.player} posts {event.blind} blind: {event.amount}"
+        return f"\n{text}" if event.blind == 'small' else text
+    if kind is StreetStarted:
+        return f"\n{paint(f'=== {event.street.upper()} Betting Round ===', Fore.YELLOW)}"
+    if kind is TurnStarted:
+        text = f"{event.player}'s turn..."
+        return f"\n{paint(text, Fore.BLUE)}"
+    if kind is PlayerActed:
+        if event.action == 'fold':
+            return f"{event.player} folds!"
+        if event.action == 'check':
+            return f"{event.player} checks!"
+        if event.action == 'call':
+            return f"{event.player} calls {event.amount}!"
+        return f"{event.player} raises to {event.total_bet}!"
+    if kind is CardsDealt:
+        return f"\n{paint('Community Cards: ' + ' '.join(event.board), Fore.CYAN)}"
+    if kind is EquitiesShown:
+        lines = [f"\n{paint('Equity:', Fore.CYAN)}"]
+        lines.extend(f"{player}: {equity:.1%}" for player, equity in event.equities)
+        return '\n'.join(lines)
+    if kind is ShowdownStarted:
+        lines = [f"\n{paint('=== Showdown ===', Fore.GREEN)}"]
+        lines.extend(f"{player}'s hand: {' '.join(cards)} ({hand_name})" for player, cards, hand_name in event.hands)
+        return '\n'.join(lines)
+    if kind is PotAwarded:
+        if event.hand_name is None:
+            return f"\n{paint(f'{event.player} wins {event.amount} chips!', Fore.GREEN)}"
+        return f"\n{paint(f'{event.player} wins {event.amount} chips with {event.hand_name}!', Fore.GREEN)}"
+    if kind is SeatViewShown:
+        lines = [f"\n{paint(f'Pot: {event.pot}', Fore.CYAN)}"]
+        if event.board:
+            lines.append(f"Community Cards: {' '.join(event.board)}")
+        lines.append(f"Your Hand: {' '.join(event.hand)}")
+        if event.hand_name is not None:
+            lines.append(f"Your hand rank: {event.hand_name}")
+        elif event.preflop_equity is not None:
+            lines.append(f"Pre-flop equity vs {event.opponents} opponents: {event.preflop_equity:.1%}")
+        lines.append(f"Your Chips: {event.chips}")
+        return '\n'.join(lines)
+    if kind is DecisionRequested:
+        lines = [f"\n{paint(f'Your turn! Your hand: ' + ' '.join(event.hand), Fore.GREEN)}"]
+        if event.hand_name is not None:
+            lines.append(f"Your hand rank: {event.hand_name}")
+        lines.append(f"Current bet: {event.current_bet}, Your current bet: {event.player_bet}")
+        lines.append(f"To call: {max(0, event.current_bet - event.player_bet)}, Your chips: {event.chips}")
+        return '\n'.join(lines)
+    if kind is InputRejected:
+        return event.message
+    if kind is ChipCounts:
+        return '\n'.join(["\nCurrent chip counts:"] + [f"{player}: {chips}" for player, chips in event.chips])
+    return repr(event)
+
+class ConsoleRenderer:
+    def __call__(self, event: NamedTuple):
+        print(render(event))
+
+class BufferedEventWriter:
+    """Writes events as plain text lines to a file, buffer_events at a time.
+
+    close() writes what is still buffered and closes the file; use the
+    writer as a context manager so the last events are never lost.
+    """
+    def __init__(self, file: TextIO, buffer_events: int = 1000):
+        self.file = file
+        self.buffer_events = buffer_events
+        self._buffer: List[str] = []
+
+    def __call__(self, event: NamedTuple):
+        self._buffer.append(render(event, color=False))
+        if len(self._buffer) >= self.buffer_events:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self.file.write('\n'.join(self._buffer) + '\n')
+            self._buffer = []
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self) -> 'BufferedEventWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
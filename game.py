@@ -1,23 +1,59 @@
-from typing import List
+from typing import Generator, List, Optional, Tuple
+import random
 from colorama import init, Fore, Style
 from card import Card, Deck
 from player import Player
-from betting import BettingRound
+from seats import FOLDED
+from betting import STREET_CODES, BettingRound
 from game_state import GameState
+from events import CardsDealt, ConsoleRenderer, EventBus, HandStarted
+from rng import derive_seed
+from instrumentation import timed
+import instrumentation
 
 init()  # Initialize colorama
 
+# Betting rounds in order with the number of community cards dealt before each
+STREETS = [("pre-flop", 0), ("flop", 3), ("turn", 1), ("river", 1)]
+STREET_TIMERS = {round_name: f"hand.{round_name}" for round_name, _ in STREETS}
+
 class TexasHoldem:
-    def __init__(self, num_ai_players: int = 3):
+    def __init__(self, num_ai_players: int = 3, headless: bool = False,
+                 small_blind: int = 10, big_blind: int = 20, seed: Optional[int] = None, table_id: int = 0):
+        # Headless tables have no human seat and never touch the console
+        self.headless = headless
+        verbose = not headless
+        
         # Create players
-        self.players = [Player("You", is_ai=False)]
+        self.players = [] if headless else [Player("You", is_ai=False)]
         for i in range(num_ai_players):
             self.players.append(Player(f"AI Player {i+1}", is_ai=True))
             
-        self.deck = Deck()
+        # With a seed every hand's cards and AI choices come from the stream of
+        # (seed, table_id, hand_number), so any hand can be replayed on its own
+        self.seed = seed
+        self.table_id = table_id
+        self.hand_number = 0
+        self.rng = random.Random()
+        self.deck = Deck(self.rng, lazy=True)  # Most hands end long before the river
         self.dealer_pos = 0  # Position of the dealer button
-        self.game_state = GameState(self.players)
-        self.betting_round = BettingRound(self.players)
+        # Everything the table reports goes through one bus; headless tables start with no subscribers
+        self.events = EventBus([ConsoleRenderer()] if verbose else [])
+        self.game_state = GameState(self.players, verbose=verbose, events=self.events)
+        self.betting_round = BettingRound(self.players, small_blind, big_blind, verbose=verbose, events=self.events)
+        self.game_state.betting_round = self.betting_round
+        
+    @property
+    def players(self) -> List[Player]:
+        return self._players
+        
+    @players.setter
+    def players(self, players: List[Player]):
+        # Keep the betting round and game state seated with the same players
+        self._players = players
+        if hasattr(self, 'betting_round'):
+            self.betting_round.players = players
+            self.game_state.players = players
             
     def play_game(self):
         while True:
@@ -34,45 +70,111 @@ class TexasHoldem:
             if choice != 'y':
                 break
                 
-    def _play_round(self):
+    def _play_round(self) -> List[Player]:
+        with timed('hand.total'):
+            steps = self.hand_steps()
+            decision = None
+            while True:
+                try:
+                    player = steps.send(decision)
+                except StopIteration as done:
+                    return done.value
+                decision = self.betting_round.decide(player, self.game_state.community_cards)
+        
+    def hand_steps(self) -> Generator[Player, Tuple[str, int], List[Player]]:
+        """Play one hand as a generator that yields each player who has to act.
+
+        The caller sends back that player's (action, amount) and the
+        generator returns the hand's winners, so decisions can come from
+        anywhere: the console, a coroutine, or a strategy deciding for many
+        tables at once.
+        """
+        self._start_hand()
+        return (yield from self.street_steps())
+        
+    def street_steps(self, resume: bool = False) -> Generator[Player, Tuple[str, int], List[Player]]:
+        """Play the streets of the hand in progress, yielding each player who has to act as hand_steps does.
+
+        With resume the betting round's current street is already open, e.g.
+        after table_state.restore(), and play continues from its next decision.
+        """
+        betting = self.betting_round
+        first = STREET_CODES[betting.street] if resume else 0
+        for round_name, new_cards in STREETS[first:]:
+            if new_cards and not resume:
+                if betting.players_left <= 1:
+                    break  # Everyone else folded; no more cards are needed
+                self._deal_community_cards(new_cards)
+            with timed(STREET_TIMERS[round_name]):
+                if not resume and not betting.start_round(round_name, self._first_to_act(round_name)):
+                    break
+                resume = False
+                player = betting.next_to_act()
+                while player is not None:
+                    action, amount = yield player
+                    betting.apply_decision(player, action, amount)
+                    player = betting.next_to_act()
+                    
+        return self._finish_hand()
+        
+    def _start_hand(self):
+        if self.seed is not None:
+            self.rng.seed(derive_seed(self.seed, self.table_id, self.hand_number))
+        self.hand_number += 1
+        
         # Reset game state
-        self.deck.reset()
-        self.deck.shuffle()
+        with timed('hand.shuffle'):
+            self.deck.reset()
+            self.deck.shuffle()
         self.game_state.community_cards = []
         
+        # Busted players sit the hand out
+        self.betting_round.seats.new_hand()
         for player in self.players:
-            player.clear_hand()
+            player.rng = self.rng
             
         # Post blinds
-        self.betting_round.post_blinds(self.dealer_pos)
+        with timed('hand.blinds'):
+            self.betting_round.post_blinds(self.dealer_pos)
             
         # Deal hole cards
-        for _ in range(2):
-            for i in range(len(self.players)):
-                # Deal cards starting from small blind position
-                player_pos = (self.dealer_pos + i + 1) % len(self.players)
-                self.players[player_pos].receive_card(self.deck.draw())
+        with timed('hand.deal'):
+            for _ in range(2):
+                for i in range(len(self.players)):
+                    # Deal cards starting from small blind position
+                    player_pos = (self.dealer_pos + i + 1) % len(self.players)
+                    self.players[player_pos].receive_card(self.deck.draw())
                 
-        print(f"\n{Fore.GREEN}=== New Round Started ==={Style.RESET_ALL}")
-        print(f"{Fore.CYAN}Dealer: {self.players[self.dealer_pos].name}{Style.RESET_ALL}")
-        self.game_state.show_game_state(self.players[0])
+        if self.events:
+            self.events.emit(HandStarted(self.players[self.dealer_pos].name))
+        if not self.headless:
+            self.game_state.show_game_state(self.players[0])
+            
+    def _first_to_act(self, round_name: str) -> int:
+        # Pre-flop starts from UTG, later streets from the small blind
+        if round_name == "pre-flop":
+            return (self.dealer_pos + 3) % len(self.players)
+        return (self.dealer_pos + 1) % len(self.players)
         
-        # Pre-flop betting (start from UTG position)
-        if self.betting_round.handle_betting_round("pre-flop", start_from=(self.dealer_pos + 3) % len(self.players)):
-            # Flop
-            self._deal_community_cards(3)
-            if self.betting_round.handle_betting_round("flop", start_from=(self.dealer_pos + 1) % len(self.players), community_cards=self.game_state.community_cards):
-                # Turn
-                self._deal_community_cards(1)
-                if self.betting_round.handle_betting_round("turn", start_from=(self.dealer_pos + 1) % len(self.players), community_cards=self.game_state.community_cards):
-                    # River
-                    self._deal_community_cards(1)
-                    self.betting_round.handle_betting_round("river", start_from=(self.dealer_pos + 1) % len(self.players), community_cards=self.game_state.community_cards)
+    def _finish_hand(self) -> List[Player]:
+        # Run out the board when players are all-in before the river, never after a hand won by folds
+        flags = self.betting_round.seats.flags
+        if sum(1 for flag in flags if not flag & FOLDED) > 1 and len(self.game_state.community_cards) < 5:
+            if self.events and len(self.game_state.community_cards) >= 3:
+                self.game_state.show_equities()
+            self._deal_community_cards(5 - len(self.game_state.community_cards))
                     
         # Show all hands and determine winner
-        self.game_state.handle_showdown(self.betting_round.pot)
+        with timed('hand.showdown'):
+            winners = self.game_state.handle_showdown(self.betting_round.pot, self.betting_round.contributions,
+                                                      self.dealer_pos)
+        if instrumentation.active is not None:
+            instrumentation.active.count('hands')
+            instrumentation.active.tick()
+        return winners
         
     def _deal_community_cards(self, count: int):
         for _ in range(count):
             self.game_state.community_cards.append(self.deck.draw())
-        print(f"\n{Fore.CYAN}Community Cards: {' '.join(str(card) for card in self.game_state.community_cards)}{Style.RESET_ALL}") 
\ No newline at end of file
+        if self.events:
+            self.events.emit(CardsDealt(tuple(str(card) for card in self.game_state.community_cards)))
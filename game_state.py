@@ -1,54 +1,88 @@
-from typing import List
-from colorama import Fore, Style
+from typing import Dict, List, Optional
 from card import Card
 from player import Player
-from treys import Evaluator
+from evaluator import EVALUATOR
+from preflop_table import preflop_equity
+from equity import EquityResult, exact_equities
+from batch_evaluator import rank_hands
+from pot import Pot, award_pots, build_pots
+from events import ChipCounts, ConsoleRenderer, EquitiesShown, EventBus, PotAwarded, SeatViewShown, ShowdownStarted
 
 class GameState:
-    def __init__(self, players: List[Player]):
+    def __init__(self, players: List[Player], verbose: bool = True, events: Optional[EventBus] = None):
         self.players = players
         self.community_cards: List[Card] = []
-        self.evaluator = Evaluator()
+        self.evaluator = EVALUATOR
+        self.verbose = verbose
+        self.events = events if events is not None else EventBus([ConsoleRenderer()] if verbose else [])
+        self.betting_round = None  # Set by the table so the pot can be read instead of recomputed
         
     def show_game_state(self, human_player: Player):
-        print(f"\n{Fore.CYAN}Pot: {self.get_total_pot()}{Style.RESET_ALL}")
-        if self.community_cards:
-            print(f"Community Cards: {' '.join(str(card) for card in self.community_cards)}")
-        print(f"Your Hand: {' '.join(str(card) for card in human_player.hand)}")
-        if self.community_cards:
-            print(f"Your hand rank: {human_player.get_hand_rank_name(self.community_cards)}")
-        print(f"Your Chips: {human_player.chips}")
+        if not self.events:
+            return
+        board = tuple(str(card) for card in self.community_cards)
+        opponents = max(1, sum(1 for p in self.players if not p.folded) - 1)
+        hand_name = human_player.get_hand_rank_name(self.community_cards) if self.community_cards else None
+        equity = None if self.community_cards else preflop_equity(human_player.hand, opponents)
+        self.events.emit(SeatViewShown(self.get_total_pot(), board, tuple(str(card) for card in human_player.hand),
+                                       hand_name, equity, opponents, human_player.chips))
+        
+    def get_equities(self) -> Dict[Player, EquityResult]:
+        # Exact equities of the players still in the hand, once the flop is out
+        active_players = [p for p in self.players if not p.folded]
+        results = exact_equities([p.hand for p in active_players], self.community_cards)
+        return dict(zip(active_players, results))
+        
+    def show_equities(self):
+        equities = tuple((player.name, result.equity) for player, result in self.get_equities().items())
+        self.events.emit(EquitiesShown(equities))
         
     def show_chip_counts(self):
-        print("\nCurrent chip counts:")
-        for player in self.players:
-            print(f"{player.name}: {player.chips}")
+        if self.events:
+            self.events.emit(ChipCounts(tuple((player.name, player.chips) for player in self.players)))
             
     def get_total_pot(self) -> int:
-        # Calculate total pot from the betting round
+        if self.betting_round is not None:
+            return self.betting_round.pot
+            
+        # Calculate total pot from the players' bets
         total = 0
         for player in self.players:
             if not player.folded:  # Only count bets from non-folded players
                 total += player.current_bet
         return total
             
-    def handle_showdown(self, pot: int):
+    def handle_showdown(self, pot: int, contributions: Optional[Dict[Player, int]] = None,
+                        dealer_pos: int = 0) -> List[Player]:
+        """Pay out the hand and return every player who won chips.
+
+        With contributions (chips each player put in this hand) the pot is
+        split into main and side pots; without them it is a single pot
+        contested by everyone still in the hand.
+        """
         active_players = [p for p in self.players if not p.folded]
         
         if len(active_players) == 1:
             winner = active_players[0]
-            print(f"\n{Fore.GREEN}{winner.name} wins {pot} chips!{Style.RESET_ALL}")
+            if self.events:
+                self.events.emit(PotAwarded(winner.name, pot, None))
             winner.chips += pot
-            return
+            return [winner]
             
-        print(f"\n{Fore.GREEN}=== Showdown ==={Style.RESET_ALL}")
-        for player in active_players:
-            hand_rank = player.get_hand_rank_name(self.community_cards)
-            print(f"{player.name}'s hand: {' '.join(str(card) for card in player.hand)} ({hand_rank})")
+        if self.events:
+            self.events.emit(ShowdownStarted(tuple(
+                (player.name, tuple(str(card) for card in player.hand), player.get_hand_rank_name(self.community_cards))
+                for player in active_players)))
             
-        # Use treys evaluator to find the winner
-        winner = min(active_players, 
-                    key=lambda p: p._evaluate_hand_strength(self.community_cards))
+        # Rank every contender once in one batch (lower is better in treys)
+        ranks = dict(zip(active_players, rank_hands([p.hand for p in active_players], self.community_cards)))
+        pots = build_pots(contributions) if contributions else [Pot(pot, active_players)]
+        order = self.players[dealer_pos + 1:] + self.players[:dealer_pos + 1]
+        payouts = award_pots(pots, ranks, order)
         
-        print(f"\n{Fore.GREEN}{winner.name} wins {pot} chips with {winner.get_hand_rank_name(self.community_cards)}!{Style.RESET_ALL}")
-        winner.chips += pot 
\ No newline at end of file
+        winners = [p for p in order if p in payouts]
+        for winner in winners:
+            winner.chips += payouts[winner]
+            if self.events:
+                self.events.emit(PotAwarded(winner.name, payouts[winner], winner.get_hand_rank_name(self.community_cards)))
+        return winners
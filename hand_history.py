@@ -0,0 +1,283 @@
+"""Append-only binary hand history.
+
+The file is a small header followed by fixed-size little-endian records,
+one per hand, so record i always starts at HEADER.size + i * RECORD.size.
+Cards are stored as card ints (0-51) with NO_CARD for unused slots; seats
+beyond num_seats and actions beyond num_actions are zero padding.
+
+A record holds its first INLINE_ACTIONS actions, enough for a heads-up
+hand, which keeps records at 224 bytes. Longer hands keep the rest in an
+overflow file next to the history (path + OVERFLOW_SUFFIX), at the byte
+offset the record stores, so no action is ever dropped.
+"""
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+import mmap
+import os
+import struct
+
+MAGIC = b'HHIS'
+VERSION = 3
+MAX_SEATS = 10
+INLINE_ACTIONS = 16  # A heads-up hand; the actions of longer ones continue in the overflow file
+MAX_ACTIONS = 0xFFFF
+NO_CARD = 0xFF
+OVERFLOW_SUFFIX = '.overflow'
+
+STREETS = ['pre-flop', 'flop', 'turn', 'river']
+ACTIONS = ['small_blind', 'big_blind', 'fold', 'check', 'call', 'raise']
+
+# Flags
+SHOWDOWN = 1  # More than one player was left at the end of the hand
+ACTIONS_OVERFLOW = 2  # Actions past INLINE_ACTIONS are in the overflow file
+
+HEADER = struct.Struct('<4sHHHH')  # magic, version, record size, max seats, inline actions
+# Each action is one uint32: chips put in (23 bits), seat (4 bits), action (3 bits), street (2 bits)
+ACTION = struct.Struct('<I')
+MAX_ACTION_AMOUNT = (1 << 23) - 1
+RECORD = struct.Struct(
+    '<QBBBH'  # hand id, dealer seat, number of seats, flags, number of actions
+    'ii'  # small blind, big blind
+    f'5s{2 * MAX_SEATS}s'  # board, hole cards
+    f'{MAX_SEATS}H'  # player ids
+    f'{MAX_SEATS}i{MAX_SEATS}i'  # stacks before and after the hand
+    'iH'  # pot, winning seats bitmask
+    'Q'  # offset of the actions past INLINE_ACTIONS in the overflow file
+    f'{ACTION.size * INLINE_ACTIONS}s'  # actions
+)
+
+@dataclass
+class HandAction:
+    street: str
+    seat: int
+    action: str
+    amount: int  # Chips put in by this action
+
+@dataclass
+class HandRecord:
+    hand_id: int
+    dealer: int
+    small_blind: int
+    big_blind: int
+    board: List[int]
+    holes: List[Tuple[int, ...]]  # Card ints per seat
+    player_ids: List[int]
+    start_stacks: List[int]
+    end_stacks: List[int]
+    pot: int
+    winners: List[int]  # Seats
+    showdown: bool
+    actions: List[HandAction]
+
+    @property
+    def num_seats(self) -> int:
+        return len(self.player_ids)
+
+    def chip_changes(self) -> List[int]:
+        return [end - start for start, end in zip(self.start_stacks, self.end_stacks)]
+
+def _card_bytes(cards: Sequence[int], size: int) -> bytes:
+    return bytes(cards) + bytes([NO_CARD]) * (size - len(cards))
+
+def _pack_actions(actions: Sequence[HandAction]) -> bytes:
+    if any(action.amount > MAX_ACTION_AMOUNT for action in actions):
+        raise ValueError(f"Hand history actions are limited to {MAX_ACTION_AMOUNT} chips!")
+    return b''.join(ACTION.pack(a.amount | a.seat << 23 | ACTIONS.index(a.action) << 27 | STREETS.index(a.street) << 30)
+                    for a in actions)
+
+def _unpack_actions(buffer, offset: int, count: int) -> List[HandAction]:
+    actions = []
+    for i in range(count):
+        word, = ACTION.unpack_from(buffer, offset + i * ACTION.size)
+        actions.append(HandAction(STREETS[word >> 30], word >> 23 & 15, ACTIONS[word >> 27 & 7], word & MAX_ACTION_AMOUNT))
+    return actions
+
+def pack_record(record: HandRecord, overflow_offset: int = 0) -> Tuple[bytes, bytes]:
+    """The fixed-size record, and the actions to append to the overflow file at overflow_offset."""
+    num_seats = record.num_seats
+    if not 2 <= num_seats <= MAX_SEATS:
+        raise ValueError(f"Hand history supports 2 to {MAX_SEATS} seats!")
+    padding = [0] * (MAX_SEATS - num_seats)
+
+    flags = SHOWDOWN if record.showdown else 0
+    actions = record.actions
+    if len(actions) > MAX_ACTIONS:
+        raise ValueError(f"Hand history supports up to {MAX_ACTIONS} actions per hand!")
+    overflow = _pack_actions(actions[INLINE_ACTIONS:])
+    if overflow:
+        flags |= ACTIONS_OVERFLOW
+    else:
+        overflow_offset = 0
+
+    holes = b''.join(_card_bytes(hole, 2) for hole in record.holes)
+    winners = 0
+    for seat in record.winners:
+        winners |= 1 << seat
+    return RECORD.pack(
+        record.hand_id, record.dealer, num_seats, flags, len(actions),
+        record.small_blind, record.big_blind,
+        _card_bytes(record.board, 5), holes.ljust(2 * MAX_SEATS, bytes([NO_CARD])),
+        *record.player_ids, *padding,
+        *record.start_stacks, *padding,
+        *record.end_stacks, *padding,
+        record.pot, winners, overflow_offset,
+        _pack_actions(actions[:INLINE_ACTIONS]),
+    ), overflow
+
+def unpack_record(buffer, offset: int = 0, overflow=None) -> HandRecord:
+    """Decode the record at offset; overflow is the overflow file's contents, needed for long hands."""
+    fields = RECORD.unpack_from(buffer, offset)
+    hand_id, dealer, num_seats, flags, num_actions, small_blind, big_blind, board, holes = fields[:9]
+    player_ids = list(fields[9:9 + num_seats])
+    start_stacks = list(fields[9 + MAX_SEATS:9 + MAX_SEATS + num_seats])
+    end_stacks = list(fields[9 + 2 * MAX_SEATS:9 + 2 * MAX_SEATS + num_seats])
+    pot, winners, overflow_offset, action_bytes = fields[9 + 3 * MAX_SEATS:]
+
+    actions = _unpack_actions(action_bytes, 0, min(num_actions, INLINE_ACTIONS))
+    if flags & ACTIONS_OVERFLOW:
+        if overflow is None:
+            raise ValueError(f"Hand {hand_id} has actions in an overflow file that is missing!")
+        actions += _unpack_actions(overflow, overflow_offset, num_actions - INLINE_ACTIONS)
+    return HandRecord(
+        hand_id=hand_id,
+        dealer=dealer,
+        small_blind=small_blind,
+        big_blind=big_blind,
+        board=[card for card in board if card != NO_CARD],
+        holes=[tuple(card for card in holes[2 * seat:2 * seat + 2] if card != NO_CARD) for seat in range(num_seats)],
+        player_ids=player_ids,
+        start_stacks=start_stacks,
+        end_stacks=end_stacks,
+        pot=pot,
+        winners=[seat for seat in range(num_seats) if winners >> seat & 1],
+        showdown=bool(flags & SHOWDOWN),
+        actions=actions,
+    )
+
+def record_from_game(game, hand_id: int, start_stacks: List[int], winners: List,
+                     player_ids: Optional[List[int]] = None) -> HandRecord:
+    """Build the record of the hand a TexasHoldem table has just played."""
+    players = game.players
+    seats = {player: seat for seat, player in enumerate(players)}
+    return HandRecord(
+        hand_id=hand_id,
+        dealer=game.dealer_pos,
+        small_blind=game.betting_round.small_blind,
+        big_blind=game.betting_round.big_blind,
+        board=[int(card) for card in game.game_state.community_cards],
+        holes=[tuple(int(card) for card in player.hand) for player in players],
+        player_ids=list(player_ids) if player_ids is not None else list(range(len(players))),
+        start_stacks=list(start_stacks),
+        end_stacks=[player.chips for player in players],
+        pot=game.betting_round.pot,
+        winners=[seats[winner] for winner in winners],
+        showdown=sum(1 for player in players if not player.folded) > 1,
+        actions=[HandAction(street, seats[player], action, amount)
+                 for street, player, action, amount in game.betting_round.actions],
+    )
+
+class HandHistoryWriter:
+    """Appends hand records to a file, writing them out in bulk every buffer_hands hands."""
+    def __init__(self, path: str, buffer_hands: int = 4096):
+        self.path = path
+        self.buffer_hands = buffer_hands
+        self._buffer = bytearray()
+        self._overflow_buffer = bytearray()
+        self._buffered = 0
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, MAX_SEATS, INLINE_ACTIONS))
+        else:
+            _check_header(path)
+        self._overflow = None  # Opened with the first hand too long for its record
+        overflow_path = path + OVERFLOW_SUFFIX
+        self._overflow_size = os.path.getsize(overflow_path) if os.path.exists(overflow_path) else 0
+
+    def write(self, record: HandRecord):
+        packed, overflow = pack_record(record, self._overflow_size + len(self._overflow_buffer))
+        self._buffer += packed
+        self._overflow_buffer += overflow
+        self._buffered += 1
+        if self._buffered >= self.buffer_hands:
+            self.flush()
+
+    def flush(self):
+        # Overflow actions go out first, so no record ever points past the end of the overflow file
+        if self._overflow_buffer:
+            if self._overflow is None:
+                self._overflow = open(self.path + OVERFLOW_SUFFIX, 'ab')
+            self._overflow.write(self._overflow_buffer)
+            self._overflow.flush()
+            self._overflow_size += len(self._overflow_buffer)
+            self._overflow_buffer = bytearray()
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+            self._buffered = 0
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+        if self._overflow is not None:
+            self._overflow.close()
+
+    def __enter__(self) -> 'HandHistoryWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _check_header(path: str):
+    with open(path, 'rb') as f:
+        magic, version, record_size, max_seats, inline_actions = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"{path} is not a compatible hand history file!")
+
+class HandHistoryReader:
+    """Memory-maps a hand history file and decodes records only when they are accessed."""
+    def __init__(self, path: str):
+        _check_header(path)
+        self.path = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._count = (size - HEADER.size) // RECORD.size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._count else None
+        self._overflow_file = self._overflow = None
+        if os.path.exists(path + OVERFLOW_SUFFIX) and os.path.getsize(path + OVERFLOW_SUFFIX):
+            self._overflow_file = open(path + OVERFLOW_SUFFIX, 'rb')
+            self._overflow = mmap.mmap(self._overflow_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> HandRecord:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Hand index out of range!")
+        return unpack_record(self._map, HEADER.size + index * RECORD.size, self._overflow)
+
+    def __iter__(self) -> Iterator[HandRecord]:
+        return self.iter_range(0, self._count)
+
+    def iter_range(self, start: int, stop: int) -> Iterator[HandRecord]:
+        for index in range(max(start, 0), min(stop, self._count)):
+            yield unpack_record(self._map, HEADER.size + index * RECORD.size, self._overflow)
+
+    def filter(self, predicate: Callable[[HandRecord], bool]) -> Iterator[HandRecord]:
+        return (record for record in self if predicate(record))
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+        if self._overflow is not None:
+            self._overflow.close()
+            self._overflow_file.close()
+
+    def __enter__(self) -> 'HandHistoryReader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,98 +1,129 @@
-from typing import List
-import random
-from treys import Evaluator
+from typing import Iterable, List, Optional
 from card import Card
+from evaluator import EVALUATOR, evaluate, rank_class_name
+import instrumentation
+from seats import ALL_IN, FOLDED, HandView, SeatArrays
+from strategy import DEFAULT_STRATEGY, HeuristicStrategy, Strategy, preflop_strength, seat_snapshot
 
 class Player:
-    def __init__(self, name: str, chips: int = 1000, is_ai: bool = False):
+    """A seat's view: chips, bets, flags and hole cards live in the table's SeatArrays.
+
+    Only what is not per-seat table state (name, strategy, ...) is kept on
+    the player itself, in slots.
+    """
+    __slots__ = ('name', 'is_ai', 'strategy', 'num_opponents', 'rng', '_last_evaluation', '_seats', 'seat', '_hand')
+
+    evaluator = EVALUATOR  # Shared by every player, never rebuilt per seat
+
+    def __init__(self, name: str, chips: int = 1000, is_ai: bool = False,
+                 equity_time_budget: Optional[float] = None, strategy: Optional[Strategy] = None):
         self.name = name
-        self.chips = chips
-        self.hand: List[Card] = []
         self.is_ai = is_ai
-        self.current_bet = 0
-        self.folded = False
-        self.evaluator = Evaluator()
-        
+        self._seats = SeatArrays(1)  # Private until bind() seats the player at a table
+        self.seat = 0  # Index into the arrays, set by bind()
+        self._hand = HandView(self._seats, 0)
+        self.chips = chips
+        self._last_evaluation = (None, 0)  # (cards, rank) of the most recent post-flop evaluation
+        # How the AI decides; equity_time_budget is the seconds the default heuristic may
+        # spend sampling equity per decision (None shares the stateless rank heuristic)
+        if strategy is None:
+            strategy = DEFAULT_STRATEGY if equity_time_budget is None else HeuristicStrategy(equity_time_budget)
+        self.strategy = strategy
+        self.num_opponents = 1  # Updated by the betting round before each decision
+        self.rng = None  # Random stream of the table the player sits at, set every hand
+
+    def bind(self, seats: SeatArrays, seat: int):
+        """Move this player's state into slot seat of a table's arrays."""
+        old, old_seat = self._seats, self.seat
+        if old is seats and old_seat == seat:
+            return
+        hand = list(self._hand)
+        seats.chips[seat] = old.chips[old_seat]
+        seats.bets[seat] = old.bets[old_seat]
+        seats.contributions[seat] = old.contributions[old_seat]
+        seats.flags[seat] = old.flags[old_seat]
+        self._seats, self.seat = seats, seat
+        self._hand.seats, self._hand.seat = seats, seat
+        self._hand.set(hand)
+
+    @property
+    def chips(self) -> int:
+        return self._seats.chips[self.seat]
+
+    @chips.setter
+    def chips(self, chips: int):
+        self._seats.chips[self.seat] = chips
+
+    @property
+    def current_bet(self) -> int:
+        return self._seats.bets[self.seat]
+
+    @current_bet.setter
+    def current_bet(self, bet: int):
+        self._seats.bets[self.seat] = bet
+
+    @property
+    def folded(self) -> bool:
+        return bool(self._seats.flags[self.seat] & FOLDED)
+
+    @folded.setter
+    def folded(self, folded: bool):
+        flags = self._seats.flags
+        flags[self.seat] = flags[self.seat] | FOLDED if folded else flags[self.seat] & ~FOLDED
+
+    @property
+    def all_in(self) -> bool:
+        return bool(self._seats.flags[self.seat] & ALL_IN)
+
+    @property
+    def hand(self) -> HandView:
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards: Iterable[Card]):
+        self._hand.set(cards)
+
     def receive_card(self, card: Card):
-        self.hand.append(card)
+        self._hand.append(card)
         
     def clear_hand(self):
-        self.hand = []
-        self.current_bet = 0
-        self.folded = False
+        self._hand.clear()
+        self._seats.bets[self.seat] = 0
+        self._seats.flags[self.seat] = 0
         
     def make_bet(self, amount: int) -> int:
-        if amount > self.chips:
-            amount = self.chips
-        self.chips -= amount
-        self.current_bet += amount
+        seats, seat = self._seats, self.seat
+        if amount > seats.chips[seat]:
+            amount = seats.chips[seat]
+        seats.chips[seat] -= amount
+        seats.bets[seat] += amount
+        if amount and not seats.chips[seat]:
+            seats.flags[seat] |= ALL_IN
         return amount
     
     def ai_make_decision(self, to_call: int, pot: int, community_cards: List[Card]) -> tuple[str, int]:
         if not self.is_ai:
             raise ValueError("This is not an AI player!")
-            
-        # Improved AI logic using proper hand evaluation
-        hand_strength = self._evaluate_hand_strength(community_cards)
-        
-        # Convert hand strength to a 0-1 scale (7462 is the worst hand, 1 is the best in treys)
-        normalized_strength = (7462 - hand_strength) / 7462
-        
-        # If the call amount is too high relative to our chips, be more cautious
-        if to_call > self.chips // 3:
-            normalized_strength *= 0.7
-            
-        if normalized_strength > 0.8:  # Very strong hand
-            if random.random() < 0.7:  # More likely to raise with strong hand
-                raise_amount = to_call * 3
-                return 'raise', min(raise_amount, self.chips)
-            return 'call', to_call
-        elif normalized_strength > 0.6:  # Strong hand
-            if random.random() < 0.4:
-                raise_amount = to_call * 2
-                return 'raise', min(raise_amount, self.chips)
-            return 'call', to_call
-        elif normalized_strength > 0.4:  # Medium hand
-            if to_call > self.chips // 3:
-                return 'fold', 0
-            return 'call', to_call
-        else:  # Weak hand
-            if to_call > self.chips // 5:
-                return 'fold', 0
-            if random.random() < 0.2:  # Sometimes bluff
-                raise_amount = to_call * 2
-                return 'raise', min(raise_amount, self.chips)
-            return 'call', to_call
+        snapshot = seat_snapshot(self._seats, self.seat, to_call, pot, community_cards, self.num_opponents)
+        if instrumentation.active is None:  # Called for every decision, so skip even the null timer
+            return self.strategy.decide(snapshot, self.rng)
+        with instrumentation.active.timer('ai.decision'):
+            return self.strategy.decide(snapshot, self.rng)
             
     def _evaluate_hand_strength(self, community_cards: List[Card] = None) -> int:
+        hand = self._hand.cards()
         if not community_cards:
-            # Pre-flop evaluation based on card ranks
-            if len(self.hand) < 2:  # Not enough cards yet
-                return 5000
-                
-            ranks = [card.get_value() for card in self.hand]
-            if ranks[0] == ranks[1]:  # Pocket pair
-                return 2000
-            elif all(rank > 10 for rank in ranks):  # Both high cards
-                return 3000
-            elif any(rank > 10 for rank in ranks):  # One high card
-                return 4000
-            else:
-                return 5000
-        
-        # Convert cards to treys format
-        board = [card.treys_card for card in community_cards]
-        hole_cards = [card.treys_card for card in self.hand]
+            return preflop_strength(hand, self.num_opponents)
         
         # Get hand rank (lower is better in treys)
-        return self.evaluator.evaluate(board, hole_cards)
+        cards = (*hand, *community_cards)
+        if self._last_evaluation[0] != cards:
+            self._last_evaluation = (cards, evaluate(hand, community_cards))
+        return self._last_evaluation[1]
     
     def get_hand_rank_name(self, community_cards: List[Card]) -> str:
         if not community_cards:
             return "High Card"
             
-        board = [card.treys_card for card in community_cards]
-        hole_cards = [card.treys_card for card in self.hand]
-        
-        rank = self.evaluator.evaluate(board, hole_cards)
-        return self.evaluator.class_to_string(self.evaluator.get_rank_class(rank)) 
\ No newline at end of file
+        # Reuses the rank when this hand was just evaluated
+        return rank_class_name(self._evaluate_hand_strength(community_cards)) 
\ No newline at end of file
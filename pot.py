@@ -0,0 +1,57 @@
+"""Main and side pots built from what every player put in during a hand.
+
+Each distinct contribution level of a player still in the hand closes a
+pot: everyone pays into it up to that level, and only players who put in
+at least that much can win it. Chips from folded players stay in the pots
+they paid into. A pot is split between its best hands, with odd chips
+going one at a time to the winners closest to the left of the dealer.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+from player import Player
+
+@dataclass
+class Pot:
+    amount: int
+    eligible: List[Player]  # Players still in the hand who can win this pot
+
+def build_pots(contributions: Dict[Player, int]) -> List[Pot]:
+    """Split the chips put in this hand into the main pot followed by any side pots."""
+    live = sorted((p for p, amount in contributions.items() if not p.folded and amount > 0),
+                  key=lambda p: contributions[p])
+    pots = []
+    paid = 0  # Level covered by the pots built so far
+    for i, player in enumerate(live):
+        level = contributions[player]
+        if level == paid:
+            continue
+        amount = sum(min(c, level) - min(c, paid) for c in contributions.values())
+        pots.append(Pot(amount, live[i:]))
+        paid = level
+
+    # Folded players who put in more than anyone left in the hand leave dead money in the last pot
+    dead = sum(c - paid for c in contributions.values() if c > paid)
+    if dead:
+        if pots:
+            pots[-1].amount += dead
+        else:
+            pots.append(Pot(dead, [p for p in contributions if not p.folded]))
+    return pots
+
+def award_pots(pots: List[Pot], ranks: Dict[Player, int], order: Sequence[Player]) -> Dict[Player, int]:
+    """Pay every pot to its best hands (lowest treys rank) and return what each winner gets.
+
+    order is the seating from the left of the dealer round to the dealer,
+    which decides who receives the odd chips of a split pot.
+    """
+    seat = {player: i for i, player in enumerate(order)}
+    payouts: Dict[Player, int] = {}
+    for pot in pots:
+        if not pot.eligible:
+            continue
+        best = min(ranks[p] for p in pot.eligible)
+        winners = sorted((p for p in pot.eligible if ranks[p] == best), key=lambda p: seat[p])
+        share, odd = divmod(pot.amount, len(winners))
+        for i, winner in enumerate(winners):
+            payouts[winner] = payouts.get(winner, 0) + share + (1 if i < odd else 0)
+    return payouts
@@ -0,0 +1,130 @@
+from array import array
+from typing import List, Optional
+import argparse
+import os
+import struct
+from card import Card, CARDS
+from equity import estimate_equity
+
+# File layout: header followed by one uint16 per (hand class, opponents) holding equity * 65535
+MAGIC = b'PFEQ'
+HEADER = struct.Struct('<4sHHH')  # magic, version, number of hand classes, max opponents
+VERSION = 1
+NUM_CLASSES = 169
+MAX_OPPONENTS = 9
+SCALE = 65535
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'preflop_equity.bin')
+
+RANK_LETTERS = '23456789TJQKA'
+
+def hand_class(hole_cards: List[Card]) -> int:
+    """Index 0-168 of the canonical starting hand on a 13x13 grid.
+
+    Pairs sit on the diagonal, suited hands put the higher rank first and
+    offsuit hands put the lower rank first.
+    """
+    first, second = hole_cards
+    high, low = max(first >> 2, second >> 2), min(first >> 2, second >> 2)
+    if (first & 3) == (second & 3):
+        return high * 13 + low
+    return low * 13 + high
+
+def class_name(index: int) -> str:
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANK_LETTERS[row] * 2
+    if row > col:
+        return f"{RANK_LETTERS[row]}{RANK_LETTERS[col]}s"
+    return f"{RANK_LETTERS[col]}{RANK_LETTERS[row]}o"
+
+def representative_hand(index: int) -> List[Card]:
+    # Any two cards of the class; suits only matter for suited vs offsuit
+    row, col = divmod(index, 13)
+    if row > col:
+        return [CARDS[row * 4], CARDS[col * 4]]
+    return [CARDS[row * 4], CARDS[col * 4 + 1]]
+
+class PreflopTable:
+    def __init__(self, values: array, max_opponents: int = MAX_OPPONENTS):
+        self.values = values
+        self.max_opponents = max_opponents
+
+    def equity(self, hole_cards: List[Card], num_opponents: int = 1) -> float:
+        num_opponents = min(max(num_opponents, 1), self.max_opponents)
+        return self.values[hand_class(hole_cards) * self.max_opponents + num_opponents - 1] / SCALE
+
+    def save(self, path: str = DEFAULT_PATH):
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, NUM_CLASSES, self.max_opponents))
+            f.write(self.values.tobytes())
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> 'PreflopTable':
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) != HEADER.size:
+                raise ValueError(f"{path} is not a pre-flop equity table!")
+            magic, version, num_classes, max_opponents = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION or num_classes != NUM_CLASSES:
+                raise ValueError(f"{path} is not a pre-flop equity table!")
+            values = array('H')
+            data = f.read()
+        if len(data) != num_classes * max_opponents * values.itemsize:
+            raise ValueError(f"{path} holds {len(data)} bytes of equities, not the {num_classes} x {max_opponents} "
+                             "its header promises!")
+        values.frombytes(data)
+        return cls(values, max_opponents)
+
+def generate_table(samples: int = 2000, max_opponents: int = MAX_OPPONENTS,
+                   workers: Optional[int] = None, seed: int = 0) -> PreflopTable:
+    workers = workers or os.cpu_count() or 1
+    values = array('H', bytes(2 * NUM_CLASSES * max_opponents))
+    for index in range(NUM_CLASSES):
+        hand = representative_hand(index)
+        for opponents in range(1, max_opponents + 1):
+            result = estimate_equity(hand, [], opponents, samples=samples, workers=workers,
+                                     seed=seed + index * max_opponents + opponents)
+            values[index * max_opponents + opponents - 1] = round(result.equity * SCALE)
+    return PreflopTable(values, max_opponents)
+
+_default_table: Optional[PreflopTable] = None
+
+def default_table() -> PreflopTable:
+    """The table at DEFAULT_PATH, generated and saved there the first time it is needed.
+
+    The file is a build output and is not checked in. Generation is seeded,
+    so every checkout builds the same table (about 12 s on one core).
+    """
+    global _default_table
+    if _default_table is None:
+        if os.path.exists(DEFAULT_PATH):
+            _default_table = PreflopTable.load(DEFAULT_PATH)
+        else:
+            _default_table = generate_table(workers=1)
+            temp_path = f"{DEFAULT_PATH}.{os.getpid()}"
+            try:
+                # Written aside and renamed, so a concurrent reader never sees half a file
+                _default_table.save(temp_path)
+                os.replace(temp_path, DEFAULT_PATH)
+            except OSError:
+                pass  # A read-only checkout keeps the table in memory
+    return _default_table
+
+def preflop_equity(hole_cards: List[Card], num_opponents: int = 1) -> Optional[float]:
+    if len(hole_cards) != 2:
+        return None
+    return default_table().equity(hole_cards, num_opponents)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the pre-flop equity table")
+    parser.add_argument('--samples', type=int, default=2000, help="run-outs per hand class and opponent count")
+    parser.add_argument('--workers', type=int, default=None, help="sampling processes (default: all cores)")
+    parser.add_argument('--output', default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    table = generate_table(args.samples, workers=args.workers)
+    table.save(args.output)
+    print(f"Wrote {NUM_CLASSES * table.max_opponents} equities to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""Weighted opponent ranges and equity against them.
+
+A Range holds one weight for each of the 1326 two-card combos, indexed as
+in COMBOS (pairs of card ints in increasing order). RangeTracker keeps a
+range for every seat at a table. It removes the board cards and narrows
+each range on every action in the betting round's log: a combo's weight
+is multiplied by how likely a player holding it was to take that action,
+judged from the combo's strength on the board at the time, in the same
+buckets the heuristic AI uses.
+
+Equity against ranges is exact heads-up on the river, where every live
+combo is ranked once. On earlier streets, and multiway, it is sampled:
+each sample draws one combo from every range by weight, throws away draws
+that share a card, deals the rest of the board, and ranks all the hands
+in one evaluate_batch call; given the board's cached combo strengths, a
+river sample ranks nothing at all. RangeStrategy plays the heuristic AI on
+that equity instead of on the hand's own rank, splitting its samples
+between the players of a multiway pot:
+
+    tracker = RangeTracker(game)
+    for player in game.players:
+        player.strategy = RangeStrategy(tracker)
+"""
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence
+import random
+import numpy as np
+from batch_evaluator import WORST_RANK, evaluate_batch
+from card import Card
+from equity import EquityResult
+from preflop_table import NUM_CLASSES, hand_class, representative_hand
+from strategy import Action, GameSnapshot, HeuristicStrategy, preflop_strength, scale_equity
+
+NUM_COMBOS = 1326
+COMBOS = np.array(list(combinations(range(52), 2)), dtype=np.intp)
+COMBO_MASKS = (np.int64(1) << COMBOS[:, 0]) | (np.int64(1) << COMBOS[:, 1])
+COMBO_INDEX = np.full((52, 52), -1, dtype=np.intp)  # Either card order -> combo index
+COMBO_INDEX[COMBOS[:, 0], COMBOS[:, 1]] = np.arange(NUM_COMBOS)
+COMBO_INDEX[COMBOS[:, 1], COMBOS[:, 0]] = np.arange(NUM_COMBOS)
+
+# Heads-up pre-flop strength of every combo, through its starting hand class
+CLASS_STRENGTHS = np.array([(WORST_RANK - preflop_strength(representative_hand(index))) / WORST_RANK
+                            for index in range(NUM_CLASSES)])
+COMBO_STRENGTHS_PREFLOP = CLASS_STRENGTHS[[hand_class(combo) for combo in COMBOS.tolist()]]
+
+# Chance of each action given a combo's strength bucket (split at STRENGTH_BUCKETS),
+# after HeuristicStrategy; never zero, since not every opponent plays like it
+STRENGTH_BUCKETS = np.array([0.4, 0.6, 0.8])
+ACTION_LIKELIHOODS = {
+    'raise': np.array([0.15, 0.02, 0.4, 0.7]),
+    'call': np.array([0.65, 1.0, 0.6, 0.3]),
+    'check': np.array([0.65, 1.0, 0.6, 0.3]),
+}
+STREET_CARDS = {'pre-flop': 0, 'flop': 3, 'turn': 4, 'river': 5}
+
+_rng = random.Random()  # For decisions made away from a seeded table
+
+def card_mask(cards: Sequence[Card]) -> int:
+    mask = 0
+    for card in cards:
+        mask |= 1 << card
+    return mask
+
+def combo_strengths(board: Sequence[Card]) -> np.ndarray:
+    """0-1 strength of every combo on a board, as the heuristic AI sees it; 0 for combos the board blocks."""
+    if not board:
+        return COMBO_STRENGTHS_PREFLOP
+    known = np.array([int(card) for card in board], dtype=np.intp)
+    live = np.flatnonzero((COMBO_MASKS & card_mask(board)) == 0)
+    strengths = np.zeros(NUM_COMBOS)
+    hands = np.hstack([COMBOS[live], np.broadcast_to(known, (len(live), len(known)))])
+    strengths[live] = (WORST_RANK - evaluate_batch(hands)) / WORST_RANK
+    return strengths
+
+class Range:
+    """Weights of the 1326 combos a player may hold; only their ratios matter."""
+    __slots__ = ('weights',)
+
+    def __init__(self, weights: Optional[np.ndarray] = None):
+        self.weights = np.ones(NUM_COMBOS) if weights is None else np.array(weights, dtype=np.float64)
+
+    @classmethod
+    def of_hand(cls, hole_cards: Sequence[Card]) -> 'Range':
+        weights = np.zeros(NUM_COMBOS)
+        weights[COMBO_INDEX[int(hole_cards[0]), int(hole_cards[1])]] = 1.0
+        return cls(weights)
+
+    def copy(self) -> 'Range':
+        return Range(self.weights)
+
+    def remove_cards(self, cards: Sequence[Card]):
+        """Card removal: drop every combo holding one of cards."""
+        self.weights[(COMBO_MASKS & card_mask(cards)) != 0] = 0.0
+
+    def narrow(self, likelihoods: np.ndarray):
+        """Bayes update on an observation, given its likelihood for every combo."""
+        self.weights *= likelihoods
+        total = self.weights.sum()
+        if total > 0:
+            self.weights /= total  # Keeps repeated updates away from underflow
+
+    def live(self, dead_mask: int) -> np.ndarray:
+        # Weights with the combos holding dead cards zeroed
+        return np.where((COMBO_MASKS & dead_mask) != 0, 0.0, self.weights)
+
+    def __len__(self) -> int:
+        # Combos still possible
+        return int(np.count_nonzero(self.weights))
+
+class RangeTracker:
+    """The range of every seat at one table, kept in step with its betting round's action log.
+
+    Ranges are public: they use the board but nobody's hole cards, which
+    equity queries remove as dead cards instead.
+    """
+    def __init__(self, game):
+        self.game = game
+        self.ranges: List[Range] = []
+        self._hand_number = None
+        self._seen = 0  # Actions already applied
+        self._strengths: Dict[int, np.ndarray] = {}  # Board size -> combo strengths, this hand
+
+    def update(self) -> List[Range]:
+        game, betting = self.game, self.game.betting_round
+        board = game.game_state.community_cards
+        actions = betting.actions
+        if self._hand_number != game.hand_number or self._seen > len(actions):
+            # A new hand, or a restored earlier state of this one: start over from full ranges
+            self.ranges = [Range() for _ in game.players]
+            self._hand_number = game.hand_number
+            self._seen = 0
+            self._strengths = {}
+
+        for street, player, action, _ in actions[self._seen:]:
+            likelihoods = ACTION_LIKELIHOODS.get(action)
+            if likelihoods is None:
+                continue  # Blinds say nothing about the hand and folds leave it
+            strengths = self.board_strengths(board[:STREET_CARDS[street]])
+            self.ranges[player.seat].narrow(likelihoods[np.searchsorted(STRENGTH_BUCKETS, strengths)])
+        self._seen = len(actions)
+        for hand_range in self.ranges:
+            hand_range.remove_cards(board)
+        return self.ranges
+
+    def opponents(self, seat: int) -> List[Range]:
+        """Ranges of the players still in the hand besides the one at seat."""
+        ranges = self.update()
+        return [ranges[other] for other, player in enumerate(self.game.players)
+                if other != seat and not player.folded]
+
+    def board_strengths(self, board: Sequence[Card]) -> np.ndarray:
+        """combo_strengths of this hand's board so far, computed once per street."""
+        strengths = self._strengths.get(len(board))
+        if strengths is None:
+            strengths = self._strengths[len(board)] = combo_strengths(board)
+        return strengths
+
+def range_equity(ranges: Sequence[Range], board: Sequence[Card], samples: int = 1000,
+                 seed: Optional[int] = None, strengths: Optional[np.ndarray] = None) -> EquityResult:
+    """Win/tie/lose chances of the first range against all the others on a board.
+
+    Exact when two ranges meet on a complete board, otherwise estimated
+    from samples matchups and run-outs. On a complete board, strengths may
+    be the board's combo_strengths when the caller has them cached, and
+    then no hand is ranked at all.
+    """
+    if len(ranges) < 2:
+        raise ValueError("Equity needs at least two ranges!")
+    if len(board) > 5:
+        raise ValueError("A board has at most five cards!")
+    dead = card_mask(board)
+    weights = [hand_range.live(dead) for hand_range in ranges]
+    if any(not w.any() for w in weights):
+        raise ValueError("A range has no combos left on this board!")
+    if strengths is not None and len(board) != 5:
+        raise ValueError("Cached strengths only decide hands on a complete board!")
+    if len(ranges) == 2 and len(board) == 5:
+        return _exact_river_equity(weights[0], weights[1], board, strengths)
+    return _sampled_equity(weights, board, samples, np.random.default_rng(seed), strengths)
+
+def hand_vs_range(hole_cards: Sequence[Card], board: Sequence[Card], opponents, samples: int = 1000,
+                  seed: Optional[int] = None, strengths: Optional[np.ndarray] = None) -> EquityResult:
+    """Equity of a hand against one opponent's Range, or a list of them for a multiway pot."""
+    if len(hole_cards) != 2:
+        raise ValueError("Equity needs exactly two hole cards!")
+    if isinstance(opponents, Range):
+        opponents = [opponents]
+    return range_equity([Range.of_hand(hole_cards), *opponents], board, samples, seed, strengths)
+
+def range_vs_range(hero: Range, villain: Range, board: Sequence[Card], samples: int = 1000,
+                   seed: Optional[int] = None) -> EquityResult:
+    return range_equity([hero, villain], board, samples, seed)
+
+def _exact_river_equity(hero: np.ndarray, villain: np.ndarray, board: Sequence[Card],
+                        strengths: Optional[np.ndarray] = None) -> EquityResult:
+    # Villain weight below, level with and above each hero combo from prefix sums over
+    # the villain combos sorted by rank, minus the combos sharing one of the hero's cards
+    hero_combos, villain_combos = np.flatnonzero(hero), np.flatnonzero(villain)
+    if strengths is not None:
+        ranks = -strengths  # Same order and ties as the treys ranks: lower is better
+    else:
+        live = np.union1d(hero_combos, villain_combos)
+        known = np.array([int(card) for card in board], dtype=np.intp)
+        ranks = np.zeros(NUM_COMBOS, dtype=np.int64)
+        ranks[live] = evaluate_batch(np.hstack([COMBOS[live], np.broadcast_to(known, (len(live), 5))]))
+
+    order = villain_combos[np.argsort(ranks[villain_combos], kind='stable')]
+    sorted_ranks = ranks[order]
+    holds_card = np.zeros((52, len(order)))
+    holds_card[COMBOS[order, 0], np.arange(len(order))] = villain[order]
+    holds_card[COMBOS[order, 1], np.arange(len(order))] = villain[order]
+    cumulative = np.zeros((53, len(order) + 1))
+    cumulative[:52, 1:] = holds_card.cumsum(axis=1)
+    cumulative[52, 1:] = villain[order].cumsum()  # Row 52: every villain combo
+
+    hero_ranks = ranks[hero_combos]
+    first_level = np.searchsorted(sorted_ranks, hero_ranks, side='left')
+    after_level = np.searchsorted(sorted_ranks, hero_ranks, side='right')
+    rows = np.stack([np.full(len(hero_combos), 52), COMBOS[hero_combos, 0], COMBOS[hero_combos, 1]])
+    signs = np.array([1.0, -1.0, -1.0])[:, None]  # All villain combos, less those holding either hero card
+    better = (signs * cumulative[rows, first_level]).sum(axis=0)  # Lower ranks are better in treys
+    up_to_level = (signs * cumulative[rows, after_level]).sum(axis=0)
+    everything = (signs * cumulative[rows, len(order)]).sum(axis=0)
+    same_combo = villain[hero_combos]  # Held both hero cards, so taken away twice above
+    level = up_to_level - better + same_combo
+    worse = everything - up_to_level
+
+    hero_weights = hero[hero_combos]
+    total = hero_weights @ (everything + same_combo)
+    if total <= 1e-12:
+        raise ValueError("The ranges have no combos that can meet!")
+    wins, ties = hero_weights @ worse / total, hero_weights @ level / total
+    return EquityResult(wins, ties, 1.0 - wins - ties, int(np.count_nonzero(hero_weights)))
+
+def _sampled_equity(weights: List[np.ndarray], board: Sequence[Card], samples: int,
+                    rng: np.random.Generator, strengths: Optional[np.ndarray] = None) -> EquityResult:
+    known = np.array([int(card) for card in board], dtype=np.intp)
+    cumulative = [np.cumsum(w) for w in weights]
+
+    # Draw one combo per range and sample by inverting the cumulative weights, keeping
+    # the draws where no two combos share a card; multiway pots lose more draws to that
+    batch_size = samples if len(weights) == 2 else 2 * samples
+    drawn = np.empty((0, len(weights)), dtype=np.intp)
+    for _ in range(10):
+        batch = np.stack([np.searchsorted(c, rng.random(batch_size) * c[-1], side='right') for c in cumulative],
+                         axis=1)
+        held = np.zeros(batch_size, dtype=np.int64)
+        valid = np.ones(batch_size, dtype=bool)
+        for masks in COMBO_MASKS[batch].T:
+            valid &= (held & masks) == 0
+            held |= masks
+        drawn = np.concatenate([drawn, batch[valid]])[:samples]
+        if len(drawn) >= samples:
+            break
+    if not len(drawn):
+        raise ValueError("The ranges have no combos that can meet!")
+    count = len(drawn)
+    if strengths is not None:
+        ranks = -strengths[drawn.T]  # Complete board: every combo was ranked once already
+    else:
+        ranks = _sampled_ranks(drawn, known, rng)
+    best_opponent = ranks[1:].min(axis=0)
+    wins = int((ranks[0] < best_opponent).sum())
+    ties = int((ranks[0] == best_opponent).sum())
+    return EquityResult(wins / count, ties / count, (count - wins - ties) / count, count)
+
+def _sampled_ranks(drawn: np.ndarray, known: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    count, players = drawn.shape
+    board_needed = 5 - len(known)
+
+    # The rest of the board from the cards nobody holds: the smallest random keys among them
+    hole_cards = COMBOS[drawn].reshape(count, -1)
+    keys = rng.random((count, 52))
+    keys[:, known] = 2.0
+    np.put_along_axis(keys, hole_cards, 2.0, axis=1)
+    runouts = keys.argpartition(board_needed, axis=1)[:, :board_needed] if board_needed else hole_cards[:, :0]
+    full_boards = np.hstack([np.broadcast_to(known, (count, len(known))), runouts])
+
+    hands = np.concatenate([np.hstack([COMBOS[drawn[:, i]], full_boards]) for i in range(players)])
+    return evaluate_batch(hands).reshape(players, count)
+
+class RangeStrategy(HeuristicStrategy):
+    """The heuristic AI deciding on sampled equity against the tracked opponent ranges."""
+    def __init__(self, tracker: RangeTracker, samples: int = 500):
+        super().__init__()
+        self.tracker = tracker
+        self.samples = samples
+
+    def decide(self, snapshot: GameSnapshot, rng: Optional[random.Random] = None) -> Action:
+        rng = rng or _rng
+        if snapshot.seat is None or len(snapshot.hand) != 2:
+            return super().decide(snapshot, rng)
+        opponents = self.tracker.opponents(snapshot.seat)
+        dead = card_mask(snapshot.hand) | card_mask(snapshot.board)
+        if not opponents or any(not hand_range.live(dead).any() for hand_range in opponents):
+            return super().decide(snapshot, rng)  # Nobody's range fits what we can see
+        # A sample ranks one hand per player, so multiway pots share out what heads-up would spend;
+        # on the river every combo's rank is the board's cached strength and nothing is ranked
+        samples = 2 * self.samples // (1 + len(opponents))
+        strengths = self.tracker.board_strengths(snapshot.board) if len(snapshot.board) == 5 else None
+        result = hand_vs_range(snapshot.hand, snapshot.board, opponents, samples, rng.getrandbits(64), strengths)
+        return self._act(snapshot, scale_equity(result.equity, len(opponents)), rng)
@@ -0,0 +1,28 @@
+"""Seeded random streams for reproducible simulations.
+
+Every stream is keyed by a master seed plus a path such as (table, hand)
+and seeded through SplitMix64, so streams never depend on how many other
+streams were created or in which process. A hand can therefore be dealt
+and played again from (seed, table, hand) alone, and a simulation spread
+over any number of workers gives the same results as a single process.
+"""
+import random
+
+MASK64 = (1 << 64) - 1
+
+def splitmix64(x: int) -> int:
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+def derive_seed(seed: int, *path: int) -> int:
+    """64-bit seed of the stream at path below seed, e.g. derive_seed(seed, table, hand)."""
+    x = splitmix64(seed & MASK64)
+    for key in path:
+        x = splitmix64(x ^ (key & MASK64))
+    return x
+
+def stream(seed: int, *path: int) -> random.Random:
+    # Mersenne Twister state seeded from the derived 64-bit seed
+    return random.Random(derive_seed(seed, *path))
@@ -0,0 +1,113 @@
+"""Per-seat table state held in parallel typed arrays.
+
+A table keeps every seat's stack, current bet, chips put in this hand,
+folded/all-in flags and hole cards in one SeatArrays, indexed by seat,
+and each Player is a small view reading and writing its own slot. A
+six-seat table's state is a handful of arrays of a few dozen bytes each
+instead of a dict per player and a list per hand, which is what lets one
+process hold a hundred thousand tables at once. The per-action hot paths
+(betting, snapshots for the AI) skip the views and index the arrays by
+seat; the views are for everything else.
+
+A player created on its own gets a private one-seat SeatArrays; seating
+it at a table (bind()) copies its values into the table's arrays and
+points the view there.
+"""
+from array import array
+from typing import Iterable, Iterator, List, Tuple
+from card import CARDS, Card
+
+MAX_HOLE_CARDS = 2
+NO_CARD = 0xFF
+
+# Bits of SeatArrays.flags
+FOLDED = 1
+ALL_IN = 2
+
+class SeatArrays:
+    __slots__ = ('chips', 'bets', 'contributions', 'flags', 'holes', 'hole_counts')
+
+    def __init__(self, num_seats: int):
+        self.chips = array('q', bytes(8 * num_seats))
+        self.bets = array('q', bytes(8 * num_seats))  # Bet of the current street
+        self.contributions = array('q', bytes(8 * num_seats))  # Chips put in this hand, for side pots
+        self.flags = bytearray(num_seats)
+        self.holes = bytearray(b'\xff' * (MAX_HOLE_CARDS * num_seats))  # Card ints, NO_CARD when empty
+        self.hole_counts = bytearray(num_seats)
+
+    def __len__(self) -> int:
+        return len(self.flags)
+
+    def clear_contributions(self):
+        self.contributions[:] = array('q', bytes(8 * len(self.flags)))
+
+    def new_hand(self):
+        """Clear every seat's bet, flags and hole cards, folding busted seats out of the hand."""
+        num_seats = len(self.flags)
+        self.bets[:] = array('q', bytes(8 * num_seats))
+        self.flags[:] = bytes(FOLDED if chips <= 0 else 0 for chips in self.chips)
+        self.holes[:] = b'\xff' * (MAX_HOLE_CARDS * num_seats)
+        self.hole_counts[:] = bytes(num_seats)
+
+class HandView:
+    """A seat's hole cards, behaving like the list of Cards Player.hand used to be."""
+    __slots__ = ('seats', 'seat')
+
+    def __init__(self, seats: SeatArrays, seat: int):
+        self.seats = seats
+        self.seat = seat
+
+    def __len__(self) -> int:
+        return self.seats.hole_counts[self.seat]
+
+    def __iter__(self) -> Iterator[Card]:
+        base = self.seat * MAX_HOLE_CARDS
+        return map(CARDS.__getitem__, self.seats.holes[base:base + self.seats.hole_counts[self.seat]])
+
+    def cards(self) -> Tuple[Card, ...]:
+        """The hole cards as a tuple, the cheap way for a full two-card hand."""
+        seat = self.seat
+        if self.seats.hole_counts[seat] == 2:
+            holes = self.seats.holes
+            base = seat * MAX_HOLE_CARDS
+            return CARDS[holes[base]], CARDS[holes[base + 1]]
+        return tuple(self)
+
+    def __getitem__(self, index):
+        if not isinstance(index, int):
+            return list(self)[index]
+        count = self.seats.hole_counts[self.seat]
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("hole card index out of range")
+        return CARDS[self.seats.holes[self.seat * MAX_HOLE_CARDS + index]]
+
+    def __eq__(self, other) -> bool:
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __add__(self, other: Iterable[Card]) -> List[Card]:
+        return list(self) + list(other)
+
+    def append(self, card: Card):
+        count = self.seats.hole_counts[self.seat]
+        if count >= MAX_HOLE_CARDS:
+            raise ValueError(f"A seat holds at most {MAX_HOLE_CARDS} hole cards!")
+        self.seats.holes[self.seat * MAX_HOLE_CARDS + count] = card
+        self.seats.hole_counts[self.seat] = count + 1
+
+    def clear(self):
+        base = self.seat * MAX_HOLE_CARDS
+        self.seats.holes[base:base + MAX_HOLE_CARDS] = b'\xff' * MAX_HOLE_CARDS
+        self.seats.hole_counts[self.seat] = 0
+
+    def set(self, cards: Iterable[Card]):
+        self.clear()
+        for card in cards:
+            self.append(card)
@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+from abstraction import AbstractionTables
+from game import TexasHoldem
+from hand_history import HandHistoryWriter, HandRecord, record_from_game
+from player import Player
+from strategy import HeuristicStrategy
+
+@dataclass
+class HandResult:
+    hand_number: int
+    dealer: str
+    board: List[str]
+    winners: List[str]
+    pot: int
+    chip_changes: Dict[str, int]  # Net chips won or lost by each player this hand
+
+def simulate(num_hands: int, seed: Optional[int] = None, num_players: int = 4,
+             starting_chips: int = 1000, history_path: Optional[str] = None,
+             abstraction: Optional[AbstractionTables] = None) -> List[HandResult]:
+    """Play num_hands complete hands between AI players without any console I/O.
+
+    Every hand starts from fresh stacks of starting_chips, so results are
+    independent of each other and the dealer button simply rotates. With a
+    seed each hand is drawn from its own (seed, hand) stream and can be
+    played again alone with replay_hand. With history_path every hand is
+    also appended to that binary hand history. With abstraction (e.g.
+    abstraction.TABLES once generated) the AI reads post-flop strength from
+    those tables instead of evaluating hands.
+    """
+    if num_players < 2:
+        raise ValueError("A hand needs at least two players!")
+
+    game = _table(num_players, seed, abstraction)
+    history = HandHistoryWriter(history_path) if history_path else None
+    results = []
+
+    for hand_number in range(num_hands):
+        winners = _play_hand(game, hand_number, starting_chips)
+        if history is not None:
+            history.write(record_from_game(game, hand_number, [starting_chips] * num_players, winners))
+        results.append(_hand_result(game, hand_number, winners, starting_chips))
+
+    if history is not None:
+        history.close()
+    return results
+
+def iter_records(num_hands: int, seed: Optional[int] = None, num_players: int = 4,
+                 starting_chips: int = 1000, abstraction: Optional[AbstractionTables] = None) -> Iterator[HandRecord]:
+    """The hands simulate would play, generated one hand record at a time."""
+    game = _table(num_players, seed, abstraction)
+    for hand_number in range(num_hands):
+        winners = _play_hand(game, hand_number, starting_chips)
+        yield record_from_game(game, hand_number, [starting_chips] * num_players, winners)
+
+def replay_hand(seed: int, hand_number: int, num_players: int = 4, starting_chips: int = 1000,
+                abstraction: Optional[AbstractionTables] = None) -> HandResult:
+    """Play hand hand_number of simulate(..., seed=seed) again, without the hands before it."""
+    game = _table(num_players, seed, abstraction)
+    winners = _play_hand(game, hand_number, starting_chips)
+    return _hand_result(game, hand_number, winners, starting_chips)
+
+def _table(num_players: int, seed: Optional[int], abstraction: Optional[AbstractionTables]) -> TexasHoldem:
+    game = TexasHoldem(num_ai_players=num_players, headless=True, seed=seed)
+    if abstraction is not None:
+        strategy = HeuristicStrategy(abstraction=abstraction)
+        for player in game.players:
+            player.strategy = strategy
+    return game
+
+def _play_hand(game: TexasHoldem, hand_number: int, starting_chips: int) -> List[Player]:
+    # Fresh stacks, and the button where it is after hand_number rotations
+    for player in game.players:
+        player.chips = starting_chips
+    game.hand_number = hand_number
+    game.dealer_pos = hand_number % len(game.players)
+    return game._play_round()
+
+def _hand_result(game: TexasHoldem, hand_number: int, winners: List[Player], starting_chips: int) -> HandResult:
+    return HandResult(
+        hand_number=hand_number,
+        dealer=game.players[game.dealer_pos].name,
+        board=[str(card) for card in game.game_state.community_cards],
+        winners=[winner.name for winner in winners],
+        pot=game.betting_round.pot,
+        chip_changes={p.name: p.chips - starting_chips for p in game.players},
+    )
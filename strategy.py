@@ -0,0 +1,197 @@
+"""How AI players choose their actions.
+
+A strategy sees the table only through an immutable GameSnapshot of the
+deciding player's situation and answers with an (action, amount) pair in
+the betting round's terms: 'fold', 'call' (which checks when nothing is
+owed) or 'raise' with the total bet to raise to. Strategies that can
+score many situations at once override decide_batch, which the batch
+runner feeds with one pending decision from each of many tables.
+"""
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+import random
+import numpy as np
+from card import CARDS, Card, CARD_VALUES
+from batch_evaluator import WORST_RANK, evaluate_batch
+from equity import EquityResult, cached_rank, estimate_equity, exact_river_equity
+from preflop_table import preflop_equity
+from seats import MAX_HOLE_CARDS, SeatArrays
+
+Action = Tuple[str, int]
+
+_rng = random.Random()  # For decisions made away from a seeded table
+
+class GameSnapshot(NamedTuple):
+    # A tuple rather than a frozen dataclass: one is built for every decision
+    hand: Tuple[Card, ...]
+    board: Tuple[Card, ...]
+    to_call: int  # Chips needed to stay in
+    pot: int
+    chips: int  # Deciding player's stack behind
+    bet: int  # Chips the player already has in this street
+    num_opponents: int  # Players still in the hand besides this one
+    seat: Optional[int] = None  # Deciding player's seat, when taken at a table
+
+    @property
+    def street(self) -> str:
+        return {0: 'pre-flop', 3: 'flop', 4: 'turn'}.get(len(self.board), 'river')
+
+def take_snapshot(player, to_call: int, pot: int, community_cards: Optional[List[Card]] = None) -> GameSnapshot:
+    return GameSnapshot(
+        hand=player.hand.cards(),
+        board=tuple(community_cards or ()),
+        to_call=to_call,
+        pot=pot,
+        chips=player.chips,
+        bet=player.current_bet,
+        num_opponents=player.num_opponents,
+        seat=player.seat,
+    )
+
+def seat_snapshot(seats: SeatArrays, seat: int, to_call: int, pot: int, community_cards: Optional[List[Card]],
+                  num_opponents: int) -> GameSnapshot:
+    """take_snapshot for the hot path: reads the table's arrays by seat instead of going through the Player view."""
+    holes, base = seats.holes, seat * MAX_HOLE_CARDS
+    if seats.hole_counts[seat] == 2:
+        hand = CARDS[holes[base]], CARDS[holes[base + 1]]
+    else:
+        hand = tuple(CARDS[card] for card in holes[base:base + seats.hole_counts[seat]])
+    return GameSnapshot(hand, tuple(community_cards or ()), to_call, pot, seats.chips[seat], seats.bets[seat],
+                        num_opponents, seat)
+
+class Strategy:
+    """Any randomness in a decision must come from rng, the acting table's stream."""
+    def decide(self, snapshot: GameSnapshot, rng: Optional[random.Random] = None) -> Action:
+        raise NotImplementedError
+
+    def decide_batch(self, snapshots: Sequence[GameSnapshot],
+                     rngs: Optional[Sequence[random.Random]] = None) -> List[Action]:
+        # Strategies that can vectorize override this; the default decides one at a time
+        rngs = rngs or [None] * len(snapshots)
+        return [self.decide(snapshot, rng) for snapshot, rng in zip(snapshots, rngs)]
+
+def scale_equity(equity: float, num_opponents: int) -> float:
+    # Scale so an average hand (a 1 / (opponents + 1) share) lands at 0.5 like the rank heuristic
+    return min(1.0, equity * (num_opponents + 1) / 2)
+
+def preflop_strength(hand: Sequence[Card], num_opponents: int = 1) -> int:
+    """Treys-style rank (1 best, 7462 worst) standing in for a pre-flop hand's strength."""
+    if len(hand) < 2:  # Not enough cards yet
+        return 5000
+
+    # Look the hand's class up in the precomputed equity table
+    equity = preflop_equity(hand, num_opponents)
+    if equity is not None:
+        return round(WORST_RANK * (1 - scale_equity(equity, num_opponents)))
+
+    ranks = [CARD_VALUES[card] for card in hand]
+    if ranks[0] == ranks[1]:  # Pocket pair
+        return 2000
+    elif all(rank > 10 for rank in ranks):  # Both high cards
+        return 3000
+    elif any(rank > 10 for rank in ranks):  # One high card
+        return 4000
+    else:
+        return 5000
+
+class HeuristicStrategy(Strategy):
+    """The original AI: bucket the hand's strength and raise, call or fold with some randomness.
+
+    With equity_time_budget the strength comes from sampling equity for up
+    to that many seconds per decision instead of the hand's rank, looked
+    up first in equity_cache (an equity_cache.EquityCache) when given.
+    Otherwise post-flop strength is looked up in abstraction (an
+    abstraction.AbstractionTables) where it has rows for the street.
+    """
+    def __init__(self, equity_time_budget: Optional[float] = None, equity_cache=None, abstraction=None):
+        self.equity_time_budget = equity_time_budget
+        self.equity_cache = equity_cache
+        self.abstraction = abstraction
+
+    def decide(self, snapshot: GameSnapshot, rng: Optional[random.Random] = None) -> Action:
+        return self._act(snapshot, self._strength(snapshot), rng or _rng)
+
+    def decide_batch(self, snapshots: Sequence[GameSnapshot],
+                     rngs: Optional[Sequence[random.Random]] = None) -> List[Action]:
+        if self.equity_time_budget is not None:
+            return super().decide_batch(snapshots, rngs)
+
+        # Rank all post-flop hands with one vectorized call per number of cards
+        strengths = [0.0] * len(snapshots)
+        by_size = {}
+        for i, snapshot in enumerate(snapshots):
+            strength = self._table_strength(snapshot)
+            if strength is not None:
+                strengths[i] = strength
+            elif snapshot.board:
+                by_size.setdefault(len(snapshot.hand) + len(snapshot.board), []).append(i)
+            else:
+                strengths[i] = (WORST_RANK - preflop_strength(snapshot.hand, snapshot.num_opponents)) / WORST_RANK
+        for indices in by_size.values():
+            cards = np.array([snapshots[i].hand + snapshots[i].board for i in indices], dtype=np.intp)
+            for i, rank in zip(indices, evaluate_batch(cards).tolist()):
+                strengths[i] = (WORST_RANK - rank) / WORST_RANK
+        rngs = rngs or [_rng] * len(snapshots)
+        return [self._act(snapshot, strength, rng or _rng) for snapshot, strength, rng in zip(snapshots, strengths, rngs)]
+
+    def _strength(self, snapshot: GameSnapshot) -> float:
+        if self.equity_time_budget is not None and len(snapshot.hand) == 2:
+            if self.equity_cache is None:
+                result = self._equity(snapshot)
+            else:
+                result = self.equity_cache.equity(snapshot.hand, snapshot.board, snapshot.num_opponents,
+                                                  lambda: self._equity(snapshot))
+            return scale_equity(result.equity, snapshot.num_opponents)
+        if self.abstraction is not None and snapshot.board:
+            strength = self.abstraction.strength(snapshot.hand, snapshot.board, snapshot.num_opponents)
+            if strength is not None:
+                return strength
+
+        # Convert hand strength to a 0-1 scale (7462 is the worst hand, 1 is the best in treys)
+        if snapshot.board:
+            rank = cached_rank(snapshot.hand + snapshot.board)
+        else:
+            rank = preflop_strength(snapshot.hand, snapshot.num_opponents)
+        return (WORST_RANK - rank) / WORST_RANK
+
+    def _table_strength(self, snapshot: GameSnapshot) -> Optional[float]:
+        if self.abstraction is None or not snapshot.board:
+            return None
+        return self.abstraction.strength(snapshot.hand, snapshot.board, snapshot.num_opponents)
+
+    def _equity(self, snapshot: GameSnapshot) -> EquityResult:
+        if snapshot.num_opponents == 1 and len(snapshot.board) == 5:
+            # Heads-up on the river the exact answer is cheaper than sampling
+            return exact_river_equity(snapshot.hand, snapshot.board)
+        return estimate_equity(snapshot.hand, list(snapshot.board), snapshot.num_opponents,
+                               time_budget=self.equity_time_budget, workers=1, batch_size=100)
+
+    def _act(self, snapshot: GameSnapshot, normalized_strength: float, rng: random.Random) -> Action:
+        to_call, chips = snapshot.to_call, snapshot.chips
+
+        # If the call amount is too high relative to our chips, be more cautious
+        if to_call > chips // 3:
+            normalized_strength *= 0.7
+
+        if normalized_strength > 0.8:  # Very strong hand
+            if rng.random() < 0.7:  # More likely to raise with strong hand
+                raise_amount = to_call * 3
+                return 'raise', min(raise_amount, chips)
+            return 'call', to_call
+        elif normalized_strength > 0.6:  # Strong hand
+            if rng.random() < 0.4:
+                raise_amount = to_call * 2
+                return 'raise', min(raise_amount, chips)
+            return 'call', to_call
+        elif normalized_strength > 0.4:  # Medium hand
+            if to_call > chips // 3:
+                return 'fold', 0
+            return 'call', to_call
+        else:  # Weak hand
+            if to_call > chips // 5:
+                return 'fold', 0
+            if rng.random() < 0.2:  # Sometimes bluff
+                raise_amount = to_call * 2
+                return 'raise', min(raise_amount, chips)
+            return 'call', to_call
+
+DEFAULT_STRATEGY = HeuristicStrategy()  # Stateless, so every player without its own strategy shares it
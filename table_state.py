@@ -0,0 +1,125 @@
+"""Flat copies of a table's mid-hand state for branching and what-if search.
+
+capture() packs everything that changes during a hand (stacks, bets,
+fold and all-in flags, hole cards, the board, the deck order and the
+betting round's counters and seat ring) into one array of 160 ints, 640
+bytes, and
+restore() writes it back into the same table in place. A search can
+capture once at a decision, then restore and play_out() every branch it
+explores.
+
+The action log is restored by truncating it to its captured length, so a
+state can only be restored within the hand it was captured in. Random
+streams are not part of the state: branches draw fresh cards and AI
+choices unless the caller reseeds the table's rng.
+"""
+from array import array
+from typing import Callable, List, Optional, Tuple
+from betting import StreetState
+from card import CARDS
+from game import STREETS, TexasHoldem
+from player import Player
+
+MAX_SEATS = 10
+NO_CARD = -1
+
+# Header fields
+POT, CURRENT_BET, STREET, PENDING, LIVE, RING_SIZE, CURSOR, DEALER, DECK_REMAINING, \
+    BOARD_SIZE, NUM_SEATS, HAND_NUMBER, NUM_ACTIONS = range(13)
+HEADER_SIZE = 13
+
+# Fields of each seat
+CHIPS, BET, CONTRIBUTION, FLAGS, HOLE_0, HOLE_1, RING_NEXT, RING_PREV, IN_RING = range(9)
+SEAT_SIZE = 9
+
+SEATS_OFFSET = HEADER_SIZE
+BOARD_OFFSET = SEATS_OFFSET + MAX_SEATS * SEAT_SIZE
+DECK_OFFSET = BOARD_OFFSET + 5
+STATE_SIZE = DECK_OFFSET + 52
+
+STREET_NAMES = [round_name for round_name, _ in STREETS]
+
+def capture(game: TexasHoldem) -> array:
+    """Copy of the table's current hand state as a flat array('i')."""
+    betting = game.betting_round
+    players = game.players
+    if len(players) > MAX_SEATS:
+        raise ValueError(f"Table states hold at most {MAX_SEATS} seats!")
+    board = game.game_state.community_cards
+    street = betting.street_state
+    ring = len(street.next) == len(players)
+
+    values = [
+        betting.pot, betting.current_bet, STREET_NAMES.index(betting.street), street.pending,
+        street.live, street.ring_size, street.cursor, game.dealer_pos, game.deck._remaining,
+        len(board), len(players), game.hand_number, len(betting.actions),
+    ]
+    seats = betting.seats
+    for seat, player in enumerate(players):
+        hand = player.hand
+        values += (
+            seats.chips[seat], seats.bets[seat], seats.contributions[seat], seats.flags[seat],
+            hand[0] if hand else NO_CARD, hand[1] if len(hand) > 1 else NO_CARD,
+            street.next[seat] if ring else 0, street.prev[seat] if ring else 0,
+            street.in_ring[seat] if ring else 0,
+        )
+    values += [0] * (SEAT_SIZE * (MAX_SEATS - len(players)))
+    values += board
+    values += [NO_CARD] * (5 - len(board))
+    values += game.deck._order
+    values += [NO_CARD] * (52 - len(game.deck._order))
+    return array('i', values)
+
+def restore(game: TexasHoldem, state: array):
+    """Put the table back into a state captured earlier in the same hand."""
+    betting = game.betting_round
+    players = game.players
+    num_seats = state[NUM_SEATS]
+    if num_seats != len(players):
+        raise ValueError("The table state was captured with a different number of seats!")
+
+    betting.pot = state[POT]
+    betting.current_bet = state[CURRENT_BET]
+    betting.street = STREET_NAMES[state[STREET]]
+    game.dealer_pos = state[DEALER]
+    game.hand_number = state[HAND_NUMBER]
+    del betting.actions[state[NUM_ACTIONS]:]
+
+    fields = state[SEATS_OFFSET:SEATS_OFFSET + num_seats * SEAT_SIZE]
+    betting.street_state = StreetState(state[PENDING], state[LIVE], state[RING_SIZE], state[CURSOR],
+                                       list(fields[RING_NEXT::SEAT_SIZE]), list(fields[RING_PREV::SEAT_SIZE]),
+                                       [bool(flag) for flag in fields[IN_RING::SEAT_SIZE]])
+    seats = betting.seats
+    seats.chips[:] = array('q', fields[CHIPS::SEAT_SIZE])
+    seats.bets[:] = array('q', fields[BET::SEAT_SIZE])
+    seats.contributions[:] = array('q', fields[CONTRIBUTION::SEAT_SIZE])
+    seats.flags[:] = bytes(fields[FLAGS::SEAT_SIZE].tolist())
+    for seat, player in enumerate(players):
+        base = seat * SEAT_SIZE
+        player.hand = [CARDS[card] for card in fields[base + HOLE_0:base + HOLE_1 + 1] if card != NO_CARD]
+
+    game.game_state.community_cards = [CARDS[card] for card in state[BOARD_OFFSET:BOARD_OFFSET + state[BOARD_SIZE]]]
+    deck = game.deck
+    deck._order[:] = array('B', (card for card in state[DECK_OFFSET:DECK_OFFSET + 52] if card != NO_CARD))
+    deck._remaining = state[DECK_REMAINING]
+
+def play_out(game: TexasHoldem, decide: Optional[Callable[[Player], Tuple[str, int]]] = None) -> List[Player]:
+    """Finish the hand from the decision the table is at, e.g. right after restore().
+
+    decide gives each acting player's (action, amount); by default the
+    players' own AI decides. Returns the winners, as hand_steps does.
+    """
+    betting = game.betting_round
+    if decide is None:
+        def decide(player: Player) -> Tuple[str, int]:
+            return player.ai_make_decision(betting.current_bet - player.current_bet, betting.pot,
+                                           game.game_state.community_cards)
+
+    steps = game.street_steps(resume=True)
+    decision = None
+    while True:
+        try:
+            player = steps.send(decision)
+        except StopIteration as done:
+            return done.value
+        decision = decide(player)
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+from card import Card
+from abstraction import (TEXTURE_FLUSH, TEXTURE_FLUSH_DRAW, TEXTURE_HIGH, TEXTURE_PAIRED, TEXTURE_STRAIGHT,
+                         TEXTURE_STRAIGHT_DRAW, AbstractionTables, board_classes, board_key, board_texture,
+                         generate_tables, street_rows)
+from ranges import COMBO_INDEX
+from simulator import replay_hand, simulate
+from strategy import GameSnapshot, HeuristicStrategy
+
+class TestAbstraction(unittest.TestCase):
+    def test_board_classes(self):
+        """Test the number of flop and turn classes, and that suit relabelings share a class"""
+        self.assertEqual(len(board_classes(3)), 1755)
+        self.assertEqual(len(board_classes(4)), 16432)
+        flop = [Card('♠', 'A'), Card('♠', 'K'), Card('♥', '2')]
+        relabeled = [Card('♦', '2'), Card('♣', 'K'), Card('♣', 'A')]
+        self.assertEqual(board_key(flop)[0], board_key(relabeled)[0])
+        self.assertEqual(board_texture(flop), TEXTURE_FLUSH_DRAW | TEXTURE_STRAIGHT_DRAW | TEXTURE_HIGH)
+        river = flop + [Card('♠', 'Q'), Card('♦', 'K')]
+        self.assertEqual(board_texture(river), TEXTURE_PAIRED | TEXTURE_FLUSH | TEXTURE_STRAIGHT | TEXTURE_HIGH)
+
+    def test_flush_draw_has_potential(self):
+        """Test that a flush draw's potential exceeds its strength, and the reverse for a weak made hand"""
+        board = [Card('♠', 'A'), Card('♠', '7'), Card('♥', '2')]
+        strength, potential = street_rows(board)
+        draw = COMBO_INDEX[Card('♠', '9'), Card('♠', '8')]
+        pair = COMBO_INDEX[Card('♦', '2'), Card('♣', '3')]
+        self.assertGreater(potential[draw], strength[draw] + 0.1)
+        self.assertLess(potential[pair], strength[pair])
+
+    def test_tables_round_trip_and_drive_the_ai(self):
+        """Test that saved flop tables load memory-mapped, match live strengths and drive simulated hands"""
+        tables = generate_tables(streets=(3,), row_streets=(3,), next_cards=1, workers=1)
+        board = [Card('♠', 'J'), Card('♠', '10'), Card('♥', '2')]
+        hole = [Card('♠', 'A'), Card('♠', 'K')]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'abstraction.bin')
+            tables.save(path)
+            loaded = AbstractionTables.load(path)
+            situation = loaded.lookup(hole, board)
+            same = loaded.lookup([Card('♣', 'K'), Card('♣', 'A')], [Card('♦', '2'), Card('♣', 'J'), Card('♣', '10')])
+            self.assertEqual(situation, same)
+            strength, _ = street_rows(board)
+            self.assertAlmostEqual(situation.strength, strength[COMBO_INDEX[hole[0], hole[1]]], delta=1 / 255)
+            self.assertIsNone(loaded.lookup(hole, board + [Card('♦', '3')]))
+
+            strategy = HeuristicStrategy(abstraction=loaded)
+            snapshot = GameSnapshot(tuple(hole), tuple(board), to_call=20, pot=60, chips=1000, bet=0, num_opponents=1)
+            self.assertEqual(strategy._strength(snapshot), loaded.strength(hole, board))
+            self.assertIn(strategy.decide(snapshot)[0], ('raise', 'call'))
+
+            results = simulate(20, seed=4, num_players=3, abstraction=loaded)
+            self.assertEqual(replay_hand(4, 17, num_players=3, abstraction=loaded), results[17])
+            self.assertTrue(all(sum(result.chip_changes.values()) == 0 for result in results))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+from analytics import HandAnalytics, analyze_file
+from hand_history import HandAction, HandRecord
+from simulator import iter_records, simulate
+
+class TestAnalytics(unittest.TestCase):
+    def test_counts_from_one_hand(self):
+        """Test VPIP, PFR, aggression and showdown counts on a known hand"""
+        record = HandRecord(
+            hand_id=0, dealer=0, small_blind=10, big_blind=20,
+            board=[0, 13, 26, 39, 51], holes=[(1, 2), (3, 4), (5, 6)],
+            player_ids=[0, 1, 2], start_stacks=[1000, 1000, 1000], end_stacks=[1000, 1080, 920],
+            pot=160, winners=[1], showdown=True,
+            actions=[
+                HandAction('pre-flop', 1, 'small_blind', 10),
+                HandAction('pre-flop', 2, 'big_blind', 20),
+                HandAction('pre-flop', 0, 'fold', 0),
+                HandAction('pre-flop', 1, 'raise', 50),
+                HandAction('pre-flop', 2, 'call', 40),
+                HandAction('flop', 1, 'raise', 20),
+                HandAction('flop', 2, 'call', 20),
+            ],
+        )
+        reports = HandAnalytics().consume([record]).report()
+        
+        self.assertEqual((reports[0].vpip, reports[1].pfr, reports[2].vpip, reports[2].pfr), (0, 1, 1, 0))
+        self.assertEqual((reports[1].aggression, reports[2].aggression), (float('inf'), 0))
+        self.assertEqual(reports[0].aggression, 0)  # Neither raised nor called
+        self.assertEqual((reports[1].showdown_win_rate, reports[2].showdown_win_rate), (1, 0))
+        self.assertEqual(reports[1].bb_per_100, 400)
+        
+    def test_parallel_file_matches_live_stream(self):
+        """Test that map-reduce over a saved history equals streaming the same hands live"""
+        live = HandAnalytics().consume(iter_records(300, seed=9, num_players=4))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'hands.bin')
+            simulate(300, seed=9, num_players=4, history_path=path)
+            archived = analyze_file(path, workers=2, chunk_hands=70)
+        
+        self.assertEqual(archived.hands, 300)
+        self.assertEqual(archived.report(), live.report())
+        for report in live.report().values():
+            low, high = report.bb_per_100_interval
+            self.assertLess(low, high)
+
+if __name__ == '__main__':
+    unittest.main()
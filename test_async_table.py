@@ -0,0 +1,51 @@
+import asyncio
+import unittest
+from async_table import AISeat, AsyncTable, Seat, run_ai_tables
+from game import TexasHoldem
+
+class SlowSeat(Seat):
+    async def decide(self, player, to_call, pot, community_cards):
+        await asyncio.sleep(10)
+        return 'raise', 1000
+
+class TestAsyncTable(unittest.TestCase):
+    def test_many_tables_on_one_loop(self):
+        """Test that concurrent AI tables all finish their hands"""
+        hands = asyncio.run(run_ai_tables(20, 3, players_per_table=4, ai_delay=0.001, seed=0))
+        
+        self.assertEqual(hands, 60)
+        
+    def test_interleaving_does_not_change_results(self):
+        """Test that seeded tables keep their chips and end the same whether they share the loop or not"""
+        def tables():
+            games = [TexasHoldem(num_ai_players=4, headless=True, seed=0, table_id=i) for i in range(20)]
+            return [AsyncTable(game, {p: AISeat(0.001) for p in game.players}) for game in games]
+        
+        async def together(tables):
+            return await asyncio.gather(*(table.play(3) for table in tables))
+        
+        async def one_at_a_time(tables):
+            return [await table.play(3) for table in tables]
+        
+        shared, alone = tables(), tables()
+        self.assertEqual(asyncio.run(together(shared)), asyncio.run(one_at_a_time(alone)))
+        for table, other in zip(shared, alone):
+            stacks = [p.chips for p in table.game.players]
+            self.assertEqual(sum(stacks), 4000)  # No chips appear or vanish
+            self.assertEqual(stacks, [p.chips for p in other.game.players])
+        
+    def test_timed_out_seat_checks_or_folds(self):
+        """Test that a seat that never answers is folded or checked after the timeout"""
+        game = TexasHoldem(num_ai_players=3, headless=True)
+        slow = game.players[0]
+        table = AsyncTable(game, {slow: SlowSeat(), **{p: AISeat() for p in game.players[1:]}},
+                           decision_timeout=0.01)
+        
+        asyncio.run(table.play_hand())
+        
+        self.assertEqual(sum(p.chips for p in game.players), 3000)
+        slow_actions = [action for _, player, action, _ in game.betting_round.actions if player is slow]
+        self.assertTrue(set(slow_actions) <= {'small_blind', 'big_blind', 'fold', 'check'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import json
+import os
+import tempfile
+import unittest
+from benchmark import compare, main
+
+class TestBenchmark(unittest.TestCase):
+    def test_compare_flags_only_slowdowns_over_threshold(self):
+        """Test that regressions are benchmarks slower than the baseline by more than the threshold"""
+        baseline = {'a': 1.0, 'b': 1.0, 'c': 1.0}
+        self.assertEqual(compare({'a': 1.05, 'b': 1.2, 'c': 0.5, 'new': 9.0}, baseline, 0.1), ['b'])
+        
+    def test_json_round_trip(self):
+        """Test that a run saved as JSON serves as the baseline of the next run"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            self.assertEqual(main(['--scale', '0.002', '--output', path]), 0)
+            with open(path) as f:
+                results = json.load(f)['results']
+            self.assertIn('hand.10_seats', results)
+            self.assertEqual(main(['--scale', '0.002', '--baseline', path, '--threshold', '1000']), 0)
+
+if __name__ == '__main__':
+    unittest.main()
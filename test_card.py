@@ -0,0 +1,49 @@
+import pickle
+import random
+import unittest
+from treys import Card as TreysCard
+from card import Card, CARDS, Deck
+
+class TestCard(unittest.TestCase):
+    def test_cards_are_shared_ints(self):
+        """Test that Card(suit, rank) hands out the shared instance for rank index * 4 + suit index"""
+        card = Card('♦', 'Q')
+        self.assertIs(card, CARDS[10 * 4 + 2])
+        self.assertIs(Card('♦', 'Q'), card)
+        self.assertEqual(int(card), 42)
+        
+    def test_lookups(self):
+        """Test that every attribute of a card is read back correctly from the tables"""
+        card = Card('♥', '10')
+        self.assertEqual((card.suit, card.rank, str(card), card.get_value()), ('♥', '10', '10♥', 10))
+        self.assertEqual(Card('♣', 'K').get_value(), 10)
+        self.assertEqual(Card('♠', 'A').get_value(), 14)
+        self.assertEqual(card.treys_card, TreysCard.new('Th'))
+        self.assertEqual(Card('♠', 'A').treys_card, TreysCard.new('As'))
+        
+    def test_pickle_returns_the_same_card(self):
+        """Test that a pickled card comes back as the shared instance"""
+        card = Card('♣', '7')
+        self.assertIs(pickle.loads(pickle.dumps(card)), card)
+
+
+class TestDeck(unittest.TestCase):
+    def test_lazy_deck_deals_every_card_once(self):
+        """Test that on-demand dealing still hands out a full deck without repeats"""
+        deck = Deck(random.Random(1), lazy=True)
+        for _ in range(3):
+            deck.reset()
+            deck.shuffle()
+            self.assertEqual(sorted(deck.draw() for _ in range(52)), list(range(52)))
+            
+    def test_lazy_deck_is_uniform(self):
+        """Test that every card is about equally likely to be dealt first"""
+        deck = Deck(random.Random(2), lazy=True)
+        counts = [0] * 52
+        for _ in range(52000):
+            deck.reset()
+            counts[deck.draw()] += 1
+        self.assertTrue(all(800 < count < 1200 for count in counts))
+
+if __name__ == '__main__':
+    unittest.main()
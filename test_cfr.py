@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import abstraction
+from card import Card
+from cfr import CALL, DECISION, FOLD, AbstractGame, CFRSolver, GameTree, SolvedStrategy, StrategyTable, hand_bucket, solve
+from game import TexasHoldem
+
+class TestCFR(unittest.TestCase):
+    def test_tree_follows_the_betting_rules(self):
+        """Test that blinds, minimum raises, the small blind acting first and all-ins match BettingRound"""
+        tree = GameTree(AbstractGame())
+        self.assertEqual((tree.player[0], tree.bets[0]), (0, (10, 20)))
+        self.assertEqual(tree.raise_to[0][2:], [40, 60, 1000])  # Half pot, pot, all-in
+
+        limp = tree.children[0][CALL]
+        self.assertNotIn(FOLD, tree.legal[limp])  # The big blind owes nothing
+        self.assertEqual(tree.raise_to[limp][2], 40)  # Never less than a big blind more
+        flop = tree.children[limp][CALL]
+        self.assertEqual((tree.street[flop], tree.player[flop], tree.bets[flop]), (1, 0, (20, 20)))
+
+        all_in = tree.children[tree.children[0][4]][CALL]
+        self.assertEqual((tree.kind[all_in], tree.bets[all_in]), (2, (1000, 1000)))
+
+    def test_solved_river_and_table_round_trip(self):
+        """Test that strong river buckets fold less, and that a saved table loads and plays a heads-up table"""
+        game = AbstractGame(first_street=3, starting_pot=200, buckets=4, max_raises=1)
+        solver = solve(game, iterations=4000, workers=2, batch=500, seed=3)
+        strategy = solver.average_strategy()
+        tree = solver.tree
+        facing = tree.children[0][2]  # The small blind bet half the pot
+        self.assertEqual(tree.kind[facing], DECISION)
+        self.assertLess(strategy[facing, 3, FOLD], strategy[facing, 0, FOLD])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'river.cfr')
+            solver.export().save(path)
+            table = StrategyTable.load(path)
+            self.assertEqual(table.game, game)
+            self.assertEqual(table.probabilities[facing, 3].tolist(),
+                             solver.export().probabilities[facing, 3].tolist())
+
+            holdem = TexasHoldem(num_ai_players=2, headless=True, seed=5)
+            for player in holdem.players:
+                player.strategy = SolvedStrategy(table, holdem)
+            chips = sum(player.chips for player in holdem.players)
+            for _ in range(5):
+                holdem._play_round()
+                holdem.dealer_pos = (holdem.dealer_pos + 1) % 2
+            self.assertEqual(sum(player.chips for player in holdem.players), chips)
+
+    def test_buckets(self):
+        """Test that the nuts fall in the top bucket and a blank in the bottom one"""
+        board = [Card('♠', 'A'), Card('♠', 'K'), Card('♠', 'Q'), Card('♦', '2'), Card('♣', '7')]
+        self.assertEqual(hand_bucket([Card('♠', 'J'), Card('♠', '10')], board, 8), 7)
+        self.assertEqual(hand_bucket([Card('♥', '3'), Card('♦', '4')], board, 8), 0)
+        self.assertEqual(hand_bucket([Card('♠', 'A'), Card('♥', 'A')], [], 8), 7)
+
+    def test_tabled_buckets_are_recorded(self):
+        """Test that a table bucketed from the abstraction tables records it, and will not load without them"""
+        game = AbstractGame(first_street=1, starting_pot=200, buckets=4, max_raises=1, tabled_streets=(1,))
+        with mock.patch.object(abstraction, 'TABLES', None):
+            self.assertRaises(ValueError, CFRSolver, game)
+        tables = abstraction.generate_tables(streets=(3,), row_streets=(3,), next_cards=1, workers=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'flop.cfr')
+            with mock.patch.object(abstraction, 'TABLES', tables):
+                solve(game, iterations=200, workers=1).export().save(path)
+                self.assertEqual(StrategyTable.load(path).game, game)
+            with mock.patch.object(abstraction, 'TABLES', None):
+                self.assertRaises(ValueError, StrategyTable.load, path)
+
+        hole, flop = [Card('♠', 'A'), Card('♠', 'K')], [Card('♠', 'J'), Card('♠', '10'), Card('♥', '2')]
+        self.assertEqual(hand_bucket(hole, flop, 4, tables=tables), int(tables.lookup(hole, flop).strength * 4))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import os
+import tempfile
+import random
+import time
+import unittest
+from itertools import combinations
+import numpy as np
+from batch_evaluator import evaluate_batch
+from card import Card, CARDS
+from evaluator import evaluate
+from equity import estimate_equity, exact_equities, exact_river_equity
+from player import Player
+from preflop_table import PreflopTable, class_name, generate_table, hand_class
+
+class TestEquity(unittest.TestCase):
+    def test_pocket_aces_heads_up(self):
+        """Test that pocket aces win about 85% against one random hand"""
+        hand = [Card('♠', 'A'), Card('♥', 'A')]
+        result = estimate_equity(hand, [], 1, samples=4000, workers=1, seed=1)
+        
+        self.assertEqual(result.samples, 4000)
+        self.assertAlmostEqual(result.win + result.tie + result.lose, 1.0)
+        self.assertAlmostEqual(result.equity, 0.85, delta=0.03)
+        
+    def test_nuts_on_river_always_wins(self):
+        """Test that a royal flush on a complete board never loses"""
+        hand = [Card('♠', 'A'), Card('♠', 'K')]
+        board = [Card('♠', 'Q'), Card('♠', 'J'), Card('♠', '10'), Card('♥', '2'), Card('♦', '3')]
+        result = estimate_equity(hand, board, 3, samples=500, workers=1, seed=2)
+        
+        self.assertEqual(result.win, 1.0)
+        
+    def test_error_bound_stops_sampling_early(self):
+        """Test that sampling stops once the standard error is small enough"""
+        hand = [Card('♣', '7'), Card('♦', '2')]
+        result = estimate_equity(hand, [], 1, samples=50000, max_error=0.02, workers=1, batch_size=200, seed=3)
+        
+        self.assertLess(result.samples, 50000)
+        self.assertLessEqual(result.std_error, 0.02)
+        
+    def test_time_budget_stops_sampling_early(self):
+        """Test that a small time budget ends sampling after a few batches"""
+        hand = [Card('♣', '7'), Card('♦', '2')]
+        start = time.perf_counter()
+        result = estimate_equity(hand, [], 3, samples=10_000_000, time_budget=0.005, batch_size=100, seed=4)
+        
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertGreater(result.samples, 0)
+        self.assertLess(result.samples, 10_000_000)
+        
+    def test_ai_decides_with_equity_budget(self):
+        """Test that an AI with an equity budget still returns a legal decision"""
+        player = Player("AI", is_ai=True, equity_time_budget=0.01)
+        player.hand = [Card('♠', 'A'), Card('♥', 'A')]
+        action, amount = player.ai_make_decision(20, 30, [])
+        
+        self.assertIn(action, ['call', 'raise', 'fold'])
+        self.assertLessEqual(amount, player.chips)
+
+class TestExactEquity(unittest.TestCase):
+    def test_heads_up_turn_enumeration(self):
+        """Test that aces against kings on the turn lose only to the two remaining kings"""
+        aces = [Card('♠', 'A'), Card('♥', 'A')]
+        kings = [Card('♠', 'K'), Card('♥', 'K')]
+        board = [Card('♦', '2'), Card('♥', '3'), Card('♠', '9'), Card('♣', 'J')]
+        aces_result, kings_result = exact_equities([aces, kings], board)
+        
+        self.assertEqual(aces_result.samples, 44)
+        self.assertAlmostEqual(kings_result.win, 2 / 44)
+        self.assertAlmostEqual(aces_result.win, kings_result.lose)
+        
+    def test_river_against_every_hand(self):
+        """Test that a board playing the royal flush ties every possible hand"""
+        hand = [Card('♥', '2'), Card('♦', '3')]
+        board = [Card('♠', 'A'), Card('♠', 'K'), Card('♠', 'Q'), Card('♠', 'J'), Card('♠', '10')]
+        result = exact_river_equity(hand, board)
+        
+        self.assertEqual(result.samples, 990)
+        self.assertEqual(result.tie, 1.0)
+        
+    def test_river_matches_enumeration(self):
+        """Test that the cached river ranking agrees with enumerating each opponent hand"""
+        hand = [Card('♠', 'A'), Card('♥', 'Q')]
+        board = [Card('♦', 'Q'), Card('♥', '7'), Card('♠', '7'), Card('♣', '2'), Card('♦', '9')]
+        result = exact_river_equity(hand, board)
+        
+        dead = set(hand) | set(board)
+        remaining = [card for card in CARDS if card not in dead]
+        wins = 0
+        for opponent in combinations(remaining, 2):
+            hero, villain = exact_equities([hand, list(opponent)], board)
+            wins += hero.win == 1.0
+        self.assertAlmostEqual(result.win, wins / 990)
+
+class TestBatchEvaluator(unittest.TestCase):
+    def test_matches_treys_for_5_to_7_cards(self):
+        """Test that batch ranks equal treys ranks for random hands of every size"""
+        rng = random.Random(5)
+        for size in (5, 6, 7):
+            hands = [rng.sample(CARDS, size) for _ in range(2000)]
+            expected = [evaluate(hand[:2], hand[2:]) for hand in hands]
+            
+            self.assertEqual(evaluate_batch(np.array(hands)).tolist(), expected)
+            
+    def test_flushes_and_straight_flushes(self):
+        """Test that flushes beat the pairs and straights in the same seven cards"""
+        hands = [
+            [Card('♥', '2'), Card('♥', '7'), Card('♥', '9'), Card('♥', 'J'), Card('♥', 'K'), Card('♠', 'K'), Card('♦', 'K')],
+            [Card('♠', '9'), Card('♠', '10'), Card('♠', 'J'), Card('♠', 'Q'), Card('♠', 'K'), Card('♥', 'A'), Card('♠', '8')],
+        ]
+        expected = [evaluate(hand[:2], hand[2:]) for hand in hands]
+        
+        self.assertEqual(evaluate_batch(np.array(hands)).tolist(), expected)
+
+class TestPreflopTable(unittest.TestCase):
+    def test_hand_classes(self):
+        """Test that suit permutations map to the same canonical class"""
+        self.assertEqual(class_name(hand_class([Card('♠', 'A'), Card('♥', 'A')])), 'AA')
+        self.assertEqual(class_name(hand_class([Card('♦', 'K'), Card('♦', 'A')])), 'AKs')
+        self.assertEqual(class_name(hand_class([Card('♣', '7'), Card('♥', '2')])), '72o')
+        self.assertEqual(hand_class([Card('♠', 'A'), Card('♠', 'K')]),
+                         hand_class([Card('♣', 'K'), Card('♣', 'A')]))
+        
+    def test_generated_table_round_trip(self):
+        """Test that a generated table survives saving and loading"""
+        table = generate_table(samples=20, max_opponents=2, workers=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'table.bin')
+            table.save(path)
+            loaded = PreflopTable.load(path)
+            
+        aces = [Card('♠', 'A'), Card('♥', 'A')]
+        self.assertEqual(loaded.values, table.values)
+        self.assertEqual(loaded.equity(aces, 2), table.equity(aces, 2))
+        
+    def test_truncated_table_is_rejected(self):
+        """Test that a table file shorter than its header says fails to load"""
+        table = generate_table(samples=20, max_opponents=2, workers=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'table.bin')
+            table.save(path)
+            with open(path, 'r+b') as f:
+                f.truncate(os.path.getsize(path) - 2)
+            with self.assertRaises(ValueError):
+                PreflopTable.load(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from card import Card
+from equity import EquityResult
+from equity_cache import EquityCache, canonical_key
+
+def _store_in_worker(cache: EquityCache) -> int:
+    hole = [Card('♥', 'K'), Card('♥', 'Q')]
+    board = [Card('♥', 'J'), Card('♥', '10'), Card('♣', '2')]
+    cache.put(hole, board, 1, EquityResult(0.75, 0.05, 0.2, 4000))
+    return os.getpid()
+
+class TestEquityCache(unittest.TestCase):
+    def test_canonical_key_ignores_suit_names_and_card_order(self):
+        """Test that suit-isomorphic situations share a key and different ones do not"""
+        hole = [Card('♠', 'K'), Card('♠', 'Q')]
+        board = [Card('♠', 'J'), Card('♠', '10'), Card('♥', '2')]
+        same = canonical_key([Card('♦', 'Q'), Card('♦', 'K')], [Card('♣', '2'), Card('♦', '10'), Card('♦', 'J')])
+        self.assertEqual(canonical_key(hole, board), same)
+        self.assertNotEqual(canonical_key(hole, board), canonical_key(hole, board, 2))
+        offsuit = [Card('♠', 'K'), Card('♥', 'Q')]
+        self.assertNotEqual(canonical_key(hole, board), canonical_key(offsuit, board))
+
+    def test_memory_tier_is_lru(self):
+        """Test that the in-memory tier computes once and evicts the least recently used entry"""
+        cache = EquityCache(max_entries=2)
+        calls = []
+        compute = lambda: calls.append(1) or EquityResult(0.5, 0.0, 0.5, 100)
+        hands = [[Card('♠', rank), Card('♥', rank)] for rank in ['A', 'K', 'Q']]
+        cache.equity(hands[0], [], 1, compute)
+        cache.equity(hands[1], [], 1, compute)
+        cache.equity(hands[0], [], 1, compute)  # Hit; K is now the oldest
+        cache.equity(hands[2], [], 1, compute)
+        self.assertEqual(len(calls), 3)
+        self.assertIsNone(cache.get(hands[1], [], 1))
+        self.assertIsNotNone(cache.get(hands[0], [], 1))
+
+    def test_disk_tier_is_shared_between_processes(self):
+        """Test that an equity stored by a worker process is read back from the file by this one"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'equity.cache')
+            cache = EquityCache(path, num_slots=1024)
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                self.assertNotEqual(pool.submit(_store_in_worker, cache).result(), os.getpid())
+
+            hole = [Card('♠', 'Q'), Card('♠', 'K')]
+            board = [Card('♦', '2'), Card('♠', 'J'), Card('♠', '10')]
+            result = cache.get(hole, board, 1)
+            self.assertEqual((cache.disk_hits, result.samples), (1, 4000))
+            self.assertAlmostEqual(result.win, 0.75, places=4)
+            cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
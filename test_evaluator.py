@@ -0,0 +1,44 @@
+import unittest
+from unittest import mock
+from treys import Evaluator
+import player
+from card import Card
+from player import Player
+from game_state import GameState
+from evaluator import EVALUATOR, evaluate, rank_class_name
+
+class TestEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.hole = [Card('♠', 'A'), Card('♥', 'A')]
+        self.board = [Card('♦', 'A'), Card('♣', 'K'), Card('♠', 'K')]
+
+    def test_matches_a_fresh_evaluator(self):
+        """Test that the shared evaluator ranks hands like a newly built one"""
+        fresh = Evaluator()
+        rank = evaluate(self.hole, self.board)
+        self.assertEqual(rank, fresh.evaluate([card.treys_card for card in self.board],
+                                              [card.treys_card for card in self.hole]))
+        self.assertEqual(rank_class_name(rank), "Full House")
+
+    def test_one_evaluator_per_process(self):
+        """Test that players and game states hold the module's evaluator instead of building their own"""
+        players = [Player("Alice"), Player("Bob")]
+        self.assertIs(players[0].evaluator, EVALUATOR)
+        self.assertIs(players[1].evaluator, EVALUATOR)
+        self.assertIs(GameState(players, verbose=False).evaluator, EVALUATOR)
+
+    def test_rank_name_reuses_the_last_evaluation(self):
+        """Test that naming the hand just evaluated does not evaluate it again"""
+        alice = Player("Alice")
+        alice.hand = self.hole
+        with mock.patch.object(player, 'evaluate', wraps=evaluate) as counted:
+            rank = alice._evaluate_hand_strength(self.board)
+            self.assertEqual(alice.get_hand_rank_name(self.board), rank_class_name(rank))
+            self.assertEqual(counted.call_count, 1)
+
+            # A new card on the board is a new hand
+            alice.get_hand_rank_name(self.board + [Card('♥', '2')])
+            self.assertEqual(counted.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from events import (BlindPosted, BufferedEventWriter, ChipCounts, HandStarted, PlayerActed, PotAwarded, SeatViewShown,
+                    render)
+from game import TexasHoldem
+
+class TestEvents(unittest.TestCase):
+    def test_headless_table_emits_to_subscribers(self):
+        """Test that a headless table reports a hand to whoever subscribes"""
+        game = TexasHoldem(num_ai_players=3, headless=True, seed=1)
+        self.assertFalse(game.events)
+        events = []
+        game.events.subscribe(events.append)
+        
+        game._play_round()
+        
+        kinds = [type(event) for event in events]
+        self.assertEqual(kinds[:3], [BlindPosted, BlindPosted, HandStarted])
+        self.assertIn(PlayerActed, kinds)
+        self.assertIs(kinds[-1], PotAwarded)
+        self.assertEqual(sum(e.amount for e in events if type(e) is PotAwarded), game.betting_round.pot)
+        
+    def test_table_views_go_through_the_bus(self):
+        """Test that the human seat's view and the chip counts are events, silenced by dropping the renderer"""
+        game = TexasHoldem(num_ai_players=2, seed=1)
+        events = []
+        game.events.subscribers = [events.append]
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            game._start_hand()
+            game.game_state.show_chip_counts()
+        self.assertEqual(out.getvalue(), '')
+        view, counts = [event for event in events if type(event) in (SeatViewShown, ChipCounts)]
+        self.assertEqual((view.pot, len(view.hand)), (30, 2))
+        self.assertEqual(render(counts, color=False).splitlines()[2:], [f"{p.name}: {p.chips}" for p in game.players])
+
+    def test_buffered_writer(self):
+        """Test that the file writer holds lines back until its buffer fills, and writes the rest on close"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'events.log')
+            def read():
+                with open(path, encoding='utf-8') as f:
+                    return f.read()
+            with BufferedEventWriter(open(path, 'w', encoding='utf-8'), buffer_events=3) as writer:
+                writer(BlindPosted('Alice', 'small', 10))
+                writer(PlayerActed('Bob', 'raise', 60, 60))
+                self.assertEqual(read(), '')
+                writer(PotAwarded('Bob', 70, None))
+                self.assertEqual(read(), '\nAlice posts small blind: 10\nBob raises to 60!\n\nBob wins 70 chips!\n')
+                writer(HandStarted('Alice'))
+            self.assertTrue(writer.file.closed)
+            self.assertTrue(read().endswith('Bob wins 70 chips!\n' + render(HandStarted('Alice'), color=False) + '\n'))
+        self.assertNotIn('\x1b', render(PotAwarded('Bob', 70, 'Flush'), color=False))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from hand_history import INLINE_ACTIONS, RECORD, HandAction, HandHistoryReader, HandHistoryWriter, HandRecord
+from simulator import simulate
+
+class TestHandHistory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'hands.bin')
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        
+    def test_record_round_trip(self):
+        """Test that a written hand reads back unchanged"""
+        record = HandRecord(
+            hand_id=42, dealer=1, small_blind=10, big_blind=20,
+            board=[0, 13, 26, 39, 51], holes=[(1, 2), (3, 4), (5, 6)],
+            player_ids=[7, 8, 9], start_stacks=[1000, 500, 800], end_stacks=[1040, 480, 780],
+            pot=60, winners=[0], showdown=True,
+            actions=[
+                HandAction('pre-flop', 2, 'small_blind', 10),
+                HandAction('pre-flop', 0, 'big_blind', 20),
+                HandAction('pre-flop', 1, 'call', 20),
+                HandAction('river', 2, 'raise', 100000),
+                HandAction('river', 0, 'fold', 0),
+            ],
+        )
+        with HandHistoryWriter(self.path) as writer:
+            writer.write(record)
+        with HandHistoryReader(self.path) as reader:
+            self.assertEqual(len(reader), 1)
+            self.assertEqual(reader[0], record)
+            
+    def test_long_hand_keeps_every_action(self):
+        """Test that actions past the inline ones round-trip through the overflow file, between short hands"""
+        def record(hand_id, num_actions):
+            actions = [HandAction('turn', i % 10, 'raise', i) for i in range(num_actions)]
+            return HandRecord(hand_id=hand_id, dealer=0, small_blind=10, big_blind=20, board=[], holes=[(), ()],
+                              player_ids=[0, 1], start_stacks=[1000, 1000], end_stacks=[1000, 1000],
+                              pot=0, winners=[0], showdown=False, actions=actions)
+        records = [record(0, 5), record(1, 300), record(2, INLINE_ACTIONS + 1), record(3, INLINE_ACTIONS)]
+        with HandHistoryWriter(self.path, buffer_hands=2) as writer:
+            for hand in records[:2]:
+                writer.write(hand)
+        with HandHistoryWriter(self.path) as writer:
+            for hand in records[2:]:
+                writer.write(hand)
+        with HandHistoryReader(self.path) as reader:
+            self.assertEqual(list(reader), records)
+            self.assertEqual(len(reader[1].actions), 300)
+        self.assertEqual(os.path.getsize(self.path + '.overflow'), 4 * (300 + 1 - INLINE_ACTIONS))  # Two hands past the inline actions
+        self.assertLessEqual(RECORD.size, 256)
+
+    def test_simulation_log_is_appended_and_filtered(self):
+        """Test that simulated hands are logged in order and can be filtered lazily"""
+        results = simulate(30, seed=5, num_players=3, history_path=self.path)
+        simulate(20, seed=6, num_players=3, history_path=self.path)
+        
+        with HandHistoryReader(self.path) as reader:
+            self.assertEqual(len(reader), 50)
+            self.assertEqual(reader[29].pot, results[29].pot)
+            self.assertEqual(reader[-1].hand_id, 19)
+            for record in reader:
+                self.assertEqual(sum(record.chip_changes()), 0)
+            showdowns = list(reader.filter(lambda record: record.showdown))
+            self.assertTrue(all(len(record.board) == 5 for record in showdowns))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import io
+import unittest
+import instrumentation
+from instrumentation import Histogram
+from simulator import simulate
+
+class TestInstrumentation(unittest.TestCase):
+    def tearDown(self):
+        instrumentation.disable()
+        
+    def test_hand_phases_are_timed(self):
+        """Test that enabled instruments see every hand phase and AI decision"""
+        out = io.StringIO()
+        instruments = instrumentation.enable(dump_every=0, dump_file=out)
+        simulate(20, seed=1, num_players=4)
+        
+        snapshot = instruments.snapshot()
+        self.assertEqual(snapshot['counters']['hands'], 20)
+        for phase in ['hand.total', 'hand.shuffle', 'hand.blinds', 'hand.deal', 'hand.pre-flop', 'hand.showdown']:
+            self.assertEqual(snapshot['histograms'][phase]['count'], 20)
+        self.assertGreater(snapshot['histograms']['ai.decision']['count'], 20)
+        self.assertEqual(len(out.getvalue().splitlines()), 20)  # Dumped after every hand
+        
+    def test_disabled_records_nothing(self):
+        """Test that nothing is collected once instruments are disabled"""
+        instruments = instrumentation.enable()
+        instrumentation.disable()
+        simulate(5, seed=1)
+        self.assertEqual(instruments.snapshot(), {'counters': {}, 'histograms': {}})
+        
+    def test_histogram_percentiles(self):
+        """Test that percentiles land on the power-of-two bucket edges"""
+        histogram = Histogram()
+        for nanoseconds in [100] * 90 + [5000] * 10:
+            histogram.record(nanoseconds)
+        self.assertEqual(histogram.percentile(0.5), 128)
+        self.assertEqual(histogram.percentile(0.99), 5000)
+        self.assertEqual(histogram.summary()['count'], 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -126,5 +126,27 @@ class TestPokerGame(unittest.TestCase):
         self.assertEqual(self.betting.pot, 30)     # Total blinds
         self.assertEqual(self.betting.current_bet, 20)  # Current bet should be big blind
 
+    def test_ring_asks_only_seats_that_can_act(self):
+        """Test that folded and all-in seats leave the ring of seats to act, and a raise reopens it"""
+        short = MockPlayer("Player 4", 50)
+        players = self.players + [short]
+        betting = BettingRound(players, verbose=False)
+        decisions = {self.player1: [('check', 0), ('call', 0)], self.player2: [('fold', 0)],
+                     self.player3: [('raise', 100)], short: [('call', 0)]}
+        
+        self.assertTrue(betting.start_round("flop", 0))
+        asked = []
+        player = betting.next_to_act()
+        while player is not None:
+            asked.append(player)
+            action, amount = decisions[player].pop(0)
+            betting.apply_decision(player, action, amount)
+            player = betting.next_to_act()
+            
+        # Player 4 called all-in for 50, so only Player 1 had to answer the raise
+        self.assertEqual(asked, [self.player1, self.player2, self.player3, short, self.player1])
+        self.assertEqual(betting.players_left, 3)
+        self.assertEqual((betting.pot, short.chips, self.player1.chips), (250, 0, 900))
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -31,10 +31,23 @@ class MockPlayer(Player):
         return self.ai_make_decision(to_call, pot, community_cards)
 
 class MockDeck(Deck):
-    def __init__(self, predetermined_cards: List[Card] = None):
+    """A stacked deck that deals the same cards every hand, in the given order.
+
+    Mock players with a mock hand throw away the hole cards they are dealt,
+    so the deck burns those eight draws and then deals the community cards.
+    """
+    def __init__(self, community_cards: List[Card], num_players: int = 4):
+        used = set(community_cards)
+        burned = [card for card in reversed(Deck().cards) if card not in used][:2 * num_players]
+        self.dealing_order = burned + list(community_cards)
         super().__init__()
-        if predetermined_cards:
-            self.cards = predetermined_cards
+        self.reset()
+
+    def reset(self):
+        self.cards = list(reversed(self.dealing_order))  # Cards are drawn from the end
+
+    def shuffle(self):
+        pass
 
 class TestPokerGameEndToEnd(unittest.TestCase):
     def setUp(self):
@@ -76,7 +89,7 @@ class TestPokerGameEndToEnd(unittest.TestCase):
         # Create game with mock deck
         game = TexasHoldem(num_ai_players=3)
         game.players = [self.human, self.ai1, self.ai2, self.ai3]
-        game.deck.cards = community_cards
+        game.deck = MockDeck(community_cards)
         
         # Set up betting sequences
         self.human.next_actions = [
@@ -144,7 +157,7 @@ class TestPokerGameEndToEnd(unittest.TestCase):
         # Create game
         game = TexasHoldem(num_ai_players=3)
         game.players = [self.human, self.ai1, self.ai2, self.ai3]
-        game.deck.cards = community_cards
+        game.deck = MockDeck(community_cards)
         
         # Set up betting sequences
         self.human.next_actions = [
@@ -163,8 +176,11 @@ class TestPokerGameEndToEnd(unittest.TestCase):
         # Play round
         game._play_round()
         
-        # Verify all-in mechanics
-        self.assertEqual(self.human.chips, 0)  # Human should be all-in
+        # Verify all-in mechanics: kings beat queens for the 100 each plus the big blind
+        self.assertEqual(self.human.chips, 220)
+        self.assertEqual(self.ai1.chips, 100)
+        self.assertEqual(self.ai2.chips, 280)
+        self.assertEqual(self.ai3.chips, 400)
         self.assertTrue(self.ai2.folded)  # AI2 should have folded
         self.assertTrue(self.ai3.folded)  # AI3 should have folded
         
@@ -200,7 +216,7 @@ class TestPokerGameEndToEnd(unittest.TestCase):
         # Create game
         game = TexasHoldem(num_ai_players=3)
         game.players = [self.human, self.ai1, self.ai2, self.ai3]
-        game.deck.cards = community_cards
+        game.deck = MockDeck(community_cards)
         
         # Set up betting sequences
         self.human.next_actions = [
@@ -280,7 +296,7 @@ class TestPokerGameEndToEnd(unittest.TestCase):
         # Create game
         game = TexasHoldem(num_ai_players=3)
         game.players = [self.human, self.ai1, self.ai2, self.ai3]
-        game.deck.cards = community_cards
+        game.deck = MockDeck(community_cards)
         
         # Set up betting sequences
         self.human.next_actions = [
@@ -305,9 +321,11 @@ class TestPokerGameEndToEnd(unittest.TestCase):
         # Play round
         game._play_round()
         
-        # Verify kicker determines winner
+        # Both play the A-5 straight on the board, so the pot is split evenly
         final_chips = [p.chips for p in game.players]
-        self.assertNotEqual(final_chips[0], final_chips[1])  # Someone should win based on kicker
+        self.assertEqual(final_chips[0], final_chips[1])
+        self.assertEqual(final_chips[0], 1000 + 10)  # Half of the folded blinds each
+        self.assertEqual(sum(final_chips), 4000)
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,47 @@
+import unittest
+from card import Card
+from player import Player
+from game_state import GameState
+from pot import award_pots, build_pots
+from simulator import simulate
+
+class TestPot(unittest.TestCase):
+    def test_side_pots_from_all_ins(self):
+        """Test that short all-ins only win what they could match"""
+        short, middle, deep, folder = (Player(name) for name in ['Short', 'Middle', 'Deep', 'Folder'])
+        folder.folded = True
+        pots = build_pots({short: 100, middle: 300, deep: 500, folder: 50})
+        self.assertEqual([pot.amount for pot in pots], [350, 400, 200])
+        self.assertEqual([len(pot.eligible) for pot in pots], [3, 2, 1])
+
+        # The short stack has the best hand, the deep stack the worst
+        payouts = award_pots(pots, {short: 1, middle: 2, deep: 3}, [short, middle, deep, folder])
+        self.assertEqual(payouts, {short: 350, middle: 400, deep: 200})
+
+    def test_split_pot_odd_chips(self):
+        """Test that odd chips go to the tied winners closest to the dealer's left"""
+        players = [Player(f"Player {i}") for i in range(10)]
+        pots = build_pots({player: 100 for player in players})
+        self.assertEqual([pot.amount for pot in pots], [1000])
+        ranks = {player: 5 if i in (2, 5, 7) else 10 for i, player in enumerate(players)}
+        payouts = award_pots(pots, ranks, players[6:] + players[:6])  # Dealer in seat 5
+        self.assertEqual(payouts, {players[7]: 334, players[2]: 333, players[5]: 333})
+
+    def test_showdown_splits_board_play(self):
+        """Test that players sharing the best hand split the pot"""
+        players = [Player('Alice'), Player('Bob')]
+        players[0].hand = [Card('♥', '2'), Card('♦', '3')]
+        players[1].hand = [Card('♣', '2'), Card('♠', '3')]
+        state = GameState(players, verbose=False)
+        state.community_cards = [Card('♥', 'A'), Card('♠', 'K'), Card('♦', 'Q'), Card('♣', 'J'), Card('♥', '10')]
+        winners = state.handle_showdown(201, {players[0]: 100, players[1]: 101})
+        self.assertEqual(winners, [players[1], players[0]])
+        self.assertEqual([p.chips for p in players], [1100, 1101])
+
+    def test_simulation_conserves_chips(self):
+        """Test that no chips are created or lost across many hands"""
+        for result in simulate(300, seed=5, num_players=6):
+            self.assertEqual(sum(result.chip_changes.values()), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from card import Card
+from equity import exact_river_equity
+from game import TexasHoldem
+from ranges import COMBO_INDEX, Range, RangeStrategy, RangeTracker, combo_strengths, hand_vs_range, range_vs_range
+
+class TestRanges(unittest.TestCase):
+    def setUp(self):
+        self.hole = [Card('♠', 'A'), Card('♥', 'K')]
+        self.board = [Card('♠', '2'), Card('♥', '4'), Card('♦', '7'), Card('♣', '10'), Card('♣', 'A')]
+
+    def test_card_removal_and_exact_river_equity(self):
+        """Test that board cards leave 1081 combos and a full range matches exact river equity"""
+        full = Range()
+        full.remove_cards(self.board)
+        self.assertEqual(len(full), 1081)  # C(47, 2)
+        result = hand_vs_range(self.hole, self.board, full)
+        expected = exact_river_equity(self.hole, self.board)
+        self.assertAlmostEqual(result.win, expected.win)
+        self.assertAlmostEqual(result.tie, expected.tie)
+
+        # Cached river strengths decide the same hands as ranking them, exactly and sampled multiway
+        strengths = combo_strengths(self.board)
+        self.assertEqual(hand_vs_range(self.hole, self.board, full, strengths=strengths), result)
+        self.assertEqual(hand_vs_range(self.hole, self.board, [full] * 3, seed=4, strengths=strengths),
+                         hand_vs_range(self.hole, self.board, [full] * 3, seed=4))
+
+        # Between two ranges the equities of both sides add up to one
+        strong = Range(combo_strengths(self.board) ** 4)
+        forward, backward = range_vs_range(strong, Range(), self.board), range_vs_range(Range(), strong, self.board)
+        self.assertGreater(forward.equity, 0.6)
+        self.assertAlmostEqual(forward.equity + backward.equity, 1.0)
+
+    def test_sampled_equity_against_a_narrow_range(self):
+        """Test that a hand does worse on the flop against a range of aces than against any two cards"""
+        aces = Range([0.0] * 1326)
+        for first, second in [(48, 49), (48, 50), (49, 50), (50, 51)]:
+            aces.weights[COMBO_INDEX[first, second]] = 1.0
+        flop = self.board[:3]
+        self.assertLess(hand_vs_range(self.hole, flop, aces, seed=1).equity,
+                        hand_vs_range(self.hole, flop, Range(), seed=1).equity - 0.3)
+
+    def test_tracker_narrows_raisers(self):
+        """Test that a raise shifts the raiser's range towards stronger combos and range AIs finish hands"""
+        game = TexasHoldem(num_ai_players=4, headless=True, seed=2)
+        tracker = RangeTracker(game)
+        steps = game.hand_steps()
+        player = next(steps)
+        raiser = player.seat
+        steps.send(('raise', 100))
+        ranges = tracker.update()
+        strengths = combo_strengths([])
+        raised, untouched = ranges[raiser], ranges[(raiser + 2) % 4]
+        self.assertGreater(raised.weights @ strengths / raised.weights.sum(),
+                           untouched.weights @ strengths / untouched.weights.sum())
+
+        for player in game.players:
+            player.strategy = RangeStrategy(tracker, samples=200)
+        chips = sum(player.chips for player in game.players)
+        for _ in range(3):
+            game._play_round()
+            game.dealer_pos = (game.dealer_pos + 1) % 4
+        self.assertEqual(sum(player.chips for player in game.players), chips)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from betting import BettingRound
+from card import Card
+from game import TexasHoldem
+from player import Player
+
+class TestSeatArrays(unittest.TestCase):
+    def test_players_are_views_of_the_table_arrays(self):
+        """Test that seating a player moves its state into the table's arrays and writes go through"""
+        player = Player("AI", chips=700, is_ai=True)
+        player.receive_card(Card('♠', 'A'))
+        other = Player("Other", chips=300, is_ai=True)
+        betting = BettingRound([other, player], verbose=False)
+        seats = betting.seats
+
+        self.assertEqual(player.seat, 1)
+        self.assertEqual((seats.chips[1], seats.hole_counts[1]), (700, 1))
+        self.assertEqual(player.hand, [Card('♠', 'A')])
+        player.make_bet(700)
+        player.folded = True
+        self.assertEqual((seats.chips[1], seats.bets[1]), (0, 700))
+        self.assertTrue(player.all_in and player.folded)
+        player.clear_hand()
+        self.assertEqual((len(player.hand), player.current_bet, player.folded), (0, 0, False))
+        with self.assertRaises(AttributeError):
+            player.nickname = "x"  # Players have slots, no __dict__
+
+    def test_action_log_reads_back_players(self):
+        """Test that the packed action log reads back the same actions a hand played"""
+        game = TexasHoldem(num_ai_players=4, headless=True, seed=5)
+        game._play_round()
+        actions = game.betting_round.actions
+        self.assertEqual(actions[0][1:], (game.players[1], 'small_blind', 10))
+        self.assertEqual(actions[1][1:], (game.players[2], 'big_blind', 20))
+        self.assertEqual(list(actions)[-1], actions[-1])
+        put_in = sum(amount for _, _, _, amount in actions)
+        self.assertEqual(put_in, sum(game.betting_round.contributions.values()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from hand_history import HandHistoryReader
+from simulator import replay_hand, simulate
+from tournament import BlindLevel, Tournament
+
+STREET_CARDS = {'pre-flop': 0, 'flop': 3, 'turn': 4, 'river': 5}
+
+class TestSimulator(unittest.TestCase):
+    def test_hands_conserve_chips(self):
+        """Test that every simulated hand pays out exactly what was bet"""
+        results = simulate(200, seed=7, num_players=6)
+        
+        self.assertEqual(len(results), 200)
+        for result in results:
+            self.assertEqual(sum(result.chip_changes.values()), 0)
+            self.assertTrue(result.winners)
+            
+    def test_hands_won_by_folds_stop_dealing(self):
+        """Test that the board only has the streets somebody bet on when a hand ends without a showdown"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'hands.bin')
+            simulate(300, seed=9, num_players=6, history_path=path)
+            with HandHistoryReader(path) as reader:
+                for record in reader.filter(lambda record: not record.showdown):
+                    last_street = record.actions[-1].street
+                    self.assertEqual(len(record.board), STREET_CARDS[last_street])
+
+    def test_same_seed_gives_same_results(self):
+        """Test that a seeded simulation is reproducible"""
+        self.assertEqual(simulate(50, seed=11), simulate(50, seed=11))
+        
+    def test_replay_single_hand(self):
+        """Test that a hand replays from its seed and hand number alone"""
+        results = simulate(40, seed=3, num_players=5)
+        
+        for hand_number in [0, 17, 39]:
+            self.assertEqual(replay_hand(3, hand_number, num_players=5), results[hand_number])
+
+class TestTournament(unittest.TestCase):
+    def test_tournament_runs_to_one_winner(self):
+        """Test that a multi-table tournament ends with one player holding every chip"""
+        schedule = [BlindLevel(10, 20, 10), BlindLevel(50, 100, 10)]
+        tournament = Tournament(num_players=20, seats_per_table=6, starting_chips=500,
+                                schedule=schedule, hands_per_batch=5, workers=1, seed=4)
+        self.assertEqual(len(tournament.tables), 4)
+        
+        result = tournament.run()
+        
+        self.assertEqual(len(result.standings), 20)
+        self.assertEqual(result.standings[0].chips, 20 * 500)
+        self.assertEqual(len({standing.name for standing in result.standings}), 20)
+        self.assertGreater(result.hands_played, 0)
+        self.assertTrue(result.worker_utilization)
+        
+    def test_results_independent_of_worker_count(self):
+        """Test that a seeded tournament finishes the same with one or two workers"""
+        def standings(workers):
+            tournament = Tournament(num_players=12, seats_per_table=4, starting_chips=300,
+                                    hands_per_batch=5, workers=workers, seed=8)
+            result = tournament.run()
+            return result.standings, result.hands_played
+        
+        self.assertEqual(standings(1), standings(2))
+
+if __name__ == '__main__':
+    unittest.main()
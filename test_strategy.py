@@ -0,0 +1,49 @@
+import unittest
+from batch_tables import BatchTables
+from game import TexasHoldem
+from player import Player
+from strategy import GameSnapshot, HeuristicStrategy, Strategy
+
+class CallingStation(Strategy):
+    def __init__(self):
+        self.seen = []
+
+    def decide(self, snapshot, rng=None):
+        self.seen.append(snapshot)
+        return 'call', snapshot.to_call
+
+class TestStrategy(unittest.TestCase):
+    def test_player_decides_through_its_strategy(self):
+        """Test that an AI player hands its strategy a snapshot of the situation"""
+        strategy = CallingStation()
+        player = Player("AI", chips=500, is_ai=True, strategy=strategy)
+        player.hand = [3, 7]
+        
+        self.assertEqual(player.ai_make_decision(40, 100, [10, 20, 30]), ('call', 40))
+        snapshot = strategy.seen[0]
+        self.assertEqual((snapshot.to_call, snapshot.pot, snapshot.chips, snapshot.street), (40, 100, 500, 'flop'))
+        with self.assertRaises(AttributeError):
+            snapshot.pot = 0  # Snapshots are immutable
+            
+    def test_batch_matches_single_decisions(self):
+        """Test that batched heuristic decisions agree with one-at-a-time ones"""
+        strategy = HeuristicStrategy()
+        snapshots = [GameSnapshot((48, 49), (50, 44, 40), 20, 300, 1000, 0, 1),  # Trip aces: never folds
+                     GameSnapshot((0, 5), (44, 41, 26, 15), 500, 900, 600, 0, 2)]  # Weak facing a big bet: folds
+        strong, weak = strategy.decide_batch(snapshots)
+        self.assertIn(strong[0], ['raise', 'call'])
+        self.assertIn(strategy.decide(snapshots[0])[0], ['raise', 'call'])
+        self.assertEqual(weak, ('fold', 0))
+        self.assertEqual(strategy.decide(snapshots[1]), ('fold', 0))
+        
+    def test_batch_tables(self):
+        """Test that lockstep tables finish their hands, keep their chips and batch decisions"""
+        games = [TexasHoldem(num_ai_players=4, headless=True, seed=table) for table in range(30)]
+        runner = BatchTables(games)
+        
+        self.assertEqual(runner.play(5), 150)
+        self.assertTrue(all(sum(p.chips for p in game.players) == 4000 for game in games))
+        self.assertLess(runner.batches * 10, runner.decisions)
+
+if __name__ == '__main__':
+    unittest.main()
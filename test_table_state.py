@@ -0,0 +1,47 @@
+import unittest
+from game import TexasHoldem
+from table_state import STATE_SIZE, capture, play_out, restore
+
+class TestTableState(unittest.TestCase):
+    def test_branches_restore_to_the_same_decision(self):
+        """Test that many branches played out from one captured decision all start from the same state"""
+        game = TexasHoldem(num_ai_players=6, headless=True, seed=3)
+        steps = game.hand_steps()
+        player = next(steps)
+        player = steps.send(('call', 0))  # A decision or two into the hand
+        state = capture(game)
+        self.assertLess(state.itemsize * len(state), 1024)
+        self.assertEqual(len(state), STATE_SIZE)
+        total_chips = sum(p.chips for p in game.players) + game.betting_round.pot
+        
+        outcomes = set()
+        for branch in range(50):
+            restore(game, state)
+            self.assertEqual(capture(game), state)
+            self.assertIs(game.betting_round.next_to_act(), player)
+            first = 'fold' if branch % 2 else 'raise'
+            decide = lambda p: (first, 200) if p is player else ('call', 0)
+            winners = play_out(game, decide)
+            self.assertTrue(winners)
+            self.assertEqual(sum(p.chips for p in game.players), total_chips)
+            outcomes.add(tuple(p.chips for p in game.players))
+        self.assertGreater(len(outcomes), 2)  # Fresh runouts on every branch
+
+    def test_fold_win_keeps_the_board(self):
+        """Test that a branch won by folds deals no more community cards"""
+        game = TexasHoldem(num_ai_players=3, headless=True, seed=5)
+        steps = game.hand_steps()
+        next(steps)
+        while game.betting_round.street == 'pre-flop':
+            steps.send(('call', 0))  # Everyone sees the flop
+        board = list(game.game_state.community_cards)
+        state = capture(game)
+        
+        restore(game, state)
+        winners = play_out(game, lambda p: ('fold', 0))
+        self.assertEqual(len(winners), 1)
+        self.assertEqual(game.game_state.community_cards, board)
+        self.assertEqual(len(board), 3)
+
+if __name__ == '__main__':
+    unittest.main()
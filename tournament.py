@@ -0,0 +1,243 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import argparse
+import math
+import os
+import random
+import time
+from game import TexasHoldem
+from player import Player
+from rng import stream
+
+@dataclass
+class BlindLevel:
+    small_blind: int
+    big_blind: int
+    hands: int  # Hands played at this level before the blinds go up
+
+DEFAULT_SCHEDULE = [
+    BlindLevel(10, 20, 30),
+    BlindLevel(15, 30, 30),
+    BlindLevel(25, 50, 30),
+    BlindLevel(50, 100, 30),
+    BlindLevel(75, 150, 30),
+    BlindLevel(100, 200, 30),
+    BlindLevel(150, 300, 30),
+    BlindLevel(200, 400, 30),
+]
+
+@dataclass
+class TableBatch:
+    """What a worker reports back after playing a batch of hands at one table."""
+    table_id: int
+    stacks: List[Tuple[int, int]]  # (player id, chips) in seat order for the players still seated
+    busts: List[Tuple[int, int, int]]  # (player id, hand in batch, chips at the start of that hand)
+    hands_played: int
+    dealer_pos: int
+    busy_seconds: float
+    worker: int
+
+@dataclass
+class Standing:
+    place: int
+    name: str
+    chips: int
+
+@dataclass
+class TournamentResult:
+    standings: List[Standing]
+    hands_played: int
+    elapsed: float
+    hands_per_second: float
+    worker_utilization: Dict[int, float] = field(default_factory=dict)  # Busy share of wall time per worker pid
+
+class _Table:
+    def __init__(self, table_id: int, seats: List[int]):
+        self.table_id = table_id
+        self.seats = seats  # Player ids in seat order
+        self.dealer_pos = 0
+        self.hands_played = 0  # Also the number of the table's next hand in its random stream
+
+def _play_table_batch(table_id: int, seats: List[Tuple[int, int]], dealer_pos: int,
+                      small_blind: int, big_blind: int, num_hands: int, seed: int, first_hand: int) -> TableBatch:
+    """Play up to num_hands headless hands at one table, removing players as they bust.
+
+    Hands are drawn from the (seed, table_id, hand) streams starting at
+    first_hand, so a batch plays out the same in whichever worker runs it.
+    """
+    start = time.perf_counter()
+    game = TexasHoldem(num_ai_players=0, headless=True, small_blind=small_blind, big_blind=big_blind,
+                       seed=seed, table_id=table_id)
+    game.hand_number = first_hand
+    game.players = [Player(f"Player {player_id}", chips, is_ai=True) for player_id, chips in seats]
+    ids = {player: player_id for player, (player_id, _) in zip(game.players, seats)}
+    game.dealer_pos = dealer_pos % len(game.players)
+
+    busts = []
+    hands_played = 0
+    while hands_played < num_hands and len(game.players) > 1:
+        chips_before = {player: player.chips for player in game.players}
+        game._play_round()
+        hands_played += 1
+
+        # Move the button, then take busted players out of their seats
+        next_dealer = game.players[(game.dealer_pos + 1) % len(game.players)]
+        busted = [player for player in game.players if player.chips <= 0]
+        for player in sorted(busted, key=lambda p: chips_before[p]):
+            busts.append((ids[player], hands_played, chips_before[player]))
+        survivors = [player for player in game.players if player.chips > 0]
+        while next_dealer not in survivors:
+            next_dealer = game.players[(game.players.index(next_dealer) + 1) % len(game.players)]
+        game.players = survivors
+        game.dealer_pos = survivors.index(next_dealer)
+
+    return TableBatch(
+        table_id=table_id,
+        stacks=[(ids[player], player.chips) for player in game.players],
+        busts=busts,
+        hands_played=hands_played,
+        dealer_pos=game.dealer_pos,
+        busy_seconds=time.perf_counter() - start,
+        worker=os.getpid(),
+    )
+
+class Tournament:
+    """Multi-table freezeout between AI players, with tables spread over a process pool.
+
+    Every table plays hands_per_batch hands in its own worker, then the
+    tournament collects the results, records eliminations, rebalances the
+    tables and moves the blind clock before dealing out the next batch.
+    """
+    def __init__(self, num_players: int = 90, seats_per_table: int = 9, starting_chips: int = 1000,
+                 schedule: Optional[List[BlindLevel]] = None, hands_per_batch: int = 10,
+                 workers: Optional[int] = None, seed: Optional[int] = None):
+        if num_players < 2:
+            raise ValueError("A tournament needs at least two players!")
+        if seats_per_table < 2:
+            raise ValueError("Tables need at least two seats!")
+        self.seats_per_table = seats_per_table
+        self.schedule = schedule or DEFAULT_SCHEDULE
+        self.hands_per_batch = hands_per_batch
+        self.workers = workers or os.cpu_count() or 1
+        # Seating and table moves use the master stream; every table hand has its own
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = stream(self.seed)
+
+        self.names = {player_id: f"Player {player_id}" for player_id in range(num_players)}
+        self.stacks = {player_id: starting_chips for player_id in range(num_players)}
+        self.eliminated: List[int] = []  # Player ids in the order they busted
+        self.level = 0
+        self.hands_at_level = 0
+
+        # Deal players round-robin onto as few tables as possible
+        num_tables = math.ceil(num_players / seats_per_table)
+        order = list(range(num_players))
+        self.rng.shuffle(order)
+        self.tables = [_Table(table_id, order[table_id::num_tables]) for table_id in range(num_tables)]
+
+    def run(self) -> TournamentResult:
+        start = time.perf_counter()
+        hands_played = 0
+        busy: Dict[int, float] = {}
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            while len(self.stacks) > 1:
+                blinds = self.schedule[min(self.level, len(self.schedule) - 1)]
+                batch_hands = min(self.hands_per_batch, blinds.hands - self.hands_at_level)
+                futures = [
+                    pool.submit(_play_table_batch, table.table_id,
+                                [(player_id, self.stacks[player_id]) for player_id in table.seats],
+                                table.dealer_pos, blinds.small_blind, blinds.big_blind,
+                                batch_hands, self.seed, table.hands_played)
+                    for table in self.tables
+                ]
+                batches = [future.result() for future in futures]
+
+                for batch in batches:
+                    hands_played += batch.hands_played
+                    busy[batch.worker] = busy.get(batch.worker, 0.0) + batch.busy_seconds
+                self._record_batches(batches)
+                self._advance_clock(batch_hands)
+                self._balance_tables()
+
+        elapsed = time.perf_counter() - start
+        return TournamentResult(
+            standings=self.standings(),
+            hands_played=hands_played,
+            elapsed=elapsed,
+            hands_per_second=hands_played / elapsed if elapsed else 0.0,
+            worker_utilization={worker: seconds / elapsed for worker, seconds in busy.items()},
+        )
+
+    def standings(self) -> List[Standing]:
+        # Players still in by chip count, then the eliminated from last out to first out
+        alive = sorted(self.stacks, key=lambda player_id: -self.stacks[player_id])
+        order = alive + self.eliminated[::-1]
+        return [Standing(place, self.names[player_id], self.stacks.get(player_id, 0))
+                for place, player_id in enumerate(order, start=1)]
+
+    def _record_batches(self, batches: List[TableBatch]):
+        tables = {table.table_id: table for table in self.tables}
+        busts = []
+        for batch in batches:
+            table = tables[batch.table_id]
+            table.seats = [player_id for player_id, _ in batch.stacks]
+            table.dealer_pos = batch.dealer_pos
+            table.hands_played += batch.hands_played
+            for player_id, chips in batch.stacks:
+                self.stacks[player_id] = chips
+            busts.extend(batch.busts)
+
+        # Earlier busts finish lower; within a hand the shorter stack finishes lower
+        for player_id, _, _ in sorted(busts, key=lambda bust: (bust[1], bust[2])):
+            del self.stacks[player_id]
+            self.eliminated.append(player_id)
+
+    def _advance_clock(self, hands: int):
+        self.hands_at_level += hands
+        if self.hands_at_level >= self.schedule[min(self.level, len(self.schedule) - 1)].hands:
+            self.level += 1
+            self.hands_at_level = 0
+
+    def _balance_tables(self):
+        tables = [table for table in self.tables if table.seats]
+
+        # Break the shortest tables while the players fit on fewer tables
+        needed = max(1, math.ceil(len(self.stacks) / self.seats_per_table))
+        while len(tables) > needed:
+            tables.sort(key=lambda table: len(table.seats))
+            broken = tables.pop(0)
+            for player_id in broken.seats:
+                min(tables, key=lambda table: len(table.seats)).seats.append(player_id)
+
+        # Then move players from the fullest table to the shortest until sizes differ by at most one
+        while True:
+            tables.sort(key=lambda table: len(table.seats))
+            shortest, fullest = tables[0], tables[-1]
+            if len(fullest.seats) - len(shortest.seats) <= 1:
+                break
+            moved = fullest.seats.pop(self.rng.randrange(len(fullest.seats)))
+            if fullest.dealer_pos >= len(fullest.seats):
+                fullest.dealer_pos = 0
+            shortest.seats.append(moved)
+
+        self.tables = tables
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an AI multi-table tournament")
+    parser.add_argument('--players', type=int, default=90)
+    parser.add_argument('--seats', type=int, default=9)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    result = Tournament(args.players, args.seats, workers=args.workers, seed=args.seed).run()
+    for standing in result.standings[:10]:
+        print(f"{standing.place:>3}. {standing.name}: {standing.chips}")
+    print(f"\n{result.hands_played} hands in {result.elapsed:.1f}s ({result.hands_per_second:.0f} hands/s)")
+    for worker, utilization in sorted(result.worker_utilization.items()):
+        print(f"Worker {worker}: {utilization:.0%} busy")
+
+if __name__ == "__main__":
+    main()